@@ -2,6 +2,7 @@ import os
 from pathlib import Path
 from datetime import timedelta
 from dotenv import load_dotenv
+from corsheaders.defaults import default_headers
 
 load_dotenv()
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -49,6 +50,19 @@ TEMPLATES = [{
 }]
 WSGI_APPLICATION = "config.wsgi.application"
 
+# psycopg 3 connection pool per process. Pooling replaces persistent connections, so CONN_MAX_AGE is 0 while it is on;
+# size it for the process's request threads plus ANALYTICS_FANOUT_WORKERS, within the server's max_connections.
+DATABASE_POOL = {
+    "ENABLED": os.getenv("DB_POOL", "False").lower() == "true",
+    "OPTIONS": {
+        "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+        "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+        "timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),
+        "max_idle": float(os.getenv("DB_POOL_MAX_IDLE", "600")),
+        "max_lifetime": float(os.getenv("DB_POOL_MAX_LIFETIME", "3600")),
+    },
+}
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
@@ -57,9 +71,43 @@ DATABASES = {
         "PASSWORD": os.getenv("POSTGRES_PASSWORD", "postgres"),
         "HOST": os.getenv("POSTGRES_HOST", "localhost"),
         "PORT": os.getenv("POSTGRES_PORT", "5432"),
+        "CONN_MAX_AGE": 0 if DATABASE_POOL["ENABLED"] else int(os.getenv("DB_CONN_MAX_AGE", "0")),
+        "CONN_HEALTH_CHECKS": os.getenv("DB_CONN_HEALTH_CHECKS", "False").lower() == "true",
+        "OPTIONS": {"pool": DATABASE_POOL["OPTIONS"]} if DATABASE_POOL["ENABLED"] else {},
     }
 }
 
+# Optional read replicas ("host" or "host:port", comma separated) for analytics, insight, chart and export reads.
+# After a user's own write their reads stay on the primary for STICKY_SECONDS; use a shared
+# cache for CACHE_ALIAS when running several processes. See finance/db_router.py.
+for index, replica in enumerate(filter(None, (host.strip() for host in os.getenv("POSTGRES_REPLICA_HOSTS", "").split(","))), start=1):
+    host, _, port = replica.partition(":")
+    DATABASES[f"replica_{index}"] = {
+        **DATABASES["default"],
+        "NAME": os.getenv("POSTGRES_REPLICA_DB", DATABASES["default"]["NAME"]),
+        "USER": os.getenv("POSTGRES_REPLICA_USER", DATABASES["default"]["USER"]),
+        "PASSWORD": os.getenv("POSTGRES_REPLICA_PASSWORD", DATABASES["default"]["PASSWORD"]),
+        "HOST": host,
+        "PORT": port or DATABASES["default"]["PORT"],
+        "CONN_MAX_AGE": 0 if DATABASE_POOL["ENABLED"] else int(os.getenv("DB_REPLICA_CONN_MAX_AGE", str(DATABASES["default"]["CONN_MAX_AGE"]))),
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["finance.db_router.ReplicaRouter"]
+DATABASE_REPLICA = {
+    # Aliases to spread replica reads over; defaults to every replica_N configured above.
+    "ALIASES": [alias.strip() for alias in os.getenv("DB_REPLICA_ALIASES", "").split(",") if alias.strip()],
+    "STICKY_SECONDS": int(os.getenv("DB_REPLICA_STICKY_SECONDS", "10")),
+    "CACHE_ALIAS": os.getenv("DB_REPLICA_CACHE_ALIAS", "default"),
+}
+
+# Open database connections (or fill the pools) and import the report libraries when a WSGI/ASGI worker boots.
+# Under gunicorn --preload turn this off and call config.warmup.warm_up() from a post_worker_init hook instead.
+WARMUP = {
+    "ENABLED": os.getenv("DJANGO_WARMUP", "True").lower() == "true",
+    "TIMEOUT": float(os.getenv("DJANGO_WARMUP_TIMEOUT", "10")),
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
     {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator"},
@@ -72,6 +120,8 @@ TIME_ZONE = "UTC"
 USE_I18N = True
 USE_TZ = True
 STATIC_URL = "static/"
+MEDIA_URL = "media/"
+MEDIA_ROOT = Path(os.getenv("DJANGO_MEDIA_ROOT", BASE_DIR / "media"))
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 AUTH_USER_MODEL = "users.User"
 
@@ -79,6 +129,8 @@ CORS_ALLOWED_ORIGINS = [
     origin.strip()
     for origin in os.getenv("CORS_ALLOWED_ORIGINS", "http://localhost:5173").split(",")
 ]
+CORS_ALLOW_HEADERS = (*default_headers, "if-none-match")
+CORS_EXPOSE_HEADERS = ["ETag", "Server-Timing"]
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
@@ -98,6 +150,51 @@ REST_FRAMEWORK = {
     ],
     "DEFAULT_THROTTLE_RATES": {"anon": "100/hour", "user": "1000/hour"},
 }
+# Send X-Total-Count with the first page of keyset-paginated lists (costs a COUNT query).
+PAGINATION_TOTAL_COUNT = os.getenv("PAGINATION_TOTAL_COUNT", "True").lower() == "true"
+
+ANALYTICS_CACHE = {
+    "BACKEND": os.getenv("ANALYTICS_CACHE_BACKEND", "locmem"),
+    "MAX_ENTRIES": int(os.getenv("ANALYTICS_CACHE_MAX_ENTRIES", "2048")),
+    "CACHE_ALIAS": os.getenv("ANALYTICS_CACHE_ALIAS", "default"),
+    "TIMEOUT": int(os.getenv("ANALYTICS_CACHE_TIMEOUT", "300")),
+}
+
+# Worker threads (each with its own DB connection) used by the async analytics views to run independent queries concurrently; 0 runs them serially.
+ANALYTICS_FANOUT_WORKERS = int(os.getenv("ANALYTICS_FANOUT_WORKERS", "8"))
+
+# Seconds a report job may stay "running" before claim_report_jobs assumes its worker died and marks it failed.
+REPORT_JOB_RUNNING_TIMEOUT = int(os.getenv("REPORT_JOB_RUNNING_TIMEOUT", "1800"))
+
+# Spending spike detection defaults; users can override method, window and thresholds via /api/analytics/spike-settings/.
+# "ratio" compares with last month only, "zscore" with the window's mean and deviation, "mad" with its median and MAD.
+SPIKE_DETECTION = {
+    "METHOD": os.getenv("SPIKE_METHOD", "mad"),
+    "WINDOW_MONTHS": int(os.getenv("SPIKE_WINDOW_MONTHS", "6")),
+    "MAX_WINDOW_MONTHS": int(os.getenv("SPIKE_MAX_WINDOW_MONTHS", "24")),
+    "MIN_HISTORY_MONTHS": int(os.getenv("SPIKE_MIN_HISTORY_MONTHS", "3")),
+    "THRESHOLDS": {
+        "ratio": float(os.getenv("SPIKE_RATIO_THRESHOLD", "1.3")),
+        "zscore": float(os.getenv("SPIKE_ZSCORE_THRESHOLD", "2.0")),
+        "mad": float(os.getenv("SPIKE_MAD_THRESHOLD", "3.5")),
+    },
+    "TRANSACTION_THRESHOLD": float(os.getenv("SPIKE_TRANSACTION_THRESHOLD", "4.0")),
+    # A category needs more than this many expenses to score single transactions; at least 1, since each is left out of its own baseline.
+    "MIN_TRANSACTIONS": max(1, int(os.getenv("SPIKE_MIN_TRANSACTIONS", "10"))),
+}
+
+# Per-request query counts and timings: Server-Timing headers, /metrics and a slow-request log.
+INSTRUMENTATION = {
+    "ENABLED": os.getenv("INSTRUMENTATION_ENABLED", "False").lower() == "true",
+    "SLOW_REQUEST_MS": float(os.getenv("INSTRUMENTATION_SLOW_REQUEST_MS", "500")),
+    "SLOW_QUERY_COUNT": int(os.getenv("INSTRUMENTATION_SLOW_QUERY_COUNT", "3")),
+    "METRICS_ALLOWED_IPS": [ip.strip() for ip in os.getenv("INSTRUMENTATION_METRICS_ALLOWED_IPS", "127.0.0.1,::1").split(",")],
+}
+if INSTRUMENTATION["ENABLED"]:
+    MIDDLEWARE.insert(0, "finance.middleware.InstrumentationMiddleware")
+
+# Serve saving goal progress from SavingGoal.contributions_total instead of an annotated SUM.
+SAVING_GOAL_DENORMALISED_TOTALS = os.getenv("SAVING_GOAL_DENORMALISED_TOTALS", "False").lower() == "true"
 
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=30),
@@ -3,6 +3,7 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from users.views import RegisterView, LogoutView
+from finance import async_views
 from finance.views import (
     CategoryViewSet,
     TransactionViewSet,
@@ -10,11 +11,18 @@ from finance.views import (
     SavingContributionViewSet,
     BudgetViewSet,
     DashboardSummaryView,
+    DashboardBundleView,
+    AnalyticsCacheStatsView,
     InsightView,
     ChartDataView,
+    ForecastView,
+    SpikeSettingsView,
+    AnomalyView,
     ExportCsvView,
     ExportExcelView,
     ExportPdfView,
+    ReportJobViewSet,
+    metrics_view,
 )
 
 router = DefaultRouter()
@@ -23,6 +31,7 @@ router.register(r"transactions", TransactionViewSet, basename="transaction")
 router.register(r"saving-goals", SavingGoalViewSet, basename="saving-goal")
 router.register(r"saving-contributions", SavingContributionViewSet, basename="saving-contribution")
 router.register(r"budgets", BudgetViewSet, basename="budget")
+router.register(r"reports/jobs", ReportJobViewSet, basename="report-job")
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -31,10 +40,19 @@ urlpatterns = [
     path("api/auth/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     path("api/auth/logout/", LogoutView.as_view(), name="logout"),
     path("api/dashboard/summary/", DashboardSummaryView.as_view(), name="dashboard-summary"),
+    path("api/dashboard/bundle/", DashboardBundleView.as_view(), name="dashboard-bundle"),
     path("api/analytics/insights/", InsightView.as_view(), name="insights"),
     path("api/analytics/charts/", ChartDataView.as_view(), name="charts"),
+    path("api/async/dashboard/summary/", async_views.dashboard_summary, name="async-dashboard-summary"),
+    path("api/async/analytics/insights/", async_views.insights, name="async-insights"),
+    path("api/async/analytics/charts/", async_views.charts, name="async-charts"),
+    path("api/analytics/forecast/", ForecastView.as_view(), name="forecast"),
+    path("api/analytics/spike-settings/", SpikeSettingsView.as_view(), name="spike-settings"),
+    path("api/analytics/anomalies/", AnomalyView.as_view(), name="anomalies"),
+    path("api/analytics/cache-stats/", AnalyticsCacheStatsView.as_view(), name="analytics-cache-stats"),
     path("api/reports/export/csv/", ExportCsvView.as_view(), name="export-csv"),
     path("api/reports/export/excel/", ExportExcelView.as_view(), name="export-excel"),
     path("api/reports/export/pdf/", ExportPdfView.as_view(), name="export-pdf"),
     path("api/", include(router.urls)),
+    path("metrics", metrics_view, name="metrics"),
 ]
@@ -0,0 +1,40 @@
+import logging
+import time
+from importlib import import_module
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# Modules whose first import is slow (reportlab, openpyxl, numpy); loading them at boot keeps it off the first request.
+HEAVY_MODULES = [
+    "finance.services.reports",
+    "finance.services.exports",
+    "finance.services.forecasting",
+]
+
+
+def warm_up():
+    """Import the report libraries and open each database's connection or pool.
+
+    Pools are opened and filled to ``min_size``; persistent connections (CONN_MAX_AGE > 0)
+    are left open for this thread. A database that cannot be reached is logged and
+    skipped so the worker still starts.
+    """
+    started = time.perf_counter()
+    for module in HEAVY_MODULES:
+        import_module(module)
+
+    for alias in connections:
+        connection = connections[alias]
+        try:
+            pool = getattr(connection, "pool", None)
+            if pool is not None:
+                pool.open(wait=True, timeout=settings.WARMUP["TIMEOUT"])
+            else:
+                connection.ensure_connection()
+                if not connection.settings_dict["CONN_MAX_AGE"]:
+                    connection.close()
+        except Exception:
+            logger.warning("Could not warm up database %r", alias, exc_info=True)
+    logger.info("Warm-up finished in %.0f ms", (time.perf_counter() - started) * 1000)
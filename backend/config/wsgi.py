@@ -3,3 +3,9 @@ from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 application = get_wsgi_application()
+
+from django.conf import settings  # noqa: E402
+from .warmup import warm_up  # noqa: E402
+
+if settings.WARMUP["ENABLED"]:
+    warm_up()
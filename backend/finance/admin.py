@@ -1,8 +1,25 @@
 from django.contrib import admin
-from .models import Category, Transaction, SavingGoal, SavingContribution, Budget
+from .models import Category, Transaction, SavingGoal, SavingContribution, Budget, BudgetAlert, MonthlyRollup, CategoryAmountStats, SpikeSettings, ReportJob
 
 admin.site.register(Category)
 admin.site.register(Transaction)
 admin.site.register(SavingGoal)
 admin.site.register(SavingContribution)
 admin.site.register(Budget)
+admin.site.register(BudgetAlert)
+admin.site.register(SpikeSettings)
+admin.site.register(ReportJob)
+
+
+@admin.register(MonthlyRollup, CategoryAmountStats)
+class DerivedTotalsAdmin(admin.ModelAdmin):
+    """Read-only: these rows are maintained from transactions; fix drift with ``rebuild_rollups``."""
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,63 @@
+from datetime import date
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+from rest_framework import exceptions, status
+from rest_framework.throttling import UserRateThrottle
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from .db_router import use_replica
+from .services.dashboard import DashboardAggregate
+
+# DRF does not run async views, so these authenticate and throttle the way the APIView
+# versions do and render with DRF's encoder to keep the payloads identical.
+
+
+def error_response(data, status_code, headers=None):
+    response = JsonResponse(data, status=status_code, encoder=JSONEncoder)
+    for name, value in (headers or {}).items():
+        response[name] = value
+    return response
+
+
+def authenticate_and_throttle(request):
+    try:
+        result = JWTAuthentication().authenticate(request)
+    except exceptions.APIException as exc:
+        data = exc.detail if isinstance(exc.detail, dict) else {"detail": exc.detail}
+        return error_response(data, exc.status_code, {"WWW-Authenticate": "Bearer"})
+    if result is None:
+        return error_response({"detail": "Authentication credentials were not provided."}, status.HTTP_401_UNAUTHORIZED, {"WWW-Authenticate": "Bearer"})
+    request.user = result[0]
+
+    throttle = UserRateThrottle()
+    if not throttle.allow_request(request, None):
+        wait = throttle.wait()
+        headers = {"Retry-After": str(int(wait))} if wait is not None else {}
+        return error_response({"detail": "Request was throttled."}, status.HTTP_429_TOO_MANY_REQUESTS, headers)
+    return None
+
+
+async def aggregate_view(request, section, attributes):
+    denied = await sync_to_async(authenticate_and_throttle)(request)
+    if denied is not None:
+        return denied
+    aggregate = DashboardAggregate(request.user, date.today())
+    with use_replica(request.user):
+        await aggregate.aload(*attributes)
+    return JsonResponse(getattr(aggregate, section)(), encoder=JSONEncoder, safe=False)
+
+
+@require_GET
+async def dashboard_summary(request):
+    return await aggregate_view(request, "summary", ["rows"])
+
+
+@require_GET
+async def insights(request):
+    return await aggregate_view(request, "insights", ["rows", "budget_amount", "anomalies"])
+
+
+@require_GET
+async def charts(request):
+    return await aggregate_view(request, "charts", ["rows", "contribution_rows"])
@@ -0,0 +1,98 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Alias that reads inside a use_replica() block go to; None outside one.
+_read_alias = ContextVar("replica_read_alias", default=None)
+
+
+def replica_aliases():
+    configured = settings.DATABASE_REPLICA["ALIASES"] or [alias for alias in settings.DATABASES if alias.startswith("replica")]
+    return [alias for alias in configured if alias in settings.DATABASES]
+
+
+def _pin_key(user_id):
+    return f"replica-pin:{user_id}"
+
+
+def pin_to_primary(user_ids):
+    """Keep these users' reads on the primary for STICKY_SECONDS so they see their own writes."""
+    if not replica_aliases():
+        return
+    config = settings.DATABASE_REPLICA
+    caches[config["CACHE_ALIAS"]].set_many({_pin_key(user_id): True for user_id in user_ids}, config["STICKY_SECONDS"])
+    if _read_alias.get() is not None:
+        _read_alias.set(DEFAULT_DB_ALIAS)
+
+
+def read_alias_for(user=None):
+    """A replica for ``user``'s reads, or the primary when there is none or the user wrote recently."""
+    aliases = replica_aliases()
+    if not aliases:
+        return DEFAULT_DB_ALIAS
+    if user is not None and user.is_authenticated and caches[settings.DATABASE_REPLICA["CACHE_ALIAS"]].get(_pin_key(user.pk)):
+        return DEFAULT_DB_ALIAS
+    return random.choice(aliases)
+
+
+@contextmanager
+def use_replica(user=None):
+    """Send reads in the block to one replica (chosen once per block); writes still go to the primary."""
+    token = _read_alias.set(read_alias_for(user))
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+def replica_reads(method):
+    """Run a view method's reads on a replica for the requesting user."""
+
+    @wraps(method)
+    def wrapper(view, request, *args, **kwargs):
+        with use_replica(request.user):
+            return method(view, request, *args, **kwargs)
+
+    return wrapper
+
+
+def close_connections_before_fork():
+    """Close every connection and psycopg pool so forked children open their own sockets.
+
+    With pooling on, ``connections.close_all()`` only returns connections to the
+    class-level pool, which a forked child would inherit along with its open sockets.
+    """
+    connections.close_all()
+    for alias in connections:
+        close_pool = getattr(connections[alias], "close_pool", None)
+        if close_pool is not None:
+            close_pool()
+
+
+class ReplicaRouter:
+    """Routes reads to a replica only inside use_replica(); everything else uses the primary.
+
+    Reads inside an open transaction on the primary stay there so read-modify-write
+    code sees its own uncommitted rows. Replicas are never migrated.
+    """
+
+    def db_for_read(self, model, **hints):
+        alias = _read_alias.get()
+        if alias is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return alias
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in replica_aliases():
+            return False
+        return None
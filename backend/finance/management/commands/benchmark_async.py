@@ -0,0 +1,134 @@
+import asyncio
+import math
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test import AsyncClient, Client
+from rest_framework.throttling import UserRateThrottle
+from rest_framework_simplejwt.tokens import AccessToken
+from finance.models import Transaction
+from finance.services.datagen import insert_goals_and_budgets, seed_transactions
+
+# (label, WSGI APIView path, async view path)
+ENDPOINTS = [
+    ("dashboard summary", "/api/dashboard/summary/", "/api/async/dashboard/summary/"),
+    ("insights", "/api/analytics/insights/", "/api/async/analytics/insights/"),
+    ("charts", "/api/analytics/charts/", "/api/async/analytics/charts/"),
+]
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+class Command(BaseCommand):
+    help = "Compare tail latency of the async (ASGI) analytics views with the WSGI APIViews under concurrent load"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=20000)
+        parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint and stack")
+        parser.add_argument("--concurrency", type=int, default=16)
+        parser.add_argument("--wsgi-url", help="Base URL of a running WSGI server, e.g. http://127.0.0.1:8000 (default: in-process handler)")
+        parser.add_argument("--asgi-url", help="Base URL of a running ASGI server, e.g. http://127.0.0.1:8001 (default: in-process handler)")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--keep-data", action="store_true", help="Keep the benchmark user and its data")
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        user, created = User.objects.get_or_create(email="bench-async@example.com", defaults={"username": "bench_async"})
+        existing = Transaction.objects.filter(user=user).count()
+        if existing < options["rows"]:
+            self.stdout.write(f"Seeding {options['rows'] - existing} transactions...")
+            seed_transactions(user, options["rows"] - existing, seed=options["seed"])
+        if created:
+            end = Transaction.objects.filter(user=user).latest("date").date
+            insert_goals_and_budgets(user, random.Random(options["seed"]), end.replace(year=end.year - 3), end)
+
+        self.token = f"Bearer {AccessToken.for_user(user)}"
+        throttle = UserRateThrottle()
+        self.throttle_key = throttle.cache_format % {"scope": throttle.scope, "ident": user.pk}
+
+        self.stdout.write(f"{options['requests']} requests per endpoint at concurrency {options['concurrency']}")
+        self.stdout.write(f"{'endpoint':<20}{'stack':<7}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'req/s':>9}{'errors':>8}")
+        for label, wsgi_path, asgi_path in ENDPOINTS:
+            for stack, path in (("wsgi", wsgi_path), ("asgi", asgi_path)):
+                base_url = options[f"{stack}_url"]
+                if base_url:
+                    samples, errors, elapsed = self.run_http(base_url.rstrip("/") + path, options)
+                elif stack == "wsgi":
+                    samples, errors, elapsed = self.run_wsgi(path, options)
+                else:
+                    samples, errors, elapsed = asyncio.run(self.run_asgi(path, options))
+                self.stdout.write(
+                    f"{label:<20}{stack:<7}{percentile(samples, 50) * 1000:>9.2f}{percentile(samples, 95) * 1000:>9.2f}"
+                    f"{percentile(samples, 99) * 1000:>9.2f}{len(samples) / elapsed:>9.0f}{errors:>8}"
+                )
+
+        if not options["keep_data"]:
+            Transaction.objects.filter(user=user).delete()
+            user.delete()
+
+    def run_wsgi(self, path, options):
+        local = threading.local()
+
+        def request(_):
+            if not hasattr(local, "client"):
+                local.client = Client(HTTP_AUTHORIZATION=self.token)
+            cache.delete(self.throttle_key)
+            started = time.perf_counter()
+            response = local.client.get(path)
+            return time.perf_counter() - started, response.status_code
+
+        def close(_):
+            connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+            started = time.perf_counter()
+            results = list(pool.map(request, range(options["requests"])))
+            elapsed = time.perf_counter() - started
+            list(pool.map(close, range(options["concurrency"])))
+        return [duration for duration, _ in results], sum(1 for _, code in results if code != 200), elapsed
+
+    async def run_asgi(self, path, options):
+        client = AsyncClient()
+        headers = {"Authorization": self.token}
+        semaphore = asyncio.Semaphore(options["concurrency"])
+
+        async def request():
+            async with semaphore:
+                cache.delete(self.throttle_key)
+                started = time.perf_counter()
+                response = await client.get(path, headers=headers)
+                return time.perf_counter() - started, response.status_code
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(request() for _ in range(options["requests"])))
+        elapsed = time.perf_counter() - started
+        return [duration for duration, _ in results], sum(1 for _, code in results if code != 200), elapsed
+
+    def run_http(self, url, options):
+        """Drive an external server; its throttle counters are not reset, so keep --requests under the user rate."""
+
+        def request(_):
+            started = time.perf_counter()
+            try:
+                with urllib.request.urlopen(urllib.request.Request(url, headers={"Authorization": self.token})) as response:
+                    response.read()
+                    code = response.status
+            except urllib.error.HTTPError as exc:
+                code = exc.code
+            return time.perf_counter() - started, code
+
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+            started = time.perf_counter()
+            results = list(pool.map(request, range(options["requests"])))
+            elapsed = time.perf_counter() - started
+        return [duration for duration, _ in results], sum(1 for _, code in results if code != 200), elapsed
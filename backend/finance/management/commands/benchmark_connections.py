@@ -0,0 +1,112 @@
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import Client
+from rest_framework.throttling import UserRateThrottle
+from rest_framework_simplejwt.tokens import AccessToken
+from finance.models import Transaction
+from finance.services.datagen import seed_transactions
+
+# Small, frequent calls where opening a connection is a large share of the request.
+ENDPOINTS = ["/api/categories/", "/api/budgets/status/", "/api/dashboard/summary/"]
+PERSISTENT_MAX_AGE = 600
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+class Command(BaseCommand):
+    help = "Compare API latency with a new connection per request, persistent connections and the psycopg pool"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=2000)
+        parser.add_argument("--requests", type=int, default=300, help="Requests per endpoint and mode")
+        parser.add_argument("--concurrency", type=int, default=4)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--keep-data", action="store_true", help="Keep the benchmark user and its data")
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        user, _ = User.objects.get_or_create(email="bench-connections@example.com", defaults={"username": "bench_connections"})
+        existing = Transaction.objects.filter(user=user).count()
+        if existing < options["rows"]:
+            self.stdout.write(f"Seeding {options['rows'] - existing} transactions...")
+            seed_transactions(user, options["rows"] - existing, seed=options["seed"])
+
+        self.token = f"Bearer {AccessToken.for_user(user)}"
+        throttle = UserRateThrottle()
+        self.throttle_key = throttle.cache_format % {"scope": throttle.scope, "ident": user.pk}
+
+        database = connections[DEFAULT_DB_ALIAS].settings_dict
+        original = (database["CONN_MAX_AGE"], dict(database["OPTIONS"]))
+        modes = ["per-request", "persistent"]
+        if connections[DEFAULT_DB_ALIAS].vendor == "postgresql":
+            modes.append("pool")
+        else:
+            self.stdout.write("The pool needs PostgreSQL; comparing per-request and persistent connections only.")
+
+        self.stdout.write(f"{options['requests']} requests per endpoint at concurrency {options['concurrency']}")
+        self.stdout.write(f"{'endpoint':<26}{'mode':<13}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'req/s':>9}{'errors':>8}")
+        try:
+            for path in ENDPOINTS:
+                for mode in modes:
+                    self.configure(database, mode, original)
+                    samples, errors, elapsed = self.run(path, options)
+                    self.stdout.write(
+                        f"{path:<26}{mode:<13}{percentile(samples, 50) * 1000:>9.2f}{percentile(samples, 95) * 1000:>9.2f}"
+                        f"{percentile(samples, 99) * 1000:>9.2f}{len(samples) / elapsed:>9.0f}{errors:>8}"
+                    )
+        finally:
+            self.configure(database, None, original)
+
+        if not options["keep_data"]:
+            Transaction.objects.filter(user=user).delete()
+            user.delete()
+
+    def configure(self, database, mode, original):
+        """Switch the default database to ``mode``; ``None`` restores the configured settings."""
+        connection = connections[DEFAULT_DB_ALIAS]
+        connection.close()
+        if getattr(connection, "pool", None) is not None:
+            connection.close_pool()
+        max_age, options = original
+        if mode is None:
+            database["CONN_MAX_AGE"] = max_age
+            database["OPTIONS"] = dict(options)
+            return
+        database["CONN_MAX_AGE"] = PERSISTENT_MAX_AGE if mode == "persistent" else 0
+        database["OPTIONS"] = {key: value for key, value in options.items() if key != "pool"}
+        if mode == "pool":
+            database["OPTIONS"]["pool"] = options.get("pool") or settings.DATABASE_POOL["OPTIONS"]
+
+    def run(self, path, options):
+        local = threading.local()
+
+        def request(_):
+            if not hasattr(local, "client"):
+                local.client = Client(HTTP_AUTHORIZATION=self.token)
+            cache.delete(self.throttle_key)
+            started = time.perf_counter()
+            response = local.client.get(path)
+            return time.perf_counter() - started, response.status_code
+
+        def close(_):
+            connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+            # Untimed requests first so every mode is measured in its steady state.
+            list(pool.map(request, range(options["concurrency"])))
+            started = time.perf_counter()
+            results = list(pool.map(request, range(options["requests"])))
+            elapsed = time.perf_counter() - started
+            # Persistent connections belong to the worker threads; close them before the next mode.
+            list(pool.map(close, range(options["concurrency"])))
+        return [duration for duration, _ in results], sum(1 for _, code in results if code != 200), elapsed
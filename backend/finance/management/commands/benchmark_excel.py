@@ -0,0 +1,60 @@
+import time
+import tracemalloc
+from datetime import date, timedelta
+from decimal import Decimal
+from io import BytesIO
+from openpyxl import Workbook
+from django.core.management.base import BaseCommand
+from finance.services.exports import EXPORT_HEADER, excel_file
+
+
+def synthetic_rows(count):
+    start = date.today() - timedelta(days=3650)
+    for i in range(count):
+        yield (Decimal(f"{(i % 5000) + 1}.25"), "expense", f"Category {i % 12}", start + timedelta(days=i % 3650), f"Note {i}")
+
+
+def legacy_export(rows):
+    """The in-memory implementation ExportExcelView used before the write-only workbook."""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Transactions"
+    ws.append(EXPORT_HEADER)
+    for amount, tx_type, category, tx_date, note in rows:
+        ws.append([float(amount), tx_type, category, tx_date.isoformat(), note])
+    output = BytesIO()
+    wb.save(output)
+    output.seek(0)
+    return len(output.getvalue())
+
+
+def streaming_export(rows):
+    output = excel_file(rows)
+    size = 0
+    while chunk := output.read(64 * 1024):
+        size += len(chunk)
+    output.close()
+    return size
+
+
+class Command(BaseCommand):
+    help = "Compare peak memory and time of the legacy and write-only Excel exports"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+        parser.add_argument("--skip-legacy-above", type=int, default=None, help="Skip the legacy export above this many rows")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'rows':>10}  {'mode':<10}{'seconds':>10}{'peak MiB':>12}{'file MiB':>12}")
+        for size in options["sizes"]:
+            modes = [("write-only", streaming_export)]
+            if options["skip_legacy_above"] is None or size <= options["skip_legacy_above"]:
+                modes.insert(0, ("legacy", legacy_export))
+            for label, export in modes:
+                tracemalloc.start()
+                started = time.perf_counter()
+                file_size = export(synthetic_rows(size))
+                elapsed = time.perf_counter() - started
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                self.stdout.write(f"{size:>10}  {label:<10}{elapsed:>10.2f}{peak / 2**20:>12.1f}{file_size / 2**20:>12.1f}")
@@ -0,0 +1,106 @@
+import time
+from datetime import date, timedelta
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Sum
+from finance.models import Transaction
+from finance.services.datagen import seed_transactions
+
+
+class Command(BaseCommand):
+    help = "Show EXPLAIN plans and timings for hot transaction queries with and without the composite indexes"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=200000, help="Transactions to seed for the benchmark user")
+        parser.add_argument("--repeat", type=int, default=20, help="Timed runs per query")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--keep-data", action="store_true", help="Keep the benchmark user and its data")
+        parser.add_argument(
+            "--allow-schema-changes",
+            action="store_true",
+            help="Confirm that the Transaction indexes may be dropped for the duration of the unindexed pass",
+        )
+
+    def handle(self, *args, **options):
+        if not options["allow_schema_changes"]:
+            raise CommandError(
+                "The unindexed pass drops the Transaction indexes for every user and locks the table while it runs. "
+                "Run it against a scratch database and pass --allow-schema-changes to confirm."
+            )
+        User = get_user_model()
+        user, _ = User.objects.get_or_create(email="bench-indexes@example.com", defaults={"username": "bench_indexes"})
+        existing = Transaction.objects.filter(user=user).count()
+        if existing < options["rows"]:
+            self.stdout.write(f"Seeding {options['rows'] - existing} transactions...")
+            seed_transactions(user, options["rows"] - existing, seed=options["seed"])
+
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(f"ANALYZE {Transaction._meta.db_table}")
+
+        before = self.run_without_indexes(user, options["repeat"])
+        after = self.run_queries(user, options["repeat"], "with indexes")
+
+        self.stdout.write("")
+        self.stdout.write(f"{'query':<28}{'before ms':>12}{'after ms':>12}{'speedup':>10}")
+        for name, elapsed in before.items():
+            speedup = elapsed / after[name] if after[name] else 0
+            self.stdout.write(f"{name:<28}{elapsed:>12.3f}{after[name]:>12.3f}{speedup:>9.1f}x")
+
+        if not options["keep_data"]:
+            Transaction.objects.filter(user=user).delete()
+            user.delete()
+
+    def run_without_indexes(self, user, repeat):
+        """Time the queries with the composite indexes dropped, then put the indexes back.
+
+        Where DDL is transactional (PostgreSQL, SQLite) the drop happens in a transaction
+        that is always rolled back, so a crash cannot leave the indexes missing.
+        """
+        indexes = Transaction._meta.indexes
+        if connection.features.can_rollback_ddl:
+            # SQLite's schema editor refuses to run inside atomic() unless foreign key checks are off; nothing is written here.
+            with connection.constraint_checks_disabled(), transaction.atomic():
+                with connection.schema_editor() as editor:
+                    for index in indexes:
+                        editor.remove_index(Transaction, index)
+                timings = self.run_queries(user, repeat, "without indexes")
+                transaction.set_rollback(True)
+            return timings
+
+        try:
+            with connection.schema_editor() as editor:
+                for index in indexes:
+                    editor.remove_index(Transaction, index)
+            return self.run_queries(user, repeat, "without indexes")
+        finally:
+            with connection.schema_editor() as editor:
+                for index in indexes:
+                    editor.add_index(Transaction, index)
+
+    def queries(self, user):
+        today = date.today()
+        month_start = today.replace(day=1)
+        next_month = (month_start + timedelta(days=32)).replace(day=1)
+        base = Transaction.objects.filter(user=user)
+        return {
+            "month_expense_sum": base.filter(transaction_type="expense", date__gte=month_start, date__lt=next_month).order_by().values("transaction_type").annotate(total=Sum("amount")),
+            "year_income_sum": base.filter(transaction_type="income", date__gte=today.replace(month=1, day=1)).order_by().values("transaction_type").annotate(total=Sum("amount")),
+            "latest_page": base.order_by("-date", "-created_at")[:50],
+            "category_totals": base.filter(transaction_type="expense").order_by().values("category").annotate(total=Sum("amount")),
+        }
+
+    def run_queries(self, user, repeat, label):
+        self.stdout.write(self.style.MIGRATE_HEADING(f"\n== {label} =="))
+        timings = {}
+        for name, queryset in self.queries(user).items():
+            options = {"analyze": True, "buffers": True} if connection.vendor == "postgresql" else {}
+            self.stdout.write(self.style.SQL_KEYWORD(f"-- {name}"))
+            self.stdout.write(queryset.explain(**options))
+            list(queryset)
+            started = time.perf_counter()
+            for _ in range(repeat):
+                list(queryset.all())
+            timings[name] = (time.perf_counter() - started) / repeat * 1000
+        return timings
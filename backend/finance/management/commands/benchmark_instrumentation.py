@@ -0,0 +1,71 @@
+import statistics
+import time
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+from rest_framework.throttling import UserRateThrottle
+from rest_framework_simplejwt.tokens import AccessToken
+from finance.models import Transaction
+from finance.services.datagen import seed_transactions
+from finance.services.metrics import registry
+
+MIDDLEWARE_PATH = "finance.middleware.InstrumentationMiddleware"
+ENDPOINTS = ["/api/transactions/", "/api/dashboard/summary/", "/api/analytics/insights/", "/api/analytics/charts/"]
+
+
+class Command(BaseCommand):
+    help = "Measure the per-request overhead of the instrumentation middleware and analytics timers"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=5000)
+        parser.add_argument("--requests", type=int, default=100, help="Requests per endpoint and mode")
+        parser.add_argument("--rounds", type=int, default=5, help="Alternate modes this many times to even out drift")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--keep-data", action="store_true", help="Keep the benchmark user and its data")
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        user, _ = User.objects.get_or_create(email="bench-instrumentation@example.com", defaults={"username": "bench_instrumentation"})
+        existing = Transaction.objects.filter(user=user).count()
+        if existing < options["rows"]:
+            self.stdout.write(f"Seeding {options['rows'] - existing} transactions...")
+            seed_transactions(user, options["rows"] - existing, seed=options["seed"])
+
+        throttle = UserRateThrottle()
+        throttle_key = throttle.cache_format % {"scope": throttle.scope, "ident": user.pk}
+        base_middleware = [path for path in settings.MIDDLEWARE if path != MIDDLEWARE_PATH]
+        modes = {
+            "off": {"MIDDLEWARE": base_middleware, "INSTRUMENTATION": {**settings.INSTRUMENTATION, "ENABLED": False}},
+            "on": {"MIDDLEWARE": [MIDDLEWARE_PATH, *base_middleware], "INSTRUMENTATION": {**settings.INSTRUMENTATION, "ENABLED": True, "SLOW_REQUEST_MS": 60000}},
+        }
+        token = f"Bearer {AccessToken.for_user(user)}"
+        samples = {(mode, path): [] for mode in modes for path in ENDPOINTS}
+
+        for _ in range(options["rounds"]):
+            for mode, overrides in modes.items():
+                with override_settings(**overrides):
+                    # A fresh client per mode so the handler loads that mode's middleware chain.
+                    client = Client(HTTP_AUTHORIZATION=token)
+                    for path in ENDPOINTS:
+                        client.get(path)
+                        for _ in range(options["requests"] // options["rounds"] or 1):
+                            cache.delete(throttle_key)
+                            started = time.perf_counter()
+                            client.get(path)
+                            samples[(mode, path)].append(time.perf_counter() - started)
+
+        self.stdout.write(f"{'endpoint':<30}{'off ms':>10}{'on ms':>10}{'overhead us':>13}{'overhead':>10}")
+        overheads = []
+        for path in ENDPOINTS:
+            off = statistics.median(samples[("off", path)])
+            on = statistics.median(samples[("on", path)])
+            overheads.append((on - off) / off)
+            self.stdout.write(f"{path:<30}{off * 1000:>10.2f}{on * 1000:>10.2f}{(on - off) * 1e6:>13.0f}{(on - off) / off:>10.1%}")
+        self.stdout.write(f"Median overhead across endpoints: {statistics.median(overheads):.1%}")
+        registry.reset()
+
+        if not options["keep_data"]:
+            Transaction.objects.filter(user=user).delete()
+            user.delete()
@@ -0,0 +1,65 @@
+import time
+from urllib.parse import parse_qs, urlparse
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from finance.models import Transaction
+from finance.pagination import TransactionPagination
+from finance.services.datagen import seed_transactions
+
+
+class Command(BaseCommand):
+    help = "Compare latency of a deep transaction page with keyset and OFFSET pagination"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--page", type=int, default=1000, help="Page number to fetch")
+        parser.add_argument("--page-size", type=int, default=50)
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--keep-data", action="store_true", help="Keep the benchmark user and its data")
+
+    def handle(self, *args, **options):
+        page, size = options["page"], options["page_size"]
+        rows = page * size + size
+        User = get_user_model()
+        user, _ = User.objects.get_or_create(email="bench-pagination@example.com", defaults={"username": "bench_pagination"})
+        existing = Transaction.objects.filter(user=user).count()
+        if existing < rows:
+            self.stdout.write(f"Seeding {rows - existing} transactions...")
+            seed_transactions(user, rows - existing, seed=options["seed"])
+
+        factory = APIRequestFactory()
+        queryset = Transaction.objects.filter(user=user)
+        offset = (page - 1) * size
+
+        keyset = TransactionPagination()
+        keyset.request = Request(factory.get("/api/transactions/"))
+        keyset.fields = keyset.get_ordering(queryset)
+        anchor = queryset.order_by(*keyset.fields)[offset - 1]
+        cursor = parse_qs(urlparse(keyset.build_link("next", keyset.row_values(anchor))).query)["cursor"][0]
+        keyset_request = Request(factory.get("/api/transactions/", {"cursor": cursor, "page_size": size, "count": "false"}))
+        offset_request = Request(factory.get("/api/transactions/", {"offset": offset, "limit": size}))
+
+        def run_keyset():
+            return TransactionPagination().paginate_queryset(queryset, keyset_request)
+
+        def run_offset():
+            return LimitOffsetPagination().paginate_queryset(queryset.order_by(*keyset.fields), offset_request)
+
+        assert [tx.pk for tx in run_keyset()] == [tx.pk for tx in run_offset()], "Paginators returned different pages"
+
+        self.stdout.write(f"page={page} page_size={size} rows={queryset.count()}")
+        for label, run in (("keyset", run_keyset), ("offset", run_offset)):
+            timings = []
+            for _ in range(options["repeat"]):
+                started = time.perf_counter()
+                run()
+                timings.append((time.perf_counter() - started) * 1000)
+            timings.sort()
+            self.stdout.write(f"{label:<8} median={timings[len(timings) // 2]:.2f}ms max={timings[-1]:.2f}ms")
+
+        if not options["keep_data"]:
+            Transaction.objects.filter(user=user).delete()
+            user.delete()
@@ -0,0 +1,43 @@
+import tempfile
+import time
+import tracemalloc
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from finance.models import Transaction
+from finance.services.datagen import seed_transactions
+from finance.services.reports import write_pdf
+
+
+class Command(BaseCommand):
+    help = "Render the full PDF report for a seeded user and report pages per second and peak memory"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=50000, help="Transactions to seed for the benchmark user")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--keep-data", action="store_true", help="Keep the benchmark user and its data")
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        user, _ = User.objects.get_or_create(email="bench-pdf@example.com", defaults={"username": "bench_pdf"})
+        existing = Transaction.objects.filter(user=user).count()
+        if existing < options["rows"]:
+            self.stdout.write(f"Seeding {options['rows'] - existing} transactions...")
+            seed_transactions(user, options["rows"] - existing, seed=options["seed"])
+
+        with tempfile.TemporaryFile() as output:
+            tracemalloc.start()
+            started = time.perf_counter()
+            pages = write_pdf(user, Transaction.objects.filter(user=user), output)
+            elapsed = time.perf_counter() - started
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            size = output.tell()
+
+        self.stdout.write(
+            f"rows={options['rows']} pages={pages} seconds={elapsed:.2f} "
+            f"pages_per_second={pages / elapsed:.1f} peak_mib={peak / 2**20:.1f} file_mib={size / 2**20:.1f}"
+        )
+
+        if not options["keep_data"]:
+            Transaction.objects.filter(user=user).delete()
+            user.delete()
@@ -0,0 +1,58 @@
+import time
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Q
+from finance.models import Transaction
+from finance.services.datagen import seed_transactions
+from finance.services.search import search_transactions
+
+QUERIES = ["groceries", "taxi", "online ord", "salary", "pharm"]
+
+
+class Command(BaseCommand):
+    help = "Compare transaction search latency against the SearchFilter icontains scan"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1000000)
+        parser.add_argument("--repeat", type=int, default=10)
+        parser.add_argument("--limit", type=int, default=50)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--keep-data", action="store_true", help="Keep the benchmark user and its data")
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        user, _ = User.objects.get_or_create(email="bench-search@example.com", defaults={"username": "bench_search"})
+        existing = Transaction.objects.filter(user=user).count()
+        if existing < options["rows"]:
+            self.stdout.write(f"Seeding {options['rows'] - existing} transactions...")
+            seed_transactions(user, options["rows"] - existing, seed=options["seed"])
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(f"ANALYZE {Transaction._meta.db_table}")
+
+        base = Transaction.objects.filter(user=user).select_related("category")
+        limit = options["limit"]
+        self.stdout.write(f"backend={connection.vendor} rows={options['rows']} limit={limit}")
+        self.stdout.write(f"{'query':<14}{'search ms':>12}{'icontains ms':>14}")
+        for text in QUERIES:
+            legacy = Q()
+            for term in text.split():
+                legacy &= Q(note__icontains=term) | Q(category__name__icontains=term)
+            search_ms = self.time(lambda: list(search_transactions(base, text)[:limit]), options["repeat"])
+            legacy_ms = self.time(lambda: list(base.filter(legacy)[:limit]), options["repeat"])
+            self.stdout.write(f"{text:<14}{search_ms:>12.2f}{legacy_ms:>14.2f}")
+
+        if not options["keep_data"]:
+            Transaction.objects.filter(user=user).delete()
+            user.delete()
+
+    @staticmethod
+    def time(run, repeat):
+        run()
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run()
+            timings.append((time.perf_counter() - started) * 1000)
+        return sorted(timings)[len(timings) // 2]
@@ -0,0 +1,61 @@
+import time
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from rest_framework import serializers
+from finance.models import Transaction
+from finance.serializers import TransactionSerializer
+from finance.services.datagen import seed_transactions
+
+
+class Command(BaseCommand):
+    help = "Measure transaction list serialization throughput and query counts"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10000)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--keep-data", action="store_true", help="Keep the benchmark user and its data")
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        user, _ = User.objects.get_or_create(email="bench-serialization@example.com", defaults={"username": "bench_serialization"})
+        existing = Transaction.objects.filter(user=user).count()
+        if existing < options["rows"]:
+            self.stdout.write(f"Seeding {options['rows'] - existing} transactions...")
+            seed_transactions(user, options["rows"] - existing, seed=options["seed"])
+
+        base = Transaction.objects.filter(user=user)[: options["rows"]]
+        optimised = (
+            Transaction.objects.filter(user=user)
+            .select_related("category")
+            .only("id", "amount", "transaction_type", "category_id", "category__name", "date", "note", "created_at", "updated_at")[: options["rows"]]
+        )
+        modes = [
+            ("field serializer, no join", lambda: serializers.ListSerializer(child=TransactionSerializer(), instance=list(base.all())).data),
+            ("field serializer, join", lambda: serializers.ListSerializer(child=TransactionSerializer(), instance=list(optimised.all())).data),
+            ("list serializer, join", lambda: TransactionSerializer(list(optimised.all()), many=True).data),
+        ]
+        assert modes[1][1]() == modes[2][1](), "Optimised serializer output differs"
+
+        self.stdout.write(f"{'mode':<28}{'queries':>9}{'seconds':>10}{'rows/s':>12}")
+        for label, run in modes:
+            queries = []
+
+            def count_query(execute, sql, params, many, context):
+                queries.append(sql)
+                return execute(sql, params, many, context)
+
+            with connection.execute_wrapper(count_query):
+                run()
+            best = None
+            for _ in range(options["repeat"]):
+                started = time.perf_counter()
+                rows = len(run())
+                elapsed = time.perf_counter() - started
+                best = elapsed if best is None else min(best, elapsed)
+            self.stdout.write(f"{label:<28}{len(queries):>9}{best:>10.3f}{rows / best:>12.0f}")
+
+        if not options["keep_data"]:
+            Transaction.objects.filter(user=user).delete()
+            user.delete()
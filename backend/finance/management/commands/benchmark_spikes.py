@@ -0,0 +1,125 @@
+import statistics
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from finance.models import CategoryAmountStats, SpikeSettings, Transaction
+from finance.services.analytics import detect_unusual_spikes
+from finance.services.datagen import seed_transactions
+from finance.services.spikes import (
+    anomaly_messages,
+    load_spike_configs,
+    monthly_spikes,
+    previous_months,
+    score_transactions,
+)
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def rescan(user, reference_date):
+    """The same detection with no maintained baselines: every expense transaction is read back."""
+    config = load_spike_configs([user.pk])[user.pk]
+    current_month = reference_date.replace(day=1)
+    months = previous_months(current_month, config["window_months"])
+    history = defaultdict(lambda: defaultdict(Decimal))
+    sums = defaultdict(lambda: [0, Decimal("0"), Decimal("0")])
+    current_rows = []
+    rows = Transaction.objects.filter(user=user, transaction_type=Transaction.TransactionType.EXPENSE).values_list(
+        "id", "user_id", "category_id", "category__name", "date", "amount"
+    )
+    for row in rows.order_by("date", "id").iterator():
+        _, _, category_id, category, tx_date, amount = row
+        month = tx_date.replace(day=1)
+        if months[0] <= month <= current_month:
+            history[month][category] += amount
+        if month == current_month:
+            current_rows.append(row)
+        stat = sums[category_id]
+        stat[0] += 1
+        stat[1] += amount
+        stat[2] += amount * amount
+
+    minimum = settings.SPIKE_DETECTION["MIN_TRANSACTIONS"]
+    stats = {
+        (user.pk, category_id): CategoryAmountStats(count=count, total=total, sum_squares=squares)
+        for category_id, (count, total, squares) in sums.items()
+        if count > minimum
+    }
+    current = history.pop(current_month, {})
+    anomalies = score_transactions(current_rows, stats, {user.pk: config})[user.pk]
+    return monthly_spikes(current, history, months, config) + anomaly_messages(anomalies)
+
+
+class Command(BaseCommand):
+    help = "Compare spike detection from maintained baselines with a rescan of the raw transaction history"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--years", type=int, default=10)
+        parser.add_argument("--rows", type=int, default=60000, help="Transactions spread over the history")
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--method", choices=[choice for choice, _ in SpikeSettings.Method.choices], help="Default: SPIKE_DETECTION['METHOD']")
+        parser.add_argument("--window", type=int, help="Baseline window in months (default: SPIKE_DETECTION['WINDOW_MONTHS'])")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--keep-data", action="store_true", help="Keep the benchmark user and its data")
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        user, _ = User.objects.get_or_create(email="bench-spikes@example.com", defaults={"username": "bench_spikes"})
+        today = date.today()
+        existing = Transaction.objects.filter(user=user).count()
+        if existing < options["rows"]:
+            self.stdout.write(f"Seeding {options['rows'] - existing} transactions over {options['years']} years...")
+            seed_transactions(
+                user, options["rows"] - existing, seed=options["seed"], start=today - timedelta(days=365 * options["years"]), end=today
+            )
+        SpikeSettings.objects.update_or_create(user=user, defaults={"method": options["method"] or "", "window_months": options["window"]})
+        config = load_spike_configs([user.pk])[user.pk]
+        self.stdout.write(
+            f"{Transaction.objects.filter(user=user).count()} transactions, {CategoryAmountStats.objects.filter(user=user).count()} categories, "
+            f"method {config['method']}, {config['window_months']}-month window"
+        )
+
+        results = {}
+        self.stdout.write(f"{'detector':<14}{'queries':>9}{'p50 ms':>10}{'max ms':>10}")
+        for label, detect in (("rescan", rescan), ("incremental", detect_unusual_spikes)):
+            samples = []
+            for _ in range(options["repeat"]):
+                counter = QueryCounter()
+                with connection.execute_wrapper(counter):
+                    started = time.perf_counter()
+                    results[label] = detect(user, today)
+                    samples.append(time.perf_counter() - started)
+            self.stdout.write(f"{label:<14}{counter.count:>9}{statistics.median(samples) * 1000:>10.2f}{max(samples) * 1000:>10.2f}")
+
+        # Cost a single write pays to keep the rollup, budget and category baselines current.
+        category = CategoryAmountStats.objects.filter(user=user).select_related("category").first().category
+        samples = []
+        for _ in range(options["repeat"]):
+            counter = QueryCounter()
+            with connection.execute_wrapper(counter):
+                started = time.perf_counter()
+                tx = Transaction.objects.create(user=user, amount=Decimal("12.50"), transaction_type="expense", category=category, date=today)
+                samples.append(time.perf_counter() - started)
+            tx.delete()
+        self.stdout.write(f"{'write':<14}{counter.count:>9}{statistics.median(samples) * 1000:>10.2f}{max(samples) * 1000:>10.2f}")
+
+        if results["rescan"] != results["incremental"]:
+            self.stdout.write(self.style.WARNING(f"Results differ:\n  rescan:      {results['rescan']}\n  incremental: {results['incremental']}"))
+        else:
+            self.stdout.write(f"Both detectors report the same {len(results['incremental'])} messages.")
+
+        if not options["keep_data"]:
+            Transaction.objects.filter(user=user).delete()
+            user.delete()
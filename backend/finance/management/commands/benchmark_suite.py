@@ -0,0 +1,298 @@
+import json
+import math
+import platform
+import random
+import time
+import tracemalloc
+from datetime import date, timedelta
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.urls import get_resolver
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+from finance.models import Transaction
+from finance.services import analytics
+from finance.services.cache import reset_cache
+from finance.services.datagen import insert_goals_and_budgets, seed_transactions
+
+BENCH_PASSWORD = "BenchSuite123!"
+BENCH_NOTE = "benchmark-suite write"
+
+# Public analytics functions and how to call them; each takes (user, reference_date) or (user).
+ANALYTICS_CALLS = [
+    ("get_totals", lambda user, ref: analytics.get_totals(user)),
+    ("get_monthly_overview", lambda user, ref: analytics.get_monthly_overview(user, ref)),
+    ("get_category_totals", lambda user, ref: analytics.get_category_totals(user)),
+    ("get_trend_data", lambda user, ref: analytics.get_trend_data(user)),
+    ("calculate_budget_status", lambda user, ref: analytics.calculate_budget_status(user, ref)),
+    ("monthly_comparison", lambda user, ref: analytics.monthly_comparison(user, ref)),
+    ("get_saving_recommendation", lambda user, ref: analytics.get_saving_recommendation(user, ref)),
+    ("generate_insights", lambda user, ref: analytics.generate_insights(user, ref)),
+    ("detect_unusual_spikes", lambda user, ref: analytics.detect_unusual_spikes(user, ref)),
+    ("goal_trends", lambda user, ref: analytics.goal_trends(user)),
+]
+
+# Routes left out: account lifecycle, the browsable API root, write/detail routes that need per-run fixtures,
+# and /metrics, which is only served with instrumentation on and to allowed addresses.
+SKIPPED_URL_NAMES = {
+    "register", "logout", "api-root", "transaction-bulk-import", "report-job-detail", "report-job-download",
+    "saving-contribution-detail", "budget-detail", "metrics",
+}
+
+
+def endpoint_calls(fixture):
+    """(label, url name, method, path, body, heavy) for every API route, with ids taken from the fixture user.
+
+    ``body`` may be a callable for requests that cannot be replayed, such as a rotated refresh token.
+    """
+    tx = fixture["transaction_id"]
+    return [
+        ("auth login", "login", "post", "/api/auth/login/", {"email": fixture["email"], "password": BENCH_PASSWORD}, False),
+        ("auth refresh", "token_refresh", "post", "/api/auth/refresh/", lambda: {"refresh": next(fixture["refresh_tokens"])}, False),
+        ("categories list", "category-list", "get", "/api/categories/", None, False),
+        ("category detail", "category-detail", "get", f"/api/categories/{fixture['category_id']}/", None, False),
+        ("transactions list", "transaction-list", "get", "/api/transactions/", None, False),
+        ("transactions filtered", "transaction-list", "get", "/api/transactions/?type=expense&ordering=-amount", None, False),
+        ("transaction detail", "transaction-detail", "get", f"/api/transactions/{tx}/", None, False),
+        ("transaction create", "transaction-list", "post", "/api/transactions/", {
+            "amount": "12.50", "transaction_type": "expense", "category": fixture["category_id"],
+            "date": fixture["reference_date"], "note": BENCH_NOTE,
+        }, False),
+        ("transactions search", "transaction-search", "get", "/api/transactions/search/?q=coffee", None, False),
+        ("saving goals list", "saving-goal-list", "get", "/api/saving-goals/", None, False),
+        ("saving goal detail", "saving-goal-detail", "get", f"/api/saving-goals/{fixture['goal_id']}/", None, False),
+        ("contributions list", "saving-contribution-list", "get", "/api/saving-contributions/", None, False),
+        ("budgets list", "budget-list", "get", "/api/budgets/", None, False),
+        ("budget status", "budget-current-status", "get", "/api/budgets/status/", None, False),
+        ("budget alerts", "budget-alerts", "get", "/api/budgets/alerts/", None, False),
+        ("dashboard summary", "dashboard-summary", "get", "/api/dashboard/summary/", None, False),
+        ("dashboard bundle", "dashboard-bundle", "get", "/api/dashboard/bundle/", None, False),
+        ("insights", "insights", "get", "/api/analytics/insights/", None, False),
+        ("charts", "charts", "get", "/api/analytics/charts/", None, False),
+        # The async views run their queries on fan-out threads with their own connections, which the query count misses.
+        ("async dashboard summary", "async-dashboard-summary", "get", "/api/async/dashboard/summary/", None, False),
+        ("async insights", "async-insights", "get", "/api/async/analytics/insights/", None, False),
+        ("async charts", "async-charts", "get", "/api/async/analytics/charts/", None, False),
+        ("forecast", "forecast", "get", "/api/analytics/forecast/", None, False),
+        ("spike settings", "spike-settings", "get", "/api/analytics/spike-settings/", None, False),
+        ("anomalies", "anomalies", "get", "/api/analytics/anomalies/", None, False),
+        ("cache stats", "analytics-cache-stats", "get", "/api/analytics/cache-stats/", None, False),
+        ("report jobs list", "report-job-list", "get", "/api/reports/jobs/", None, False),
+        ("export csv", "export-csv", "get", "/api/reports/export/csv/", None, True),
+        ("export excel", "export-excel", "get", "/api/reports/export/excel/", None, True),
+        ("export pdf", "export-pdf", "get", "/api/reports/export/pdf/", None, True),
+    ]
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def summarise(samples, queries, peak_bytes):
+    return {
+        "runs": len(samples),
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p95_ms": round(percentile(samples, 95) * 1000, 3),
+        "p99_ms": round(percentile(samples, 99) * 1000, 3),
+        "mean_ms": round(sum(samples) / len(samples) * 1000, 3),
+        "max_ms": round(max(samples) * 1000, 3),
+        "queries": queries,
+        "peak_kb": round(peak_bytes / 1024, 1),
+    }
+
+
+def consume(response):
+    """Read the full body so streaming responses are timed end to end."""
+    if response.streaming:
+        for _ in response.streaming_content:
+            pass
+    return response
+
+
+class Command(BaseCommand):
+    help = "Time every analytics function and API endpoint at several dataset sizes and compare with a baseline"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="1000,10000", help="Comma-separated transaction counts, one user per size")
+        parser.add_argument("--repeat", type=int, default=20, help="Timed runs per function/endpoint")
+        parser.add_argument("--heavy-repeat", type=int, default=3, help="Timed runs for export endpoints")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--warm-cache", action="store_true", help="Keep the analytics cache between runs instead of measuring cold calls")
+        parser.add_argument("--only", default="", help="Only run functions/endpoints whose label contains this text")
+        parser.add_argument("--output", help="Write results as JSON to this path")
+        parser.add_argument("--baseline", help="Compare against a previous JSON result")
+        parser.add_argument("--threshold", type=float, default=0.25, help="Allowed p50 slowdown as a fraction of the baseline")
+        parser.add_argument("--min-delta-ms", type=float, default=2.0, help="Ignore slowdowns smaller than this many milliseconds")
+        parser.add_argument("--keep-data", action="store_true", help="Keep the benchmark users and their data")
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options["sizes"].split(",") if size.strip()]
+        results = {
+            "meta": {
+                "database": connection.vendor,
+                "python": platform.python_version(),
+                "sizes": sizes,
+                "repeat": options["repeat"],
+                "warm_cache": options["warm_cache"],
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            },
+            "sizes": {},
+        }
+
+        users = []
+        try:
+            for size in sizes:
+                user = self.bench_user(size, options["seed"])
+                users.append(user)
+                self.stdout.write(self.style.MIGRATE_HEADING(f"Dataset: {size} transactions"))
+                results["sizes"][str(size)] = {
+                    "analytics": self.run_analytics(user, options),
+                    "endpoints": self.run_endpoints(user, options),
+                }
+        finally:
+            if not options["keep_data"]:
+                for user in users:
+                    Transaction.objects.filter(user=user).delete()
+                    user.delete()
+
+        if options["output"]:
+            with open(options["output"], "w") as handle:
+                json.dump(results, handle, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
+
+        if options["baseline"]:
+            self.compare(results, options)
+
+    def bench_user(self, size, seed):
+        User = get_user_model()
+        email = f"bench-suite-{size}@example.com"
+        user = User.objects.filter(email=email).first()
+        if user and Transaction.objects.filter(user=user).count() == size:
+            return user
+        if user:
+            Transaction.objects.filter(user=user).delete()
+            user.delete()
+
+        self.stdout.write(f"Seeding {size} transactions for {email}...")
+        user = User.objects.create_user(email=email, username=f"bench_suite_{size}", password=BENCH_PASSWORD, is_staff=True)
+        end = date.today()
+        seed_transactions(user, size, seed=seed, end=end)
+        insert_goals_and_budgets(user, random.Random(f"{seed}:{size}"), end - timedelta(days=3 * 365), end)
+        return user
+
+    def measure(self, label, run, repeat, warm_cache):
+        queries = []
+
+        def count_query(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        # One untimed warm-up run counts queries; a second under tracemalloc records peak memory.
+        reset_cache()
+        with connection.execute_wrapper(count_query):
+            run()
+        reset_cache()
+        tracemalloc.start()
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        samples = []
+        for _ in range(repeat):
+            if not warm_cache:
+                reset_cache()
+            started = time.perf_counter()
+            run()
+            samples.append(time.perf_counter() - started)
+
+        stats = summarise(samples, len(queries), peak)
+        self.stdout.write(
+            f"  {label:<28}{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}"
+            f"{stats['queries']:>9}{stats['peak_kb']:>11.0f}"
+        )
+        return stats
+
+    def header(self, title):
+        self.stdout.write(f"  {title:<28}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'queries':>9}{'peak KB':>11}")
+
+    def run_analytics(self, user, options):
+        reference_date = date.today()
+        self.header("analytics function")
+        results = {}
+        for name, call in ANALYTICS_CALLS:
+            if options["only"] and options["only"] not in name:
+                continue
+            results[name] = self.measure(name, lambda: call(user, reference_date), options["repeat"], options["warm_cache"])
+        return results
+
+    def run_endpoints(self, user, options):
+        transaction = Transaction.objects.filter(user=user).order_by("-date", "-id").first()
+        goal = user.saving_goals.first()
+        fixture = {
+            "email": user.email,
+            # Refresh tokens are single-use once rotated, so issue one per run up front.
+            "refresh_tokens": iter([str(RefreshToken.for_user(user)) for _ in range(options["repeat"] + 2)]),
+            "transaction_id": transaction.pk,
+            "category_id": transaction.category_id,
+            "goal_id": goal.pk if goal else 0,
+            "reference_date": date.today().isoformat(),
+        }
+        client = Client(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+        calls = endpoint_calls(fixture)
+        self.warn_uncovered(calls)
+
+        self.header("endpoint")
+        results = {}
+        for label, _, method, path, body, heavy in calls:
+            if options["only"] and options["only"] not in label:
+                continue
+
+            def run(method=method, path=path, body=body, label=label):
+                if method == "get":
+                    response = client.get(path)
+                else:
+                    payload = body() if callable(body) else body
+                    response = client.post(path, data=json.dumps(payload), content_type="application/json")
+                consume(response)
+                if response.status_code >= 400:
+                    raise CommandError(f"{label}: {method.upper()} {path} returned {response.status_code}")
+
+            repeat = min(options["repeat"], options["heavy_repeat"]) if heavy else options["repeat"]
+            results[label] = self.measure(label, run, repeat, options["warm_cache"])
+        Transaction.objects.filter(user=user, note=BENCH_NOTE).delete()
+        return results
+
+    def warn_uncovered(self, calls):
+        covered = {name for _, name, *_ in calls} | SKIPPED_URL_NAMES
+        missing = sorted(
+            key for key in get_resolver().reverse_dict
+            if isinstance(key, str) and key not in covered and not key.startswith("admin")
+        )
+        if missing:
+            self.stdout.write(self.style.WARNING(f"  Endpoints not benchmarked: {', '.join(missing)}"))
+
+    def compare(self, results, options):
+        with open(options["baseline"]) as handle:
+            baseline = json.load(handle)
+
+        regressions = []
+        for size, groups in results["sizes"].items():
+            for group, entries in groups.items():
+                for label, current in entries.items():
+                    previous = baseline.get("sizes", {}).get(size, {}).get(group, {}).get(label)
+                    if not previous:
+                        continue
+                    delta = current["p50_ms"] - previous["p50_ms"]
+                    if delta > options["min_delta_ms"] and current["p50_ms"] > previous["p50_ms"] * (1 + options["threshold"]):
+                        regressions.append(f"{size} {group} '{label}': p50 {previous['p50_ms']:.2f}ms -> {current['p50_ms']:.2f}ms")
+                    if current["queries"] > previous["queries"]:
+                        regressions.append(f"{size} {group} '{label}': queries {previous['queries']} -> {current['queries']}")
+
+        if baseline.get("meta", {}).get("database") != connection.vendor:
+            self.stdout.write(self.style.WARNING(f"Baseline was recorded on {baseline.get('meta', {}).get('database')}, this run on {connection.vendor}."))
+        if regressions:
+            raise CommandError("Regressions against baseline:\n  " + "\n  ".join(regressions))
+        self.stdout.write(self.style.SUCCESS(f"No regressions beyond {options['threshold']:.0%} of baseline p50."))
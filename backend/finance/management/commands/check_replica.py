@@ -0,0 +1,50 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Max
+from finance.db_router import read_alias_for, replica_aliases, use_replica
+from finance.models import DataVersion, Transaction
+
+
+class Command(BaseCommand):
+    help = "Check that the read replicas are reachable, how far they lag and where analytics reads are routed"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", help="Email of a user whose routing (replica or pinned to the primary) to show")
+
+    def handle(self, *args, **options):
+        aliases = replica_aliases()
+        if not aliases:
+            self.stdout.write("No replica configured: every read uses the primary. Set POSTGRES_REPLICA_HOSTS or add replica_N to DATABASES.")
+            return
+
+        latest_write = DataVersion.objects.using(DEFAULT_DB_ALIAS).aggregate(latest=Max("updated_at"))["latest"]
+        self.stdout.write(f"{'alias':<14}{'vendor':<12}{'replay lag s':>14}{'behind last write s':>21}")
+        for alias in [DEFAULT_DB_ALIAS, *aliases]:
+            connection = connections[alias]
+            try:
+                connection.ensure_connection()
+            except Exception as exc:
+                self.stdout.write(self.style.ERROR(f"{alias:<14}unreachable: {exc}"))
+                continue
+            replay_lag = "-"
+            if connection.vendor == "postgresql":
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) WHERE pg_is_in_recovery()")
+                    row = cursor.fetchone()
+                    replay_lag = f"{row[0]:.2f}" if row and row[0] is not None else "-"
+            seen = DataVersion.objects.using(alias).aggregate(latest=Max("updated_at"))["latest"]
+            behind = f"{(latest_write - seen).total_seconds():.2f}" if latest_write and seen else "-"
+            self.stdout.write(f"{alias:<14}{connection.vendor:<12}{replay_lag:>14}{behind:>21}")
+
+        with use_replica():
+            self.stdout.write(f"Analytics reads are routed to: {Transaction.objects.all().db}")
+        self.stdout.write(f"Other reads and all writes use: {Transaction.objects.all().db}")
+
+        if options["user"]:
+            user = get_user_model().objects.filter(email=options["user"]).first()
+            if user is None:
+                raise CommandError(f"No user with email {options['user']}")
+            alias = read_alias_for(user)
+            state = "pinned to the primary after a recent write" if alias == DEFAULT_DB_ALIAS else "served by a replica"
+            self.stdout.write(f"{user.email}: analytics reads {state} ({alias})")
@@ -0,0 +1,58 @@
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from finance.db_router import close_connections_before_fork
+from finance.services.datagen import generate_users
+
+
+class Command(BaseCommand):
+    help = "Generate N synthetic users with M transactions each, plus goals, contributions and budgets"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10)
+        parser.add_argument("--transactions", type=int, default=1000, help="Transactions per user")
+        parser.add_argument("--years", type=int, default=3, help="Years of history per user")
+        parser.add_argument(
+            "--end-date", type=date.fromisoformat, help="Last day of the history, YYYY-MM-DD (default: today); fix it to reproduce a dataset"
+        )
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--workers", type=int, default=1, help="Worker processes")
+        parser.add_argument("--users-per-task", type=int, default=10)
+        parser.add_argument("--prefix", default="loadgen", help="Email/username prefix for generated users")
+        parser.add_argument("--password", default="LoadTest123!", help="Password for every generated user")
+
+    def handle(self, *args, **options):
+        prefix = options["prefix"]
+        if get_user_model().objects.filter(email__startswith=prefix, email__endswith="@example.com").exists():
+            raise CommandError(f"Users with prefix '{prefix}' already exist; pass a different --prefix.")
+
+        password_hash = make_password(options["password"])
+        # Resolved once so every worker anchors on the same day.
+        end = options["end_date"] or date.today()
+        chunk = options["users_per_task"]
+        tasks = [
+            (first, min(chunk, options["users"] - first), options["transactions"], options["seed"], options["years"], options["batch_size"], prefix, password_hash, end)
+            for first in range(0, options["users"], chunk)
+        ]
+
+        started = time.perf_counter()
+        if options["workers"] > 1:
+            # Forked workers must not share the parent's database connection.
+            close_connections_before_fork()
+            with ProcessPoolExecutor(max_workers=options["workers"], mp_context=multiprocessing.get_context("fork")) as pool:
+                results = list(pool.map(generate_users, *zip(*tasks)))
+        else:
+            results = [generate_users(*task) for task in tasks]
+        elapsed = time.perf_counter() - started
+
+        transactions = sum(result[0] for result in results)
+        other = sum(result[1] for result in results)
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated {options['users']} users, {transactions} transactions and {other} goals/contributions/budgets "
+            f"in {elapsed:.1f}s ({transactions / elapsed:.0f} transactions/s), ending {end.isoformat()}."
+        ))
@@ -0,0 +1,29 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from finance.services.importer import import_transactions, parse_rows
+
+
+class Command(BaseCommand):
+    help = "Bulk import transactions for a user from a CSV or JSON file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV or JSON file (columns: amount, transaction_type, category, date, note)")
+        parser.add_argument("--user", required=True, help="Email of the user who owns the transactions")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        user = get_user_model().objects.filter(email=options["user"]).first()
+        if user is None:
+            raise CommandError(f"User {options['user']} not found.")
+
+        with open(options["path"], "rb") as fileobj:
+            result = import_transactions(user, parse_rows(fileobj, options["path"]), options["batch_size"]).as_dict()
+
+        for error in result["errors"]:
+            self.stdout.write(self.style.WARNING(f"Row {error['row']}: {' '.join(error['errors'])}"))
+        if result["file_error"]:
+            self.stdout.write(self.style.ERROR(f"Stopped at row {result['file_error']['row']}: {result['file_error']['detail']}"))
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {result['created']} of {result['rows']} rows in {result['seconds']}s "
+            f"({result['rows_per_second']} rows/s)."
+        ))
@@ -0,0 +1,33 @@
+import time
+from datetime import date
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from finance.services.forecasting import refresh_forecasts
+
+
+class Command(BaseCommand):
+    help = "Precompute forecast snapshots for every active user (run nightly)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Users forecast together per batch of queries")
+        parser.add_argument("--date", type=date.fromisoformat, default=None, help="Reference date, YYYY-MM-DD (default: today)")
+
+    def handle(self, *args, **options):
+        reference_date = options["date"] or date.today()
+        user_ids = get_user_model().objects.filter(is_active=True).order_by("pk").values_list("pk", flat=True)
+
+        started = time.perf_counter()
+        done = 0
+        batch = []
+        for user_id in user_ids.iterator(chunk_size=options["batch_size"]):
+            batch.append(user_id)
+            if len(batch) >= options["batch_size"]:
+                done += len(refresh_forecasts(batch, reference_date))
+                batch = []
+        if batch:
+            done += len(refresh_forecasts(batch, reference_date))
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Forecast {done} users for {reference_date} in {elapsed:.1f}s ({done / elapsed if elapsed else 0:.0f} users/s)."
+        ))
@@ -0,0 +1,48 @@
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import F
+from finance.db_router import close_connections_before_fork
+from finance.services.insights import refresh_insight_snapshots
+
+
+class Command(BaseCommand):
+    help = "Precompute insight snapshots for all users, or one shard of them, in set-based batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Users computed together per batch of queries")
+        parser.add_argument("--workers", type=int, default=1, help="Worker processes")
+        parser.add_argument("--shard-count", type=int, default=1, help="Split users by id into this many shards")
+        parser.add_argument("--shard-index", type=int, default=0, help="Shard to process, 0-based")
+        parser.add_argument("--date", type=date.fromisoformat, default=None, help="Reference date, YYYY-MM-DD (default: today)")
+
+    def handle(self, *args, **options):
+        shard_count, shard_index = options["shard_count"], options["shard_index"]
+        if not 0 <= shard_index < shard_count:
+            raise CommandError("--shard-index must be between 0 and --shard-count - 1.")
+        reference_date = options["date"] or date.today()
+
+        users = get_user_model().objects.filter(is_active=True)
+        if shard_count > 1:
+            users = users.alias(shard=F("pk") % shard_count).filter(shard=shard_index)
+        user_ids = list(users.order_by("pk").values_list("pk", flat=True))
+        size = options["batch_size"]
+        batches = [user_ids[start:start + size] for start in range(0, len(user_ids), size)]
+
+        started = time.perf_counter()
+        if options["workers"] > 1 and len(batches) > 1:
+            # Forked workers must not share the parent's database connection.
+            close_connections_before_fork()
+            with ProcessPoolExecutor(max_workers=options["workers"], mp_context=multiprocessing.get_context("fork")) as pool:
+                done = sum(pool.map(refresh_insight_snapshots, batches, [reference_date] * len(batches)))
+        else:
+            done = sum(refresh_insight_snapshots(batch, reference_date) for batch in batches)
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Shard {shard_index + 1}/{shard_count}: {done} insight snapshots for {reference_date} "
+            f"in {elapsed:.1f}s ({done / elapsed if elapsed else 0:.0f} users/s)."
+        ))
@@ -0,0 +1,32 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from finance.services.rollups import rebuild_rollups, verify_rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuild the monthly analytics rollup from raw transactions and verify it"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", help="Email of a single user to rebuild (default: all users)")
+        parser.add_argument("--verify-only", action="store_true", help="Only compare the rollup with raw transactions")
+
+    def handle(self, *args, **options):
+        user = None
+        if options["user"]:
+            user = get_user_model().objects.filter(email=options["user"]).first()
+            if user is None:
+                raise CommandError(f"User {options['user']} not found.")
+
+        if not options["verify_only"]:
+            written = rebuild_rollups(user)
+            self.stdout.write(f"Rebuilt {written} rollup rows.")
+
+        mismatches = verify_rollups(user)
+        for mismatch in mismatches:
+            self.stdout.write(self.style.WARNING(
+                f"user={mismatch['user_id']} month={mismatch['month']} type={mismatch['transaction_type']} "
+                f"category={mismatch['category_id']} expected={mismatch['expected']} actual={mismatch['actual']}"
+            ))
+        if mismatches:
+            raise CommandError(f"{len(mismatches)} rollup rows do not match raw transactions.")
+        self.stdout.write(self.style.SUCCESS("Rollup matches raw transactions."))
@@ -0,0 +1,35 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from django.core.management.base import BaseCommand
+from finance.db_router import close_connections_before_fork
+from finance.services.reports import claim_report_jobs, process_report_job
+
+
+class Command(BaseCommand):
+    help = "Render queued report jobs with a local process pool"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="Worker processes")
+        parser.add_argument("--poll-interval", type=float, default=2.0, help="Seconds to wait when the queue is empty")
+        parser.add_argument("--once", action="store_true", help="Exit once the queue is empty")
+
+    def handle(self, *args, **options):
+        workers = options["workers"]
+        context = multiprocessing.get_context("fork")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            while True:
+                job_ids = claim_report_jobs(workers)
+                # Forked workers must not share the parent's database connection.
+                close_connections_before_fork()
+                if not job_ids:
+                    if options["once"]:
+                        break
+                    time.sleep(options["poll_interval"])
+                    continue
+
+                started = time.perf_counter()
+                for job_id, status in zip(job_ids, pool.map(process_report_job, job_ids)):
+                    self.stdout.write(f"Report job {job_id}: {status}")
+                self.stdout.write(f"Rendered {len(job_ids)} jobs in {time.perf_counter() - started:.2f}s")
@@ -0,0 +1,51 @@
+import logging
+import time
+from contextlib import ExitStack
+from django.conf import settings
+from django.db import connections
+from .services.metrics import RequestMetrics, current_request, registry
+
+slow_request_logger = logging.getLogger("finance.slow_requests")
+
+
+class InstrumentationMiddleware:
+    """Record query count, DB time and total time per request.
+
+    Adds a ``Server-Timing`` header, feeds the Prometheus registry served at ``/metrics``
+    and logs requests slower than ``INSTRUMENTATION["SLOW_REQUEST_MS"]`` with their
+    worst SQL statements. Enabled through ``INSTRUMENTATION["ENABLED"]``.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        config = settings.INSTRUMENTATION
+        self.slow_request_seconds = config["SLOW_REQUEST_MS"] / 1000
+        self.worst_queries = config["SLOW_QUERY_COUNT"]
+
+    def __call__(self, request):
+        metrics = RequestMetrics(self.worst_queries)
+        token = current_request.set(metrics)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics))
+                response = self.get_response(request)
+        finally:
+            current_request.reset(token)
+        total = time.perf_counter() - metrics.started
+
+        view = request.resolver_match.view_name if request.resolver_match else "unmatched"
+        registry.inc("finance_http_requests_total", {"view": view, "method": request.method, "status": response.status_code})
+        registry.observe("finance_http_request_duration_seconds", {"view": view}, total)
+        registry.observe("finance_http_request_db_seconds", {"view": view}, metrics.db_time)
+        registry.observe("finance_http_request_queries", {"view": view}, metrics.queries)
+        response["Server-Timing"] = metrics.server_timing(total)
+
+        if total >= self.slow_request_seconds:
+            registry.inc("finance_http_slow_requests_total", {"view": view})
+            worst = "".join(f"\n  {elapsed * 1000:.1f}ms {sql[:500]}" for elapsed, sql in metrics.worst())
+            slow_request_logger.warning(
+                "Slow request %s %s: %.1fms total, %.1fms in %d queries%s",
+                request.method, request.get_full_path(), total * 1000, metrics.db_time * 1000, metrics.queries, worst,
+            )
+        return response
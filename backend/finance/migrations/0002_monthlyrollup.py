@@ -0,0 +1,55 @@
+import django.db.models.deletion
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+
+
+def backfill_rollups(apps, schema_editor):
+    Transaction = apps.get_model("finance", "Transaction")
+    MonthlyRollup = apps.get_model("finance", "MonthlyRollup")
+    rows = (
+        Transaction.objects.order_by()
+        .annotate(month=TruncMonth("date"))
+        .values("user_id", "month", "transaction_type", "category_id")
+        .annotate(total=Sum("amount"), rows=Count("id"))
+    )
+    MonthlyRollup.objects.bulk_create(
+        [
+            MonthlyRollup(
+                user_id=row["user_id"],
+                month=row["month"],
+                transaction_type=row["transaction_type"],
+                category_id=row["category_id"],
+                total=row["total"] or Decimal("0"),
+                count=row["rows"],
+            )
+            for row in rows
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("finance", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MonthlyRollup",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("month", models.DateField(help_text="First day of month")),
+                ("transaction_type", models.CharField(choices=[("income", "Income"), ("expense", "Expense"), ("saving", "Saving")], max_length=20)),
+                ("total", models.DecimalField(decimal_places=2, default=Decimal("0"), max_digits=14)),
+                ("count", models.IntegerField(default=0)),
+                ("category", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="monthly_rollups", to="finance.category")),
+                ("user", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="monthly_rollups", to=settings.AUTH_USER_MODEL)),
+            ],
+            options={"ordering": ["month"], "unique_together": {("user", "month", "transaction_type", "category")}},
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import DecimalField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_totals(apps, schema_editor):
+    SavingGoal = apps.get_model("finance", "SavingGoal")
+    SavingContribution = apps.get_model("finance", "SavingContribution")
+    totals = (
+        SavingContribution.objects.filter(goal=OuterRef("pk"))
+        .order_by()
+        .values("goal")
+        .annotate(total=Sum("amount"))
+        .values("total")
+    )
+    SavingGoal.objects.update(
+        contributions_total=Coalesce(Subquery(totals), Value(Decimal("0")), output_field=DecimalField(max_digits=14, decimal_places=2))
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("finance", "0005_reportjob"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="savinggoal",
+            name="contributions_total",
+            field=models.DecimalField(decimal_places=2, default=Decimal("0"), editable=False, help_text="Denormalised sum of contributions, kept in sync on contribution writes", max_digits=14),
+        ),
+        migrations.RunPython(backfill_totals, migrations.RunPython.noop),
+    ]
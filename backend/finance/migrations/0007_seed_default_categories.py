@@ -0,0 +1,34 @@
+from django.db import migrations
+
+DEFAULT_CATEGORIES = [
+    ("Food", "expense"),
+    ("Travel", "expense"),
+    ("Bills", "expense"),
+    ("Health", "expense"),
+    ("Shopping", "expense"),
+    ("Salary", "income"),
+    ("Investment", "income"),
+    ("Emergency Fund", "saving"),
+    ("Retirement", "saving"),
+]
+
+
+def seed_default_categories(apps, schema_editor):
+    Category = apps.get_model("finance", "Category")
+    for name, category_type in DEFAULT_CATEGORIES:
+        Category.objects.get_or_create(
+            user=None,
+            name=name,
+            category_type=category_type,
+            defaults={"is_default": True},
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("finance", "0006_savinggoal_contributions_total"),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_default_categories, migrations.RunPython.noop),
+    ]
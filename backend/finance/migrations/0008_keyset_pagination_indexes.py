@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("finance", "0007_seed_default_categories"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="transaction",
+            name="tx_user_date_created_idx",
+        ),
+        migrations.AddIndex(
+            model_name="savingcontribution",
+            index=models.Index(fields=["user", "-date", "-id"], name="contribution_user_date_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(fields=["user", "-date", "-created_at", "-id"], name="tx_user_date_created_idx"),
+        ),
+    ]
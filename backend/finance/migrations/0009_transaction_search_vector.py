@@ -0,0 +1,71 @@
+import django.contrib.postgres.search
+from django.db import migrations
+
+FORWARD_SQL = [
+    """
+    CREATE OR REPLACE FUNCTION finance_transaction_search_vector() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('simple', coalesce(NEW.note, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce((SELECT name FROM finance_category WHERE id = NEW.category_id), '')), 'B');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER finance_transaction_search_vector_trg
+    BEFORE INSERT OR UPDATE OF note, category_id ON finance_transaction
+    FOR EACH ROW EXECUTE FUNCTION finance_transaction_search_vector()
+    """,
+    """
+    CREATE OR REPLACE FUNCTION finance_category_search_vector() RETURNS trigger AS $$
+    BEGIN
+        IF NEW.name IS DISTINCT FROM OLD.name THEN
+            UPDATE finance_transaction SET note = note WHERE category_id = NEW.id;
+        END IF;
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER finance_category_search_vector_trg
+    AFTER UPDATE OF name ON finance_category
+    FOR EACH ROW EXECUTE FUNCTION finance_category_search_vector()
+    """,
+    "UPDATE finance_transaction SET note = note",
+    "CREATE INDEX tx_search_vector_gin ON finance_transaction USING gin (search_vector)",
+]
+
+REVERSE_SQL = [
+    "DROP INDEX IF EXISTS tx_search_vector_gin",
+    "DROP TRIGGER IF EXISTS finance_category_search_vector_trg ON finance_category",
+    "DROP FUNCTION IF EXISTS finance_category_search_vector()",
+    "DROP TRIGGER IF EXISTS finance_transaction_search_vector_trg ON finance_transaction",
+    "DROP FUNCTION IF EXISTS finance_transaction_search_vector()",
+]
+
+
+def run_postgres_sql(statements):
+    def run(apps, schema_editor):
+        # Other backends (SQLite in local development) use the icontains fallback in services/search.py.
+        if schema_editor.connection.vendor != "postgresql":
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("finance", "0008_keyset_pagination_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="transaction",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(run_postgres_sql(FORWARD_SQL), run_postgres_sql(REVERSE_SQL)),
+    ]
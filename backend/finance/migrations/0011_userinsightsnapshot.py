@@ -0,0 +1,24 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("finance", "0010_forecastsnapshot"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserInsightSnapshot",
+            fields=[
+                ("reference_date", models.DateField()),
+                ("data_version", models.PositiveBigIntegerField(default=0)),
+                ("payload", models.JSONField(default=dict)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("user", models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name="insight_snapshot", serialize=False, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={"abstract": False},
+        ),
+    ]
@@ -0,0 +1,61 @@
+import django.db.models.deletion
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Case, DecimalField, F, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+
+
+def backfill_spent(apps, schema_editor):
+    Budget = apps.get_model("finance", "Budget")
+    MonthlyRollup = apps.get_model("finance", "MonthlyRollup")
+    spent = (
+        MonthlyRollup.objects.filter(user=OuterRef("user"), month=OuterRef("month"), transaction_type="expense")
+        .order_by()
+        .values("user")
+        .annotate(total=Sum("total"))
+        .values("total")
+    )
+    Budget.objects.update(spent=Coalesce(Subquery(spent), Value(Decimal("0")), output_field=DecimalField(max_digits=14, decimal_places=2)))
+    Budget.objects.update(alert_level=Case(
+        When(spent__gte=F("amount"), then=Value(100)),
+        When(spent__gte=F("amount") * Decimal("0.8"), then=Value(80)),
+        default=Value(0),
+    ))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("finance", "0011_userinsightsnapshot"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="budget",
+            name="alert_level",
+            field=models.PositiveSmallIntegerField(default=0, editable=False, help_text="Highest alert threshold currently crossed"),
+        ),
+        migrations.AddField(
+            model_name="budget",
+            name="spent",
+            field=models.DecimalField(decimal_places=2, default=Decimal("0"), editable=False, help_text="Running sum of the month's expense transactions, kept in sync on transaction writes", max_digits=14),
+        ),
+        migrations.CreateModel(
+            name="BudgetAlert",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("threshold", models.PositiveSmallIntegerField()),
+                ("amount", models.DecimalField(decimal_places=2, max_digits=12)),
+                ("spent", models.DecimalField(decimal_places=2, max_digits=14)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("budget", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="alerts", to="finance.budget")),
+                ("user", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="budget_alerts", to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                "ordering": ["-created_at", "-id"],
+                "indexes": [models.Index(fields=["user", "-created_at", "-id"], name="budgetalert_user_created_idx")],
+            },
+        ),
+        migrations.RunPython(backfill_spent, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,64 @@
+import django.db.models.deletion
+import finance.models
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, DecimalField, F, Sum
+
+
+def backfill_category_stats(apps, schema_editor):
+    CategoryAmountStats = apps.get_model("finance", "CategoryAmountStats")
+    Transaction = apps.get_model("finance", "Transaction")
+    rows = (
+        Transaction.objects.filter(transaction_type="expense")
+        .order_by()
+        .values("user_id", "category_id")
+        .annotate(
+            total=Sum("amount"),
+            rows=Count("id"),
+            squares=Sum(F("amount") * F("amount"), output_field=DecimalField(max_digits=30, decimal_places=4)),
+        )
+    )
+    CategoryAmountStats.objects.bulk_create(
+        [
+            CategoryAmountStats(user_id=row["user_id"], category_id=row["category_id"], count=row["rows"], total=row["total"], sum_squares=row["squares"])
+            for row in rows.iterator()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("finance", "0012_budget_spent_and_alerts"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SpikeSettings",
+            fields=[
+                ("user", models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name="spike_settings", serialize=False, to=settings.AUTH_USER_MODEL)),
+                ("method", models.CharField(blank=True, choices=[("ratio", "Ratio to last month"), ("zscore", "Mean and standard deviation"), ("mad", "Median and MAD")], max_length=10)),
+                ("window_months", models.PositiveSmallIntegerField(blank=True, help_text="Months of history in the baseline", null=True)),
+                ("threshold", models.DecimalField(blank=True, decimal_places=2, help_text="Ratio, z-score or robust z-score that counts as a spike", max_digits=6, null=True)),
+                ("transaction_threshold", models.DecimalField(blank=True, decimal_places=2, help_text="Standard deviations above the category mean for a single transaction", max_digits=6, null=True)),
+            ],
+            bases=(finance.models.DataVersionMixin, models.Model),
+        ),
+        migrations.CreateModel(
+            name="CategoryAmountStats",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("count", models.IntegerField(default=0)),
+                ("total", models.DecimalField(decimal_places=2, default=Decimal("0"), max_digits=16)),
+                ("sum_squares", models.DecimalField(decimal_places=4, default=Decimal("0"), max_digits=30)),
+                ("category", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="amount_stats", to="finance.category")),
+                ("user", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="category_amount_stats", to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                "unique_together": {("user", "category")},
+            },
+        ),
+        migrations.RunPython(backfill_category_stats, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,12 @@
+from collections import defaultdict
 from decimal import Decimal
 from django.conf import settings
-from django.db import models
-from django.db.models import Sum
+from django.contrib.postgres.search import SearchVectorField
+from django.db import IntegrityError, models, router, transaction
+from django.db.models import Case, Count, DecimalField, F, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce, TruncMonth
+from django.utils import timezone
+from .db_router import pin_to_primary
 
 
 class Category(models.Model):
@@ -22,8 +27,203 @@ class Category(models.Model):
     def __str__(self):
         return f"{self.name} ({self.category_type})"
 
+    def affected_user_ids(self):
+        """Users whose analytics show this category: its owner, or everyone with rollups in a default category."""
+        if self.user_id is not None:
+            return [self.user_id]
+        if self.pk is None:
+            return []
+        return list(MonthlyRollup.objects.filter(category=self).order_by().values_list("user_id", flat=True).distinct())
 
-class Transaction(models.Model):
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            DataVersion.bump(self.affected_user_ids())
+        if self.user_id is None:
+            from .services.categories import invalidate_default_categories
+
+            invalidate_default_categories()
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            # Rollups cascade with the category, so collect their users first.
+            user_ids = self.affected_user_ids()
+            result = super().delete(*args, **kwargs)
+            DataVersion.bump(user_ids)
+        if self.user_id is None:
+            from .services.categories import invalidate_default_categories
+
+            invalidate_default_categories()
+        return result
+
+
+class DataVersion(models.Model):
+    """Per-user counter bumped on every write to the user's financial data."""
+
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True, related_name="data_version")
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user_id} v{self.version}"
+
+    @classmethod
+    def current(cls, user):
+        return cls.objects.filter(user=user).values_list("version", flat=True).first() or 0
+
+    @classmethod
+    def bump(cls, user_ids):
+        user_ids = {user_id for user_id in user_ids if user_id is not None}
+        if not user_ids:
+            return
+        pin_to_primary(user_ids)
+        now = timezone.now()
+        updated = cls.objects.filter(user_id__in=user_ids).update(version=F("version") + 1, updated_at=now)
+        if updated == len(user_ids):
+            return
+        existing = set(cls.objects.filter(user_id__in=user_ids).values_list("user_id", flat=True))
+        for user_id in user_ids - existing:
+            try:
+                with transaction.atomic():
+                    cls.objects.create(user_id=user_id, version=1)
+            except IntegrityError:
+                cls.objects.filter(user_id=user_id).update(version=F("version") + 1, updated_at=now)
+
+
+class UserOwnedQuerySet(models.QuerySet):
+    """Bumps DataVersion for the affected users on bulk writes."""
+
+    @property
+    def write_db(self):
+        """The database this queryset writes to.
+
+        ``self.db`` is the read database until Django's own write method runs, which
+        inside use_replica() is a replica; opening the write transaction here keeps the
+        reads that prepare a write (affected users, rollup deltas) on the primary.
+        """
+        return self._db or router.db_for_write(self.model, **self._hints)
+
+    def bulk_create(self, objs, *args, **kwargs):
+        with transaction.atomic(using=self.write_db):
+            created = super().bulk_create(objs, *args, **kwargs)
+            DataVersion.bump(obj.user_id for obj in created)
+        return created
+
+    def update(self, **kwargs):
+        with transaction.atomic(using=self.write_db):
+            user_ids = set(self.order_by().values_list("user_id", flat=True).distinct())
+            updated = super().update(**kwargs)
+            DataVersion.bump(user_ids)
+        return updated
+
+    update.alters_data = True
+
+    def update_untracked(self, **kwargs):
+        """Plain update for derived columns that do not change what the user sees as their data."""
+        return super().update(**kwargs)
+
+    update_untracked.alters_data = True
+
+    def delete(self):
+        with transaction.atomic(using=self.write_db):
+            user_ids = set(self.order_by().values_list("user_id", flat=True).distinct())
+            result = super().delete()
+            DataVersion.bump(user_ids)
+        return result
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
+
+class DataVersionMixin:
+    """Bumps DataVersion for the owning user on save() and delete()."""
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            DataVersion.bump([self.user_id])
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            DataVersion.bump([self.user_id])
+        return result
+
+
+def _rollup_key(user_id, tx_date, tx_type, category_id):
+    return (user_id, tx_date.replace(day=1), tx_type, category_id)
+
+
+def _new_deltas():
+    """``{rollup key: [amount, count, sum of squared amounts]}``."""
+    return defaultdict(lambda: [Decimal("0"), 0, Decimal("0")])
+
+
+class TransactionQuerySet(UserOwnedQuerySet):
+    """Keeps MonthlyRollup in step with bulk writes that bypass Transaction.save()."""
+
+    def _grouped_deltas(self, sign):
+        deltas = _new_deltas()
+        rows = (
+            self.order_by()
+            .annotate(month=TruncMonth("date"))
+            .values("user_id", "month", "transaction_type", "category_id")
+            .annotate(
+                total=Sum("amount"),
+                rows=Count("id"),
+                squares=Sum(F("amount") * F("amount"), output_field=DecimalField(max_digits=30, decimal_places=4)),
+            )
+        )
+        for row in rows:
+            key = (row["user_id"], row["month"], row["transaction_type"], row["category_id"])
+            deltas[key][0] += sign * (row["total"] or Decimal("0"))
+            deltas[key][1] += sign * row["rows"]
+            deltas[key][2] += sign * Decimal(row["squares"] or 0)
+        return deltas
+
+    def bulk_create(self, objs, *args, **kwargs):
+        with transaction.atomic(using=self.write_db):
+            created = super().bulk_create(objs, *args, **kwargs)
+            deltas = _new_deltas()
+            for tx in created:
+                key = _rollup_key(tx.user_id, tx.date, tx.transaction_type, tx.category_id)
+                deltas[key][0] += Decimal(tx.amount)
+                deltas[key][1] += 1
+                deltas[key][2] += Decimal(tx.amount) ** 2
+            MonthlyRollup.apply_deltas(deltas)
+        return created
+
+    def bulk_create_untracked(self, objs, *args, **kwargs):
+        """Plain bulk_create for bulk loaders; the caller must rebuild the rollup and bump DataVersion."""
+        return super(UserOwnedQuerySet, self).bulk_create(objs, *args, **kwargs)
+
+    def update(self, **kwargs):
+        with transaction.atomic(using=self.write_db):
+            pks = list(self.values_list("pk", flat=True))
+            deltas = self._grouped_deltas(-1)
+            updated = super().update(**kwargs)
+            after = self.model.objects.filter(pk__in=pks)._grouped_deltas(1)
+            for key, (amount, count, squares) in after.items():
+                deltas[key][0] += amount
+                deltas[key][1] += count
+                deltas[key][2] += squares
+            MonthlyRollup.apply_deltas(deltas)
+        return updated
+
+    update.alters_data = True
+
+    def delete(self):
+        with transaction.atomic(using=self.write_db):
+            deltas = self._grouped_deltas(-1)
+            result = super().delete()
+            MonthlyRollup.apply_deltas(deltas)
+        return result
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
+
+class Transaction(DataVersionMixin, models.Model):
     class TransactionType(models.TextChoices):
         INCOME = "income", "Income"
         EXPENSE = "expense", "Expense"
@@ -37,26 +237,239 @@ class Transaction(models.Model):
     note = models.CharField(max_length=255, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Maintained by a PostgreSQL trigger (note + category name) and GIN-indexed; see migration 0009.
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = TransactionQuerySet.as_manager()
 
     class Meta:
         ordering = ["-date", "-created_at"]
+        indexes = [
+            models.Index(fields=["user", "transaction_type", "date"], include=["amount", "category"], name="tx_user_type_date_idx"),
+            models.Index(fields=["user", "-date", "-created_at", "-id"], name="tx_user_date_created_idx"),
+            models.Index(fields=["user", "category", "transaction_type"], include=["amount"], name="tx_user_category_idx"),
+        ]
 
     def __str__(self):
         return f"{self.user.email}: {self.transaction_type} {self.amount}"
 
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            previous = None
+            if self.pk:
+                previous = (
+                    Transaction.objects.select_for_update()
+                    .filter(pk=self.pk)
+                    .values("user_id", "date", "transaction_type", "category_id", "amount")
+                    .first()
+                )
+            super().save(*args, **kwargs)
+
+            deltas = _new_deltas()
+            if previous:
+                key = _rollup_key(previous["user_id"], previous["date"], previous["transaction_type"], previous["category_id"])
+                deltas[key][0] -= previous["amount"]
+                deltas[key][1] -= 1
+                deltas[key][2] -= previous["amount"] ** 2
+            key = _rollup_key(self.user_id, self.date, self.transaction_type, self.category_id)
+            deltas[key][0] += Decimal(self.amount)
+            deltas[key][1] += 1
+            deltas[key][2] += Decimal(self.amount) ** 2
+            MonthlyRollup.apply_deltas(deltas)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            key = _rollup_key(self.user_id, self.date, self.transaction_type, self.category_id)
+            result = super().delete(*args, **kwargs)
+            MonthlyRollup.apply_deltas({key: [-Decimal(self.amount), -1, -Decimal(self.amount) ** 2]})
+        return result
+
+
+class MonthlyRollup(models.Model):
+    """Per-user, per-month, per-type, per-category sums of Transaction.amount."""
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="monthly_rollups")
+    month = models.DateField(help_text="First day of month")
+    transaction_type = models.CharField(max_length=20, choices=Transaction.TransactionType.choices)
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name="monthly_rollups")
+    total = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0"))
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ("user", "month", "transaction_type", "category")
+        ordering = ["month"]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.month:%Y-%m} {self.transaction_type} {self.total}"
+
+    @classmethod
+    def apply_deltas(cls, deltas):
+        """Apply ``{(user_id, month, type, category_id): [amount, count, squares]}`` deltas.
+
+        Updates the rollup rows, then the budget spent totals and category amount stats
+        that are derived from the same expense deltas.
+        """
+        # Only rows whose count went down can have emptied; the delete is limited to their keys.
+        emptied = Q()
+        for (user_id, month, tx_type, category_id), (amount, count, _) in deltas.items():
+            if not amount and not count:
+                continue
+            lookup = {"user_id": user_id, "month": month, "transaction_type": tx_type, "category_id": category_id}
+            if count < 0:
+                emptied |= Q(**lookup)
+            if cls.objects.filter(**lookup).update(total=F("total") + amount, count=F("count") + count):
+                continue
+            try:
+                with transaction.atomic():
+                    cls.objects.create(total=amount, count=count, **lookup)
+            except IntegrityError:
+                cls.objects.filter(**lookup).update(total=F("total") + amount, count=F("count") + count)
+
+        if emptied:
+            cls.objects.filter(emptied, count__lte=0).delete()
+
+        spent = defaultdict(Decimal)
+        stats = defaultdict(lambda: [Decimal("0"), 0, Decimal("0")])
+        for (user_id, month, tx_type, category_id), (amount, count, squares) in deltas.items():
+            if tx_type != Transaction.TransactionType.EXPENSE:
+                continue
+            if amount:
+                spent[(user_id, month)] += amount
+            for index, value in enumerate((amount, count, squares)):
+                stats[(user_id, category_id)][index] += value
+        if spent:
+            Budget.apply_spent_deltas(spent)
+        if stats:
+            CategoryAmountStats.apply_deltas(stats)
+
+
+class CategoryAmountStats(models.Model):
+    """Running count, sum and sum of squares of a user's expense amounts per category.
+
+    Kept in step with the same deltas as MonthlyRollup, so the mean and deviation of a
+    category's transaction amounts are available without scanning its history.
+    """
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="category_amount_stats")
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name="amount_stats")
+    count = models.IntegerField(default=0)
+    total = models.DecimalField(max_digits=16, decimal_places=2, default=Decimal("0"))
+    sum_squares = models.DecimalField(max_digits=30, decimal_places=4, default=Decimal("0"))
+
+    class Meta:
+        unique_together = ("user", "category")
+
+    def __str__(self):
+        return f"{self.user_id} category {self.category_id}: {self.count} expenses"
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else Decimal("0")
+
+    @property
+    def std(self):
+        """Population standard deviation of the amounts, from the running sums."""
+        if not self.count:
+            return Decimal("0")
+        variance = Decimal(self.sum_squares) / self.count - self.mean**2
+        return variance.sqrt() if variance > 0 else Decimal("0")
+
+    @classmethod
+    def apply_deltas(cls, deltas):
+        """Add ``{(user_id, category_id): [amount, count, squares]}`` deltas."""
+        emptied = Q()
+        for (user_id, category_id), (amount, count, squares) in deltas.items():
+            # Swapping amounts keeps count and total but changes the sum of squares.
+            if not count and not amount and not squares:
+                continue
+            lookup = {"user_id": user_id, "category_id": category_id}
+            if count < 0:
+                emptied |= Q(**lookup)
+            changes = {"total": F("total") + amount, "count": F("count") + count, "sum_squares": F("sum_squares") + squares}
+            if cls.objects.filter(**lookup).update(**changes):
+                continue
+            try:
+                with transaction.atomic():
+                    cls.objects.create(total=amount, count=count, sum_squares=squares, **lookup)
+            except IntegrityError:
+                cls.objects.filter(**lookup).update(**changes)
+
+        if emptied:
+            cls.objects.filter(emptied, count__lte=0).delete()
 
-class SavingGoal(models.Model):
+
+class SpikeSettings(DataVersionMixin, models.Model):
+    """Per-user overrides for spending spike detection; unset fields use settings.SPIKE_DETECTION."""
+
+    class Method(models.TextChoices):
+        RATIO = "ratio", "Ratio to last month"
+        ZSCORE = "zscore", "Mean and standard deviation"
+        MAD = "mad", "Median and MAD"
+
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True, related_name="spike_settings")
+    method = models.CharField(max_length=10, choices=Method.choices, blank=True)
+    window_months = models.PositiveSmallIntegerField(null=True, blank=True, help_text="Months of history in the baseline")
+    threshold = models.DecimalField(
+        max_digits=6, decimal_places=2, null=True, blank=True, help_text="Ratio, z-score or robust z-score that counts as a spike"
+    )
+    transaction_threshold = models.DecimalField(
+        max_digits=6, decimal_places=2, null=True, blank=True, help_text="Standard deviations above the category mean for a single transaction"
+    )
+
+    def __str__(self):
+        return f"{self.user_id} spike settings"
+
+
+class SavingGoalQuerySet(UserOwnedQuerySet):
+    def with_progress(self):
+        """Annotate the contribution sum so the progress properties need no extra queries."""
+        return self.annotate(
+            contributed_total=Coalesce(
+                Sum("contributions__amount"),
+                Value(Decimal("0")),
+                output_field=DecimalField(max_digits=14, decimal_places=2),
+            )
+        )
+
+
+class SavingGoal(DataVersionMixin, models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="saving_goals")
     name = models.CharField(max_length=150)
     target_amount = models.DecimalField(max_digits=12, decimal_places=2)
     deadline = models.DateField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    contributions_total = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=Decimal("0"),
+        editable=False,
+        help_text="Denormalised sum of contributions, kept in sync on contribution writes",
+    )
+
+    objects = SavingGoalQuerySet.as_manager()
 
     class Meta:
         ordering = ["deadline", "created_at"]
 
+    @classmethod
+    def refresh_contribution_totals(cls, goal_ids):
+        totals = (
+            SavingContribution.objects.filter(goal=OuterRef("pk"))
+            .order_by()
+            .values("goal")
+            .annotate(total=Sum("amount"))
+            .values("total")
+        )
+        cls.objects.filter(pk__in=set(goal_ids)).update_untracked(
+            contributions_total=Coalesce(Subquery(totals), Value(Decimal("0")), output_field=DecimalField(max_digits=14, decimal_places=2))
+        )
+
     @property
     def current_amount(self):
+        if hasattr(self, "contributed_total"):
+            return self.contributed_total or Decimal("0")
+        if getattr(settings, "SAVING_GOAL_DENORMALISED_TOTALS", False):
+            return self.contributions_total
         total = self.contributions.aggregate(total=Sum("amount"))["total"]
         return total or Decimal("0")
 
@@ -74,21 +487,122 @@ class SavingGoal(models.Model):
         return f"{self.name} - {self.user.email}"
 
 
-class SavingContribution(models.Model):
+class SavingContributionQuerySet(UserOwnedQuerySet):
+    """Keeps SavingGoal.contributions_total in step with bulk writes."""
+
+    def bulk_create(self, objs, *args, **kwargs):
+        with transaction.atomic(using=self.write_db):
+            created = super().bulk_create(objs, *args, **kwargs)
+            SavingGoal.refresh_contribution_totals(obj.goal_id for obj in created)
+        return created
+
+    def update(self, **kwargs):
+        with transaction.atomic(using=self.write_db):
+            goal_ids = set(self.order_by().values_list("goal_id", flat=True).distinct())
+            pks = list(self.values_list("pk", flat=True))
+            updated = super().update(**kwargs)
+            goal_ids |= set(self.model.objects.filter(pk__in=pks).values_list("goal_id", flat=True))
+            SavingGoal.refresh_contribution_totals(goal_ids)
+        return updated
+
+    update.alters_data = True
+
+    def delete(self):
+        with transaction.atomic(using=self.write_db):
+            goal_ids = set(self.order_by().values_list("goal_id", flat=True).distinct())
+            result = super().delete()
+            SavingGoal.refresh_contribution_totals(goal_ids)
+        return result
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
+
+class SavingContribution(DataVersionMixin, models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="saving_contributions")
     goal = models.ForeignKey(SavingGoal, on_delete=models.CASCADE, related_name="contributions")
     amount = models.DecimalField(max_digits=12, decimal_places=2)
     date = models.DateField()
     note = models.CharField(max_length=255, blank=True)
 
+    objects = SavingContributionQuerySet.as_manager()
+
     class Meta:
         ordering = ["-date", "-id"]
+        indexes = [models.Index(fields=["user", "-date", "-id"], name="contribution_user_date_idx")]
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            previous = None
+            if self.pk:
+                previous = SavingContribution.objects.filter(pk=self.pk).values("goal_id", "amount").first()
+            super().save(*args, **kwargs)
+            if previous:
+                SavingGoal.objects.filter(pk=previous["goal_id"]).update_untracked(contributions_total=F("contributions_total") - previous["amount"])
+            SavingGoal.objects.filter(pk=self.goal_id).update_untracked(contributions_total=F("contributions_total") + Decimal(self.amount))
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            SavingGoal.objects.filter(pk=self.goal_id).update_untracked(contributions_total=F("contributions_total") - Decimal(self.amount))
+        return result
+
+
+class BudgetQuerySet(UserOwnedQuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        with transaction.atomic(using=self.write_db):
+            created = super().bulk_create(objs, *args, **kwargs)
+            self.model.objects.filter(
+                user_id__in={obj.user_id for obj in objs}, month__in={obj.month for obj in objs}
+            ).refresh_spent()
+        return created
+
+    def update(self, **kwargs):
+        with transaction.atomic(using=self.write_db):
+            pks = list(self.values_list("pk", flat=True))
+            updated = super().update(**kwargs)
+            if {"amount", "month", "user", "user_id"} & set(kwargs):
+                self.model.objects.filter(pk__in=pks).refresh_spent()
+        return updated
+
+    update.alters_data = True
+
+    def refresh_spent(self):
+        """Recompute ``spent`` and ``alert_level`` from the rollup without recording alerts."""
+        spent = (
+            MonthlyRollup.objects.filter(user=OuterRef("user"), month=OuterRef("month"), transaction_type=Transaction.TransactionType.EXPENSE)
+            .order_by()
+            .values("user")
+            .annotate(total=Sum("total"))
+            .values("total")
+        )
+        self.update_untracked(spent=Coalesce(Subquery(spent), Value(Decimal("0")), output_field=DecimalField(max_digits=14, decimal_places=2)))
+        self.update_untracked(alert_level=Case(
+            *(When(spent__gte=F("amount") * Decimal(threshold) / 100, then=Value(threshold)) for threshold in reversed(Budget.ALERT_THRESHOLDS)),
+            default=Value(0),
+        ))
+
+    refresh_spent.queryset_only = True
 
 
-class Budget(models.Model):
+class Budget(DataVersionMixin, models.Model):
+    # Percent of the budget at which an alert is recorded, with the message used in insights.
+    ALERT_THRESHOLDS = (80, 100)
+    ALERT_MESSAGES = {80: "Budget at 80%", 100: "Budget exceeded"}
+
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="budgets")
     month = models.DateField(help_text="Use first day of month")
     amount = models.DecimalField(max_digits=12, decimal_places=2)
+    spent = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=Decimal("0"),
+        editable=False,
+        help_text="Running sum of the month's expense transactions, kept in sync on transaction writes",
+    )
+    alert_level = models.PositiveSmallIntegerField(default=0, editable=False, help_text="Highest alert threshold currently crossed")
+
+    objects = BudgetQuerySet.as_manager()
 
     class Meta:
         unique_together = ("user", "month")
@@ -96,3 +610,140 @@ class Budget(models.Model):
 
     def __str__(self):
         return f"{self.user.email} - {self.month:%Y-%m}"
+
+    def level_for(self, spent):
+        crossed = [threshold for threshold in self.ALERT_THRESHOLDS if self.amount > 0 and spent * 100 >= self.amount * threshold]
+        return crossed[-1] if crossed else 0
+
+    def record_alerts(self, previous_level):
+        """Record an event for every threshold crossed upwards since ``previous_level``."""
+        BudgetAlert.objects.bulk_create([
+            BudgetAlert(user_id=self.user_id, budget=self, threshold=threshold, amount=self.amount, spent=self.spent)
+            for threshold in self.ALERT_THRESHOLDS
+            if previous_level < threshold <= self.alert_level
+        ])
+
+    @classmethod
+    def apply_spent_deltas(cls, deltas):
+        """Add ``{(user_id, month): amount}`` expense deltas to ``spent`` and record any alerts crossed."""
+        for (user_id, month), amount in deltas.items():
+            budget = cls.objects.select_for_update().filter(user_id=user_id, month=month).first()
+            if budget is None:
+                continue
+            previous_level = budget.alert_level
+            budget.spent += amount
+            budget.alert_level = budget.level_for(budget.spent)
+            # The transaction write already bumped DataVersion, so skip save() and its bump.
+            cls.objects.filter(pk=budget.pk).update_untracked(spent=budget.spent, alert_level=budget.alert_level)
+            budget.record_alerts(previous_level)
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            previous = None
+            if self.pk:
+                previous = Budget.objects.select_for_update().filter(pk=self.pk).values("month", "alert_level").first()
+            previous_level = previous["alert_level"] if previous and previous["month"] == self.month else 0
+            self.spent = (
+                MonthlyRollup.objects.filter(user_id=self.user_id, month=self.month, transaction_type=Transaction.TransactionType.EXPENSE)
+                .aggregate(total=Sum("total"))["total"]
+                or Decimal("0")
+            )
+            self.alert_level = self.level_for(self.spent)
+            super().save(*args, **kwargs)
+            self.record_alerts(previous_level)
+
+
+class BudgetAlert(models.Model):
+    """A budget threshold crossing, recorded by the write that crossed it."""
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="budget_alerts")
+    budget = models.ForeignKey(Budget, on_delete=models.CASCADE, related_name="alerts")
+    threshold = models.PositiveSmallIntegerField()
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+    spent = models.DecimalField(max_digits=14, decimal_places=2)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at", "-id"]
+        indexes = [models.Index(fields=["user", "-created_at", "-id"], name="budgetalert_user_created_idx")]
+
+    def __str__(self):
+        return f"{self.user_id} {self.budget.month:%Y-%m} {self.threshold}%"
+
+    @property
+    def message(self):
+        return Budget.ALERT_MESSAGES[self.threshold]
+
+
+class ReportJob(models.Model):
+    class Format(models.TextChoices):
+        CSV = "csv", "CSV"
+        EXCEL = "excel", "Excel"
+        PDF = "pdf", "PDF"
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        RUNNING = "running", "Running"
+        DONE = "done", "Done"
+        FAILED = "failed", "Failed"
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="report_jobs")
+    format = models.CharField(max_length=10, choices=Format.choices)
+    filters = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    data_version = models.PositiveBigIntegerField(null=True, blank=True)
+    file = models.FileField(upload_to="reports/%Y/%m/", blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status", "created_at"], name="reportjob_queue_idx"),
+            models.Index(fields=["user", "format", "data_version"], name="reportjob_cache_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} {self.format} report ({self.status})"
+
+
+class SnapshotQuerySet(models.QuerySet):
+    def current(self, user, reference_date):
+        """The user's snapshot if it was built for ``reference_date`` from their current data, in one query."""
+        version = DataVersion.objects.filter(user=OuterRef("user")).values("version")
+        return (
+            self.filter(user=user, reference_date=reference_date)
+            .annotate(current_version=Coalesce(Subquery(version), Value(0)))
+            .filter(data_version=F("current_version"))
+            .first()
+        )
+
+
+class UserSnapshot(models.Model):
+    """Precomputed per-user payload, valid for one day and one data version."""
+
+    reference_date = models.DateField()
+    data_version = models.PositiveBigIntegerField(default=0)
+    payload = models.JSONField(default=dict)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = SnapshotQuerySet.as_manager()
+
+    class Meta:
+        abstract = True
+
+
+class ForecastSnapshot(UserSnapshot):
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True, related_name="forecast_snapshot")
+
+    def __str__(self):
+        return f"{self.user_id} forecast for {self.reference_date}"
+
+
+class UserInsightSnapshot(UserSnapshot):
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True, related_name="insight_snapshot")
+
+    def __str__(self):
+        return f"{self.user_id} insights for {self.reference_date}"
@@ -0,0 +1,152 @@
+import base64
+import json
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """Cursor pagination on a composite key, e.g. ``(date, created_at, id)``.
+
+    Each page is fetched with a row-value comparison against the last row of the
+    previous page, so its cost does not grow with depth the way OFFSET does. The
+    queryset's own ordering (from ``OrderingFilter``) is honoured, with the primary
+    key appended as a tie-breaker.
+    """
+
+    ordering = ("-id",)
+    page_size = 50
+    max_page_size = 500
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    count_query_param = "count"
+    count_header = "X-Total-Count"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.fields = self.get_ordering(queryset)
+        self.total = queryset.count() if self.include_count(request) else None
+
+        direction, values = self.decode_cursor(request, queryset.model)
+        if values is not None:
+            queryset = queryset.filter(self.keyset_filter(values, reverse=direction == "prev"))
+
+        ordering = self.fields if direction == "next" else [self.flip(field) for field in self.fields]
+        rows = list(queryset.order_by(*ordering)[: self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if direction == "prev":
+            rows.reverse()
+
+        self.next_values = self.row_values(rows[-1]) if rows and (has_more or direction == "prev") else None
+        self.prev_values = self.row_values(rows[0]) if rows and (values is not None and (direction == "next" or has_more)) else None
+        return rows
+
+    def get_paginated_response(self, data):
+        headers = {self.count_header: str(self.total)} if self.total is not None else None
+        return Response({
+            "next": self.build_link("next", self.next_values),
+            "previous": self.build_link("prev", self.prev_values),
+            "results": data,
+        }, headers=headers)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def include_count(self, request):
+        if not getattr(settings, "PAGINATION_TOTAL_COUNT", True):
+            return False
+        return request.query_params.get(self.count_query_param, "true").lower() not in ("0", "false", "no")
+
+    def get_ordering(self, queryset):
+        fields = [field for field in queryset.query.order_by if isinstance(field, str)] or list(self.ordering)
+        fields = ["-id" if field.lstrip("-") == "pk" and field.startswith("-") else field for field in fields]
+        fields = ["id" if field == "pk" else field for field in fields]
+        if not any(field.lstrip("-") == "id" for field in fields):
+            fields.append("-id" if fields[0].startswith("-") else "id")
+        return fields
+
+    @staticmethod
+    def flip(field):
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+    def keyset_filter(self, values, reverse=False):
+        """``(f1, f2, f3) after (v1, v2, v3)`` expanded into OR-ed prefix comparisons.
+
+        The redundant ``f1 <= v1`` bound lets the database start an index range scan
+        at the cursor instead of filtering the whole user's rows.
+        """
+        condition = Q()
+        equal = Q()
+        for field, value in zip(self.fields, values):
+            name = field.lstrip("-")
+            descending = field.startswith("-") != reverse
+            condition |= equal & Q(**{f"{name}__{'lt' if descending else 'gt'}": value})
+            equal &= Q(**{name: value})
+
+        first = self.fields[0]
+        descending = first.startswith("-") != reverse
+        return Q(**{f"{first.lstrip('-')}__{'lte' if descending else 'gte'}": values[0]}) & condition
+
+    def row_values(self, row):
+        return [getattr(row, field.lstrip("-")) for field in self.fields]
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return "next", None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+            direction, raw_values = payload["d"], payload["v"]
+            if direction not in ("next", "prev") or len(raw_values) != len(self.fields):
+                raise ValueError
+            values = [model._meta.get_field(field.lstrip("-")).to_python(value) for field, value in zip(self.fields, raw_values)]
+        except (TypeError, ValueError, KeyError, ValidationError):
+            raise NotFound("Invalid cursor.")
+        return direction, values
+
+    def build_link(self, direction, values):
+        if values is None:
+            return None
+        payload = json.dumps({"d": direction, "v": [value.isoformat() if hasattr(value, "isoformat") else str(value) for value in values]})
+        cursor = base64.urlsafe_b64encode(payload.encode()).decode()
+        url = self.request.build_absolute_uri()
+        # The total was already reported with the first page.
+        url = replace_query_param(url, self.count_query_param, "false")
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+
+class TransactionPagination(KeysetPagination):
+    ordering = ("-date", "-created_at", "-id")
+
+
+class SavingContributionPagination(KeysetPagination):
+    ordering = ("-date", "-id")
+
+
+class BudgetPagination(KeysetPagination):
+    ordering = ("-month", "-id")
+
+
+class BudgetAlertPagination(KeysetPagination):
+    ordering = ("-created_at", "-id")
@@ -1,6 +1,10 @@
 from decimal import Decimal
+from django.urls import reverse
 from rest_framework import serializers
-from .models import Category, Transaction, SavingGoal, SavingContribution, Budget
+from django.conf import settings
+from .models import Category, Transaction, SavingGoal, SavingContribution, Budget, BudgetAlert, ReportJob, SpikeSettings
+from .services.reports import normalise_filters
+from .services.spikes import resolve_config
 
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -9,6 +13,37 @@ class CategorySerializer(serializers.ModelSerializer):
         fields = ("id", "name", "category_type", "is_default")
 
 
+class TransactionListSerializer(serializers.ListSerializer):
+    """Builds list rows directly instead of running every child field per transaction.
+
+    Output matches TransactionSerializer; expects ``category`` to be select_related.
+    """
+
+    amount_field = serializers.DecimalField(max_digits=12, decimal_places=2)
+    date_field = serializers.DateField()
+    datetime_field = serializers.DateTimeField()
+
+    def to_representation(self, data):
+        amount = self.amount_field.to_representation
+        tx_date = self.date_field.to_representation
+        timestamp = self.datetime_field.to_representation
+        iterable = data.all() if hasattr(data, "all") else data
+        return [
+            {
+                "id": tx.id,
+                "amount": amount(tx.amount),
+                "transaction_type": tx.transaction_type,
+                "category": tx.category_id,
+                "category_name": tx.category.name,
+                "date": tx_date(tx.date),
+                "note": tx.note,
+                "created_at": timestamp(tx.created_at),
+                "updated_at": timestamp(tx.updated_at),
+            }
+            for tx in iterable
+        ]
+
+
 class TransactionSerializer(serializers.ModelSerializer):
     category_name = serializers.CharField(source="category.name", read_only=True)
 
@@ -16,13 +51,14 @@ class TransactionSerializer(serializers.ModelSerializer):
         model = Transaction
         fields = ("id", "amount", "transaction_type", "category", "category_name", "date", "note", "created_at", "updated_at")
         read_only_fields = ("created_at", "updated_at", "category_name")
+        list_serializer_class = TransactionListSerializer
 
     def validate(self, attrs):
         category = attrs.get("category")
         tx_type = attrs.get("transaction_type")
         request = self.context["request"]
 
-        if category.user and category.user != request.user:
+        if category.user_id and category.user_id != request.user.id:
             raise serializers.ValidationError("Category does not belong to this user.")
         if category.category_type != tx_type:
             raise serializers.ValidationError("Category type must match transaction type.")
@@ -69,9 +105,74 @@ class SavingContributionSerializer(serializers.ModelSerializer):
 class BudgetSerializer(serializers.ModelSerializer):
     class Meta:
         model = Budget
-        fields = ("id", "month", "amount")
+        fields = ("id", "month", "amount", "spent")
+        read_only_fields = ("spent",)
 
     def validate_amount(self, value):
         if value <= 0:
             raise serializers.ValidationError("Budget amount must be greater than zero.")
         return value
+
+
+class BudgetAlertSerializer(serializers.ModelSerializer):
+    month = serializers.DateField(source="budget.month", read_only=True)
+
+    class Meta:
+        model = BudgetAlert
+        fields = ("id", "month", "threshold", "message", "amount", "spent", "created_at")
+
+
+class SpikeSettingsSerializer(serializers.ModelSerializer):
+    effective = serializers.SerializerMethodField()
+
+    class Meta:
+        model = SpikeSettings
+        fields = ("method", "window_months", "threshold", "transaction_threshold", "effective")
+
+    def get_effective(self, obj):
+        return resolve_config({field: getattr(obj, field) for field in ("method", "window_months", "threshold", "transaction_threshold")})
+
+    def validate_window_months(self, value):
+        maximum = settings.SPIKE_DETECTION["MAX_WINDOW_MONTHS"]
+        if value is not None and not 1 <= value <= maximum:
+            raise serializers.ValidationError(f"Window must be between 1 and {maximum} months.")
+        return value
+
+    def validate_threshold(self, value):
+        if value is not None and value <= 0:
+            raise serializers.ValidationError("Threshold must be greater than zero.")
+        return value
+
+    def validate_transaction_threshold(self, value):
+        return self.validate_threshold(value)
+
+
+class AnomalySerializer(serializers.Serializer):
+    transaction_id = serializers.IntegerField()
+    date = serializers.DateField()
+    category = serializers.CharField()
+    amount = serializers.DecimalField(max_digits=12, decimal_places=2)
+    category_mean = serializers.DecimalField(max_digits=14, decimal_places=2)
+    category_std = serializers.DecimalField(max_digits=14, decimal_places=2)
+    score = serializers.DecimalField(max_digits=10, decimal_places=2)
+
+
+class ReportJobSerializer(serializers.ModelSerializer):
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ReportJob
+        fields = ("id", "format", "filters", "status", "error", "created_at", "started_at", "finished_at", "download_url")
+        read_only_fields = ("status", "error", "created_at", "started_at", "finished_at", "download_url")
+
+    def validate_filters(self, value):
+        if not isinstance(value, dict):
+            raise serializers.ValidationError("Filters must be an object.")
+        return normalise_filters(value)
+
+    def get_download_url(self, obj):
+        if obj.status != ReportJob.Status.DONE:
+            return None
+        request = self.context.get("request")
+        url = reverse("report-job-download", kwargs={"pk": obj.pk})
+        return request.build_absolute_uri(url) if request else url
@@ -1,10 +1,13 @@
 from collections import defaultdict
 from decimal import Decimal
-from datetime import date
+from datetime import date, timedelta
 from calendar import monthrange
 from django.db.models import Sum
 from django.db.models.functions import TruncMonth
-from ..models import Transaction, Budget, SavingContribution
+from ..models import Transaction, Budget, SavingContribution, MonthlyRollup
+from .cache import cached_analytics
+from .metrics import instrument_analytics
+from .spikes import anomaly_messages, load_spike_configs, monthly_spikes, previous_months, transaction_anomalies
 
 
 def first_day_of_month(value):
@@ -17,18 +20,48 @@ def month_range(value):
     return start, end
 
 
+def is_month_aligned(start_date=None, end_date=None):
+    if start_date and start_date != first_day_of_month(start_date):
+        return False
+    if end_date and end_date != month_range(end_date)[1]:
+        return False
+    return True
+
+
+@instrument_analytics
+def month_total(user, tx_type, reference_date):
+    return (
+        MonthlyRollup.objects.filter(user=user, transaction_type=tx_type, month=first_day_of_month(reference_date))
+        .aggregate(total=Sum("total"))
+        .get("total")
+        or Decimal("0")
+    )
+
+
+@instrument_analytics
 def get_totals(user, start_date=None, end_date=None):
-    qs = Transaction.objects.filter(user=user)
-    if start_date:
-        qs = qs.filter(date__gte=start_date)
-    if end_date:
-        qs = qs.filter(date__lte=end_date)
+    if is_month_aligned(start_date, end_date):
+        qs = MonthlyRollup.objects.filter(user=user)
+        if start_date:
+            qs = qs.filter(month__gte=start_date)
+        if end_date:
+            qs = qs.filter(month__lte=end_date)
+        totals = qs.values("transaction_type").annotate(total=Sum("total"))
+    else:
+        qs = Transaction.objects.filter(user=user)
+        if start_date:
+            qs = qs.filter(date__gte=start_date)
+        if end_date:
+            qs = qs.filter(date__lt=end_date + timedelta(days=1))
+        totals = qs.values("transaction_type").annotate(total=Sum("amount"))
 
-    totals = qs.values("transaction_type").annotate(total=Sum("amount"))
     bucket = {"income": Decimal("0"), "expense": Decimal("0"), "saving": Decimal("0")}
     for row in totals:
         bucket[row["transaction_type"]] = row["total"] or Decimal("0")
+    return totals_from_bucket(bucket)
 
+
+def totals_from_bucket(bucket):
     balance = bucket["income"] - bucket["expense"]
     net_savings = bucket["saving"] + (bucket["income"] - bucket["expense"])
     return {
@@ -40,6 +73,7 @@ def get_totals(user, start_date=None, end_date=None):
     }
 
 
+@instrument_analytics
 def get_monthly_overview(user, reference_date):
     start, end = month_range(reference_date)
     totals = get_totals(user, start, end)
@@ -47,41 +81,41 @@ def get_monthly_overview(user, reference_date):
     return totals
 
 
+@instrument_analytics
+@cached_analytics
 def get_category_totals(user, tx_type=None):
-    qs = Transaction.objects.filter(user=user)
+    qs = MonthlyRollup.objects.filter(user=user)
     if tx_type:
         qs = qs.filter(transaction_type=tx_type)
-    data = qs.values("category__name").annotate(total=Sum("amount")).order_by("-total")
+    data = qs.values("category__name").annotate(total=Sum("total")).order_by("-total")
     return [{"category": row["category__name"], "total": row["total"] or Decimal("0")} for row in data]
 
 
+@instrument_analytics
+@cached_analytics
 def get_trend_data(user, tx_type=None):
-    qs = Transaction.objects.filter(user=user)
+    qs = MonthlyRollup.objects.filter(user=user)
     if tx_type:
         qs = qs.filter(transaction_type=tx_type)
-    monthly = (
-        qs.annotate(month=TruncMonth("date"))
-        .values("month")
-        .annotate(total=Sum("amount"))
-        .order_by("month")
-    )
+    monthly = qs.values("month").annotate(total=Sum("total")).order_by("month")
     return [{"month": row["month"].strftime("%Y-%m"), "total": row["total"] or Decimal("0")} for row in monthly]
 
 
+@instrument_analytics
 def calculate_budget_status(user, reference_date):
     start = first_day_of_month(reference_date)
-    budget = Budget.objects.filter(user=user, month=start).first()
-    spent = (
-        Transaction.objects.filter(user=user, transaction_type="expense", date__year=start.year, date__month=start.month)
-        .aggregate(total=Sum("amount"))
-        .get("total")
-        or Decimal("0")
-    )
-    if not budget:
+    budget = Budget.objects.filter(user=user, month=start).values("amount", "spent").first()
+    if budget:
+        return budget_payload(budget["amount"], budget["spent"])
+    return budget_payload(None, month_total(user, "expense", start))
+
+
+def budget_payload(budget_amount, spent):
+    if budget_amount is None:
         return {"budget": None, "spent": spent, "remaining": None, "percent_used": Decimal("0"), "alert": None}
 
-    percent = (spent / budget.amount * Decimal("100")) if budget.amount > 0 else Decimal("0")
-    remaining = budget.amount - spent
+    percent = (spent / budget_amount * Decimal("100")) if budget_amount > 0 else Decimal("0")
+    remaining = budget_amount - spent
     alert = None
     if percent >= 100:
         alert = "Budget exceeded"
@@ -89,7 +123,7 @@ def calculate_budget_status(user, reference_date):
         alert = "Budget at 80%"
 
     return {
-        "budget": budget.amount,
+        "budget": budget_amount,
         "spent": spent,
         "remaining": remaining,
         "percent_used": percent.quantize(Decimal("0.01")),
@@ -97,47 +131,52 @@ def calculate_budget_status(user, reference_date):
     }
 
 
+@instrument_analytics
 def monthly_comparison(user, reference_date):
     current_start = first_day_of_month(reference_date)
     prev_month = (current_start.replace(day=1) - date.resolution).replace(day=1)
 
-    current_expense = (
-        Transaction.objects.filter(user=user, transaction_type="expense", date__year=current_start.year, date__month=current_start.month)
-        .aggregate(total=Sum("amount"))
-        .get("total")
-        or Decimal("0")
-    )
-    previous_expense = (
-        Transaction.objects.filter(user=user, transaction_type="expense", date__year=prev_month.year, date__month=prev_month.month)
-        .aggregate(total=Sum("amount"))
-        .get("total")
-        or Decimal("0")
-    )
+    current_expense = month_total(user, "expense", current_start)
+    previous_expense = month_total(user, "expense", prev_month)
+    return current_expense, previous_expense, change_percent(current_expense, previous_expense)
 
-    if previous_expense == 0:
-        change_pct = Decimal("0")
-    else:
-        change_pct = ((current_expense - previous_expense) / previous_expense * Decimal("100")).quantize(Decimal("0.01"))
-    return current_expense, previous_expense, change_pct
+
+def change_percent(current, previous):
+    if previous == 0:
+        return Decimal("0")
+    return ((current - previous) / previous * Decimal("100")).quantize(Decimal("0.01"))
 
 
+@instrument_analytics
 def get_saving_recommendation(user, reference_date):
-    monthly_income = (
-        Transaction.objects.filter(user=user, transaction_type="income", date__year=reference_date.year, date__month=reference_date.month)
-        .aggregate(total=Sum("amount"))
-        .get("total")
-        or Decimal("0")
-    )
+    return saving_recommendation(month_total(user, "income", reference_date))
+
+
+def saving_recommendation(monthly_income):
     target_rate = Decimal("0.20")
     return (monthly_income * target_rate).quantize(Decimal("0.01"))
 
 
+@instrument_analytics
+@cached_analytics
 def generate_insights(user, reference_date):
     totals = get_monthly_overview(user, reference_date)
     category_totals = get_category_totals(user, "expense")
     top_category = category_totals[0] if category_totals else None
     current_expense, previous_expense, change_pct = monthly_comparison(user, reference_date)
+    return compose_insights(
+        totals,
+        top_category,
+        current_expense,
+        previous_expense,
+        change_pct,
+        calculate_budget_status(user, reference_date),
+        detect_unusual_spikes(user, reference_date),
+        get_saving_recommendation(user, reference_date),
+    )
 
+
+def compose_insights(totals, top_category, current_expense, previous_expense, change_pct, budget_status, spikes, recommended_saving):
     income = totals["total_income"]
     expense = totals["total_expenses"]
     saving = totals["total_savings"]
@@ -157,11 +196,8 @@ def generate_insights(user, reference_date):
     elif income > 0:
         insights.append(f"You saved {saving_rate}% of income. Try targeting at least 20%.")
 
-    budget_status = calculate_budget_status(user, reference_date)
     if budget_status["alert"]:
         insights.append(budget_status["alert"])
-
-    spikes = detect_unusual_spikes(user, reference_date)
     insights.extend(spikes)
 
     return {
@@ -172,41 +208,34 @@ def generate_insights(user, reference_date):
         "saving_rate_percent": saving_rate,
         "income_expense_ratio": income_expense_ratio,
         "budget": budget_status,
-        "recommended_monthly_saving": get_saving_recommendation(user, reference_date),
+        "recommended_monthly_saving": recommended_saving,
         "insight_messages": insights,
     }
 
 
+@instrument_analytics
 def detect_unusual_spikes(user, reference_date):
-    current_month = Transaction.objects.filter(
-        user=user,
-        transaction_type="expense",
-        date__year=reference_date.year,
-        date__month=reference_date.month,
-    )
-    previous_month = Transaction.objects.filter(
-        user=user,
-        transaction_type="expense",
-        date__year=(reference_date.replace(day=1) - date.resolution).year,
-        date__month=(reference_date.replace(day=1) - date.resolution).month,
+    """Category spikes against the user's rolling baseline, then single outsized transactions."""
+    config = load_spike_configs([user.pk])[user.pk]
+    current_start = first_day_of_month(reference_date)
+    months = previous_months(current_start, config["window_months"])
+    history = defaultdict(dict)
+    rows = (
+        MonthlyRollup.objects.filter(user=user, transaction_type="expense", month__gte=months[0], month__lte=current_start)
+        .values_list("month", "category__name")
+        .annotate(total=Sum("total"))
+        .order_by()
     )
+    for month, category, total in rows:
+        history[month][category] = total or Decimal("0")
+    current = history.pop(current_start, {})
 
-    prev_map = defaultdict(lambda: Decimal("0"))
-    for row in previous_month.values("category__name").annotate(total=Sum("amount")):
-        prev_map[row["category__name"]] = row["total"] or Decimal("0")
-
-    messages = []
-    for row in current_month.values("category__name").annotate(total=Sum("amount")):
-        cat = row["category__name"]
-        curr = row["total"] or Decimal("0")
-        prev = prev_map[cat]
-        if prev > 0 and curr > prev * Decimal("1.3"):
-            increase = ((curr - prev) / prev * Decimal("100")).quantize(Decimal("0.01"))
-            messages.append(f"Spending spike detected: {cat} is up by {increase}%.")
-
-    return messages
+    anomalies = transaction_anomalies([user.pk], current_start, {user.pk: config})[user.pk]
+    return monthly_spikes(current, history, months, config) + anomaly_messages(anomalies)
 
 
+@instrument_analytics
+@cached_analytics
 def goal_trends(user):
     monthly = (
         SavingContribution.objects.filter(user=user)
@@ -0,0 +1,141 @@
+import copy
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import wraps
+from django.conf import settings
+from django.core.cache import caches
+from ..models import DataVersion
+
+MISSING = object()
+
+
+class LocMemLRUBackend:
+    """Process-local cache that evicts the least recently used entry once ``max_entries`` is reached."""
+
+    def __init__(self, max_entries=2048, **kwargs):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._data:
+                return MISSING
+            self._data.move_to_end(key)
+            value = self._data[key]
+        return copy.deepcopy(value)
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = copy.deepcopy(value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class DjangoCacheBackend:
+    """Delegates to one of the caches configured in ``CACHES``."""
+
+    def __init__(self, cache_alias="default", timeout=300, **kwargs):
+        self.cache = caches[cache_alias]
+        self.timeout = timeout
+
+    def get(self, key):
+        return self.cache.get(key, MISSING)
+
+    def set(self, key, value):
+        self.cache.set(key, value, self.timeout)
+
+    def clear(self):
+        self.cache.clear()
+
+
+BACKENDS = {
+    "locmem": LocMemLRUBackend,
+    "django": DjangoCacheBackend,
+}
+
+_backend = None
+_stats = {"hits": 0, "misses": 0}
+_stats_lock = threading.Lock()
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        config = getattr(settings, "ANALYTICS_CACHE", {})
+        backend_class = BACKENDS[config.get("BACKEND", "locmem")]
+        _backend = backend_class(
+            max_entries=config.get("MAX_ENTRIES", 2048),
+            cache_alias=config.get("CACHE_ALIAS", "default"),
+            timeout=config.get("TIMEOUT", 300),
+        )
+    return _backend
+
+
+def reset_cache():
+    global _backend
+    if _backend is not None:
+        _backend.clear()
+    _backend = None
+    with _stats_lock:
+        _stats.update(hits=0, misses=0)
+
+
+def cache_stats():
+    """Hits and misses in this process; ``entries`` is ``None`` for backends that cannot count them."""
+    backend = get_backend()
+    with _stats_lock:
+        hits, misses = _stats["hits"], _stats["misses"]
+    lookups = hits + misses
+    return {
+        "backend": type(backend).__name__,
+        "entries": len(backend) if hasattr(backend, "__len__") else None,
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+    }
+
+
+def _record(name):
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def cache_key(user, func_name, args, kwargs, version=None):
+    arguments = hashlib.md5(repr((args, sorted(kwargs.items()))).encode()).hexdigest()
+    if version is None:
+        version = DataVersion.current(user)
+    return f"analytics:{user.pk}:{version}:{func_name}:{arguments}"
+
+
+def cached_analytics(func):
+    """Cache ``func(user, ...)`` per user, arguments and data version.
+
+    Writes bump the user's DataVersion, so stale entries are never read again and
+    simply age out of the backend. Callers that have already read the version (for an
+    ETag, say) pass it as ``data_version`` to skip the lookup.
+    """
+
+    @wraps(func)
+    def wrapper(user, *args, data_version=None, **kwargs):
+        backend = get_backend()
+        key = cache_key(user, func.__qualname__, args, kwargs, data_version)
+        value = backend.get(key)
+        if value is not MISSING:
+            _record("hits")
+            return value
+        _record("misses")
+        value = func(user, *args, **kwargs)
+        backend.set(key, value)
+        return value
+
+    return wrapper
@@ -0,0 +1,24 @@
+import threading
+import time
+from ..models import Category
+
+# Other worker processes only see a change once their copy expires.
+DEFAULT_CATEGORY_TTL = 300
+
+_cache = {"categories": None, "loaded_at": 0.0}
+_lock = threading.Lock()
+
+
+def default_categories():
+    """Global default categories (``user=None``), cached in-process."""
+    with _lock:
+        categories = _cache["categories"]
+        if categories is None or time.monotonic() - _cache["loaded_at"] > DEFAULT_CATEGORY_TTL:
+            categories = list(Category.objects.filter(user__isnull=True))
+            _cache.update(categories=categories, loaded_at=time.monotonic())
+        return list(categories)
+
+
+def invalidate_default_categories():
+    with _lock:
+        _cache.update(categories=None, loaded_at=0.0)
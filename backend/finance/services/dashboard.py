@@ -0,0 +1,183 @@
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from functools import cached_property, partial
+from django.db.models import Sum
+from django.db.models.functions import TruncMonth
+from ..models import Budget, MonthlyRollup, SavingContribution
+from .analytics import (
+    budget_payload,
+    change_percent,
+    compose_insights,
+    first_day_of_month,
+    saving_recommendation,
+    totals_from_bucket,
+)
+from .cache import cached_analytics
+from .fanout import gather_queries
+from .metrics import instrument_analytics
+from .spikes import anomaly_messages, load_spike_configs, monthly_spikes, previous_months, transaction_anomalies
+
+
+class DashboardAggregate:
+    """Every dashboard widget derived from one grouped rollup query.
+
+    The rollup rows are fetched once as ``(month, transaction_type, category)`` sums;
+    contribution, budget and spike detection lookups are only issued when a widget needs them.
+    """
+
+    def __init__(self, user, reference_date):
+        self.user = user
+        self.reference_date = reference_date
+        self.current_month = first_day_of_month(reference_date)
+        self.previous_month = (self.current_month - date.resolution).replace(day=1)
+
+    @cached_property
+    def rows(self):
+        return [
+            (row["month"], row["transaction_type"], row["category__name"], row["total"] or Decimal("0"))
+            for row in MonthlyRollup.objects.filter(user=self.user)
+            .values("month", "transaction_type", "category__name")
+            .annotate(total=Sum("total"))
+            .order_by()
+        ]
+
+    @cached_property
+    def contribution_rows(self):
+        return list(
+            SavingContribution.objects.filter(user=self.user)
+            .annotate(month=TruncMonth("date"))
+            .values("month")
+            .annotate(total=Sum("amount"))
+            .order_by("month")
+        )
+
+    @cached_property
+    def budget_amount(self):
+        return Budget.objects.filter(user=self.user, month=self.current_month).values_list("amount", flat=True).first()
+
+    @cached_property
+    def spike_config(self):
+        return load_spike_configs([self.user.pk])[self.user.pk]
+
+    @cached_property
+    def anomalies(self):
+        return transaction_anomalies([self.user.pk], self.current_month, {self.user.pk: self.spike_config})[self.user.pk]
+
+    async def aload(self, *attributes):
+        """Fetch the named query properties concurrently so async views can then read them without blocking."""
+        await gather_queries(*(partial(getattr, self, name) for name in attributes))
+
+    def _select(self, tx_type=None, month=None):
+        for row_month, row_type, category, total in self.rows:
+            if tx_type and row_type != tx_type:
+                continue
+            if month and row_month != month:
+                continue
+            yield row_month, row_type, category, total
+
+    def totals(self, month=None):
+        bucket = {"income": Decimal("0"), "expense": Decimal("0"), "saving": Decimal("0")}
+        for _, tx_type, _, total in self._select(month=month):
+            bucket[tx_type] += total
+        return totals_from_bucket(bucket)
+
+    def monthly_overview(self):
+        totals = self.totals(self.current_month)
+        totals["month"] = self.current_month.strftime("%Y-%m")
+        return totals
+
+    def category_map(self, tx_type=None, month=None):
+        totals = defaultdict(lambda: Decimal("0"))
+        for _, _, category, total in self._select(tx_type, month):
+            totals[category] += total
+        return totals
+
+    def category_totals(self, tx_type=None):
+        totals = self.category_map(tx_type)
+        ordered = sorted(totals.items(), key=lambda item: item[1], reverse=True)
+        return [{"category": category, "total": total} for category, total in ordered]
+
+    def trend(self, tx_type=None):
+        totals = defaultdict(lambda: Decimal("0"))
+        for month, _, _, total in self._select(tx_type):
+            totals[month] += total
+        return [{"month": month.strftime("%Y-%m"), "total": totals[month]} for month in sorted(totals)]
+
+    def goal_trends(self):
+        return [{"month": row["month"].strftime("%Y-%m"), "total": row["total"] or Decimal("0")} for row in self.contribution_rows]
+
+    def month_total(self, tx_type, month):
+        return sum((total for _, _, _, total in self._select(tx_type, month)), Decimal("0"))
+
+    def budget_status(self):
+        return budget_payload(self.budget_amount, self.month_total("expense", self.current_month))
+
+    def spikes(self):
+        months = previous_months(self.current_month, self.spike_config["window_months"])
+        history = defaultdict(lambda: defaultdict(Decimal))
+        for month, _, category, total in self._select("expense"):
+            if month and months[0] <= month <= self.current_month:
+                history[month][category] += total
+        current = history.pop(self.current_month, {})
+        return monthly_spikes(current, history, months, self.spike_config) + anomaly_messages(self.anomalies)
+
+    @instrument_analytics
+    def summary(self):
+        return {
+            "summary": self.totals(),
+            "monthly_overview": self.monthly_overview(),
+            "category_totals": {
+                "income": self.category_totals("income"),
+                "expense": self.category_totals("expense"),
+                "saving": self.category_totals("saving"),
+            },
+        }
+
+    @instrument_analytics
+    def insights(self):
+        expense_totals = self.category_totals("expense")
+        current_expense = self.month_total("expense", self.current_month)
+        previous_expense = self.month_total("expense", self.previous_month)
+        return compose_insights(
+            self.monthly_overview(),
+            expense_totals[0] if expense_totals else None,
+            current_expense,
+            previous_expense,
+            change_percent(current_expense, previous_expense),
+            self.budget_status(),
+            self.spikes(),
+            saving_recommendation(self.month_total("income", self.current_month)),
+        )
+
+    @instrument_analytics
+    def charts(self):
+        expense_trend = self.trend("expense")
+        return {
+            "expense_trend": expense_trend,
+            "saving_trend": self.trend("saving"),
+            "income_vs_expense": {
+                "income": self.trend("income"),
+                "expense": expense_trend,
+            },
+            "category_distribution": self.category_totals(),
+            "saving_growth": self.goal_trends(),
+        }
+
+
+@instrument_analytics
+@cached_analytics
+def dashboard_section(user, reference_date, section):
+    """One dashboard widget payload (``summary``, ``insights`` or ``charts``), cached per data version."""
+    return getattr(DashboardAggregate(user, reference_date), section)()
+
+
+@instrument_analytics
+@cached_analytics
+def build_dashboard(user, reference_date):
+    aggregate = DashboardAggregate(user, reference_date)
+    return {
+        "summary": aggregate.summary(),
+        "insights": aggregate.insights(),
+        "charts": aggregate.charts(),
+    }
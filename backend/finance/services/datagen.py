@@ -0,0 +1,160 @@
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from ..models import Budget, Category, SavingContribution, SavingGoal, Transaction
+from .rollups import rebuild_rollups
+
+# name: (category_type, relative frequency, median amount, spread)
+CATEGORY_PROFILES = {
+    "Food": ("expense", 30, 25, 0.6),
+    "Travel": ("expense", 10, 60, 0.8),
+    "Bills": ("expense", 6, 120, 0.4),
+    "Health": ("expense", 3, 80, 0.9),
+    "Shopping": ("expense", 12, 70, 1.0),
+    "Salary": ("income", 2, 4000, 0.15),
+    "Investment": ("income", 1, 300, 1.0),
+    "Emergency Fund": ("saving", 2, 250, 0.5),
+    "Retirement": ("saving", 1, 400, 0.3),
+}
+NOTES = {
+    "Food": ["Groceries", "Lunch", "Dinner out", "Coffee"],
+    "Travel": ["Fuel", "Train ticket", "Taxi", "Flight"],
+    "Bills": ["Electricity", "Internet", "Phone", "Water"],
+    "Health": ["Pharmacy", "Doctor visit", "Gym"],
+    "Shopping": ["Online order", "Clothes", "Electronics"],
+    "Salary": ["Monthly salary"],
+    "Investment": ["Dividends", "Interest"],
+    "Emergency Fund": ["Savings transfer"],
+    "Retirement": ["Pension contribution"],
+}
+
+# (category, month): multiplier applied to amounts, e.g. holiday shopping and summer travel.
+SEASONAL_UPLIFT = {
+    ("Shopping", 11): 1.3,
+    ("Shopping", 12): 1.6,
+    ("Travel", 7): 1.5,
+    ("Travel", 8): 1.4,
+    ("Bills", 1): 1.2,
+    ("Bills", 2): 1.15,
+}
+GOAL_NAMES = ["Laptop", "Vacation", "Car", "Wedding", "House Deposit", "Emergency Cushion"]
+
+
+def ensure_categories(user):
+    existing = {category.name: category for category in Category.objects.filter(user=user)}
+    missing = [
+        Category(user=user, name=name, category_type=profile[0], is_default=False)
+        for name, profile in CATEGORY_PROFILES.items()
+        if name not in existing
+    ]
+    Category.objects.bulk_create(missing)
+    if missing:
+        existing = {category.name: category for category in Category.objects.filter(user=user)}
+    return existing
+
+
+def iter_transactions(user, categories, count, rng, start=None, end=None):
+    end = end or date.today()
+    start = start or end - timedelta(days=3 * 365)
+    span = (end - start).days
+    names = list(CATEGORY_PROFILES)
+    weights = [CATEGORY_PROFILES[name][1] for name in names]
+    for name in rng.choices(names, weights=weights, k=count):
+        tx_type, _, median, spread = CATEGORY_PROFILES[name]
+        tx_date = start + timedelta(days=rng.randint(0, span))
+        seasonal = SEASONAL_UPLIFT.get((name, tx_date.month), 1.0)
+        amount = Decimal(str(round(max(rng.lognormvariate(0, spread) * median * seasonal, 1), 2)))
+        yield Transaction(
+            user=user,
+            amount=amount,
+            transaction_type=tx_type,
+            category=categories[name],
+            date=tx_date,
+            note=rng.choice(NOTES[name]),
+        )
+
+
+def insert_transactions(user, count, rng, batch_size=5000, start=None, end=None):
+    """Insert ``count`` synthetic transactions in batches, then rebuild the user's rollup once (which bumps DataVersion)."""
+    categories = ensure_categories(user)
+    batch = []
+    written = 0
+    for tx in iter_transactions(user, categories, count, rng, start, end):
+        batch.append(tx)
+        if len(batch) >= batch_size:
+            Transaction.objects.bulk_create_untracked(batch)
+            written += len(batch)
+            batch = []
+    if batch:
+        Transaction.objects.bulk_create_untracked(batch)
+        written += len(batch)
+    rebuild_rollups(user)
+    return written
+
+
+def seed_transactions(user, count, seed=42, batch_size=5000, start=None, end=None):
+    """Bulk-insert ``count`` synthetic transactions for ``user``. Returns the number of rows written."""
+    return insert_transactions(user, count, random.Random(seed), batch_size, start, end)
+
+
+def insert_goals_and_budgets(user, rng, start, end):
+    """A few saving goals with monthly contributions, and a budget for every month in range."""
+    goals = SavingGoal.objects.bulk_create([
+        SavingGoal(
+            user=user,
+            name=name,
+            target_amount=Decimal(rng.randrange(1000, 20000, 500)),
+            deadline=end + timedelta(days=rng.randint(90, 720)),
+        )
+        for name in rng.sample(GOAL_NAMES, rng.randint(1, 3))
+    ])
+
+    months = []
+    month = start.replace(day=1)
+    while month <= end:
+        months.append(month)
+        month = (month + timedelta(days=32)).replace(day=1)
+
+    contributions = [
+        SavingContribution(
+            user=user,
+            goal=goal,
+            amount=Decimal(rng.randrange(50, 800, 10)),
+            date=min(month + timedelta(days=rng.randint(0, 27)), end),
+            note="Monthly contribution",
+        )
+        for goal in goals
+        for month in months
+        if rng.random() < 0.7
+    ]
+    SavingContribution.objects.bulk_create(contributions)
+
+    budgets = [Budget(user=user, month=month, amount=Decimal(rng.randrange(1200, 3000, 50))) for month in months]
+    Budget.objects.bulk_create(budgets)
+    return len(goals) + len(contributions) + len(budgets)
+
+
+def generate_users(first_index, count, transactions_per_user, seed=42, years=3, batch_size=5000, prefix="loadgen", password_hash=None, end=None):
+    """Create ``count`` users starting at ``first_index`` with a full synthetic history each.
+
+    Every user's data comes from a generator seeded with ``seed`` and the user's index, and
+    the history ends on ``end``, so output is identical however users are split across
+    worker processes. Pass ``end`` to reproduce a dataset on another day; it defaults to today.
+    """
+    User = get_user_model()
+    password_hash = password_hash or make_password(None)
+    end = end or date.today()
+    start = end - timedelta(days=365 * years)
+    users = User.objects.bulk_create([
+        User(email=f"{prefix}{index}@example.com", username=f"{prefix}{index}", password=password_hash)
+        for index in range(first_index, first_index + count)
+    ])
+
+    transactions = other = 0
+    for index, user in enumerate(users, start=first_index):
+        rng = random.Random(f"{seed}:{index}")
+        transactions += insert_transactions(user, transactions_per_user, rng, batch_size, start, end)
+        other += insert_goals_and_budgets(user, rng, start, end)
+    return transactions, other
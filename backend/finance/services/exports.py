@@ -0,0 +1,64 @@
+import csv
+import tempfile
+from io import StringIO
+from openpyxl import Workbook
+
+EXPORT_HEADER = ["Amount", "Type", "Category", "Date", "Note"]
+EXPORT_FIELDS = ("amount", "transaction_type", "category__name", "date", "note")
+EXCEL_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+# Excel's hard limit is 1,048,576 rows per sheet, one of which holds the header.
+EXCEL_ROWS_PER_SHEET = 1048575
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+
+def export_rows(queryset, chunk_size=2000):
+    """Stream ``EXPORT_FIELDS`` tuples from ``queryset`` without building model instances."""
+    return queryset.values_list(*EXPORT_FIELDS).iterator(chunk_size=chunk_size)
+
+
+def iter_csv(rows, rows_per_chunk=500):
+    """Yield the CSV export as text chunks of ``rows_per_chunk`` lines each."""
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_HEADER)
+    pending = 0
+    for row in rows:
+        writer.writerow(row)
+        pending += 1
+        if pending >= rows_per_chunk:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+            pending = 0
+    yield buffer.getvalue()
+
+
+def write_excel(rows, fileobj, rows_per_sheet=EXCEL_ROWS_PER_SHEET):
+    """Write the export to ``fileobj`` with a write-only workbook, starting a new sheet every ``rows_per_sheet`` rows."""
+    workbook = Workbook(write_only=True)
+    sheet = None
+    sheet_rows = 0
+    for amount, tx_type, category, tx_date, note in rows:
+        if sheet is None or sheet_rows >= rows_per_sheet:
+            sheet = _new_sheet(workbook)
+            sheet_rows = 0
+        sheet.append([float(amount), tx_type, category, tx_date.isoformat(), note])
+        sheet_rows += 1
+    if sheet is None:
+        _new_sheet(workbook)
+    workbook.save(fileobj)
+
+
+def _new_sheet(workbook):
+    index = len(workbook.worksheets)
+    sheet = workbook.create_sheet(title="Transactions" if index == 0 else f"Transactions {index + 1}")
+    sheet.append(EXPORT_HEADER)
+    return sheet
+
+
+def excel_file(rows, rows_per_sheet=EXCEL_ROWS_PER_SHEET):
+    """Render the export into a spooled temporary file positioned at the start."""
+    output = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    write_excel(rows, output, rows_per_sheet)
+    output.seek(0)
+    return output
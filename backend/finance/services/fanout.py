@@ -0,0 +1,49 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections, connection
+from .metrics import current_request
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=settings.ANALYTICS_FANOUT_WORKERS, thread_name_prefix="analytics-fanout")
+        return _executor
+
+
+def run_query(func):
+    """Run ``func`` on a fan-out worker as if it were its own request.
+
+    Each worker thread has its own database connection; closing obsolete ones before
+    and after keeps CONN_MAX_AGE and health checks working as they do for requests.
+    """
+    close_old_connections()
+    try:
+        metrics = current_request.get()
+        if metrics is None:
+            return func()
+        with connection.execute_wrapper(metrics):
+            return func()
+    finally:
+        close_old_connections()
+
+
+async def gather_queries(*funcs):
+    """Run independent ORM callables concurrently and return their results in order.
+
+    Django's async ORM (``aaggregate``, ``async for``) sends every query through the
+    request's single sync thread, so ``asyncio.gather`` over it still runs them one
+    after another. Here each callable gets a worker thread and connection, bounded by
+    ``ANALYTICS_FANOUT_WORKERS``; with 0 workers the calls run serially on that thread.
+    """
+    if settings.ANALYTICS_FANOUT_WORKERS <= 0 or len(funcs) < 2:
+        return [await sync_to_async(func)() for func in funcs]
+    run = sync_to_async(run_query, thread_sensitive=False, executor=get_executor())
+    return await asyncio.gather(*(run(func) for func in funcs))
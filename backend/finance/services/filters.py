@@ -0,0 +1,29 @@
+import django_filters
+from django_filters.utils import translate_validation
+from ..models import Transaction
+
+
+class TransactionFilterSet(django_filters.FilterSet):
+    """The transaction list query parameters, shared by the list, search, exports and report jobs."""
+
+    start_date = django_filters.DateFilter(field_name="date", lookup_expr="gte")
+    end_date = django_filters.DateFilter(field_name="date", lookup_expr="lte")
+    amount_min = django_filters.NumberFilter(field_name="amount", lookup_expr="gte")
+    amount_max = django_filters.NumberFilter(field_name="amount", lookup_expr="lte")
+
+    class Meta:
+        model = Transaction
+        fields = ["transaction_type", "category", "date"]
+
+
+def transaction_filterset(params, queryset):
+    """A bound, validated TransactionFilterSet; raises a DRF ValidationError (400) for bad input."""
+    filterset = TransactionFilterSet(params, queryset=queryset)
+    if not filterset.is_valid():
+        raise translate_validation(filterset.errors)
+    return filterset
+
+
+def filter_transactions(queryset, params):
+    """Apply the transaction list query parameters to ``queryset`` outside the viewset's filter backend."""
+    return transaction_filterset(params, queryset).qs
@@ -0,0 +1,223 @@
+from calendar import monthrange
+from datetime import date
+import numpy as np
+from django.db.models import Sum
+from ..models import Budget, DataVersion, ForecastSnapshot, MonthlyRollup, SavingContribution, SavingGoal
+from .analytics import first_day_of_month
+from .metrics import instrument_analytics
+
+TYPES = ("income", "expense", "saving")
+HISTORY_MONTHS = 24
+TREND_MONTHS = 12
+MOVING_AVERAGE_WINDOW = 3
+HORIZON_MONTHS = 3
+GOAL_RATE_MONTHS = 6
+
+
+def add_months(month, count):
+    years, index = divmod(month.month - 1 + count, 12)
+    return date(month.year + years, index + 1, 1)
+
+
+class MonthlySeries:
+    """Per-type monthly totals for many users as one ``(type, user, month)`` float array."""
+
+    def __init__(self, user_ids, months, values):
+        self.user_ids = list(user_ids)
+        self.months = months
+        self.values = values
+
+
+def load_monthly_series(user_ids, end_month, months=HISTORY_MONTHS):
+    """One grouped rollup query for ``months`` months up to and including ``end_month``."""
+    user_ids = list(user_ids)
+    start = add_months(end_month, -(months - 1))
+    month_list = [add_months(start, offset) for offset in range(months)]
+    user_index = {user_id: index for index, user_id in enumerate(user_ids)}
+    start_ordinal = start.year * 12 + start.month
+
+    rows = (
+        MonthlyRollup.objects.filter(user_id__in=user_ids, month__gte=start, month__lte=end_month)
+        .values_list("user_id", "month", "transaction_type")
+        .annotate(total=Sum("total"))
+        .order_by()
+    )
+    type_idx, user_idx, month_idx, totals = [], [], [], []
+    for user_id, month, tx_type, total in rows:
+        type_idx.append(TYPES.index(tx_type))
+        user_idx.append(user_index[user_id])
+        month_idx.append(month.year * 12 + month.month - start_ordinal)
+        totals.append(float(total or 0))
+
+    values = np.zeros((len(TYPES), len(user_ids), months))
+    np.add.at(values, (type_idx, user_idx, month_idx), totals)
+    return MonthlySeries(user_ids, month_list, values)
+
+
+def moving_average(values, window=MOVING_AVERAGE_WINDOW):
+    """Trailing mean over the last axis; the first ``window - 1`` points average what is available."""
+    cumulative = np.concatenate([np.zeros(values.shape[:-1] + (1,)), np.cumsum(values, axis=-1)], axis=-1)
+    index = np.arange(values.shape[-1])
+    low = np.maximum(0, index + 1 - window)
+    return (cumulative[..., index + 1] - cumulative[..., low]) / (index + 1 - low)
+
+
+def seasonal_factors(values, months):
+    """Calendar-month factors (mean for that month / overall mean), shape ``(..., 12)``.
+
+    Months seen fewer than twice, and users with no activity, get a neutral 1.0.
+    """
+    month_of_year = np.array([month.month - 1 for month in months])
+    one_hot = np.zeros((len(months), 12))
+    one_hot[np.arange(len(months)), month_of_year] = 1
+    counts = one_hot.sum(axis=0)
+    overall = values.mean(axis=-1, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        factors = (values @ one_hot) / counts / overall
+    factors = np.where((counts >= 2) & (overall > 0), factors, 1.0)
+    return np.clip(np.nan_to_num(factors, nan=1.0), 0.5, 2.0)
+
+
+def project(values, months, horizon=HORIZON_MONTHS, trend_months=TREND_MONTHS):
+    """Seasonally adjusted linear projection of the next ``horizon`` months after ``months[-1]``.
+
+    Deseasonalise, fit a least-squares line to the last ``trend_months`` points (vectorised
+    across every series), extend it and reapply the target month's factor.
+    """
+    factors = seasonal_factors(values, months)
+    month_of_year = np.array([month.month - 1 for month in months])
+    adjusted = values / factors[..., month_of_year]
+
+    recent = adjusted[..., -trend_months:]
+    x = np.arange(recent.shape[-1], dtype=float)
+    x_mean = x.mean()
+    y_mean = recent.mean(axis=-1, keepdims=True)
+    slope = ((x - x_mean) * (recent - y_mean)).sum(axis=-1, keepdims=True) / ((x - x_mean) ** 2).sum()
+
+    future_months = [add_months(months[-1], step) for step in range(1, horizon + 1)]
+    future_x = x[-1] + np.arange(1, horizon + 1) - x_mean
+    future_factors = factors[..., [month.month - 1 for month in future_months]]
+    return future_months, np.clip((y_mean + slope * future_x) * future_factors, 0, None)
+
+
+def goal_forecasts(user_ids, current_month):
+    """Completion month per goal from its average monthly contribution over recent months."""
+    goals = list(
+        SavingGoal.objects.filter(user_id__in=user_ids)
+        .with_progress()
+        .values("id", "user_id", "name", "target_amount", "deadline", "contributed_total")
+    )
+    if not goals:
+        return {}
+    rates = dict(
+        SavingContribution.objects.filter(
+            user_id__in=user_ids, date__gte=add_months(current_month, -GOAL_RATE_MONTHS), date__lt=current_month
+        )
+        .values_list("goal_id")
+        .annotate(total=Sum("amount"))
+        .order_by()
+    )
+
+    remaining = np.array([max(float(goal["target_amount"] - goal["contributed_total"]), 0.0) for goal in goals])
+    rate = np.array([float(rates.get(goal["id"]) or 0) for goal in goals]) / GOAL_RATE_MONTHS
+    with np.errstate(divide="ignore", invalid="ignore"):
+        months_needed = np.where(remaining <= 0, 0, np.where(rate > 0, np.ceil(remaining / rate), -1))
+
+    by_user = {}
+    for goal, left, monthly, needed in zip(goals, remaining, rate, months_needed):
+        completion = add_months(current_month, int(needed)) if needed >= 0 else None
+        by_user.setdefault(goal["user_id"], []).append({
+            "goal_id": goal["id"],
+            "name": goal["name"],
+            "remaining": round(float(left), 2),
+            "monthly_rate": round(float(monthly), 2),
+            "projected_completion": completion.strftime("%Y-%m") if completion else None,
+            "deadline": goal["deadline"].isoformat() if goal["deadline"] else None,
+            "on_track": bool(completion and (goal["deadline"] is None or completion <= first_day_of_month(goal["deadline"]))),
+        })
+    return by_user
+
+
+def build_forecasts(user_ids, reference_date):
+    """Forecast payloads for ``user_ids`` keyed by user id, from a handful of set-based queries."""
+    user_ids = list(user_ids)
+    current_month = first_day_of_month(reference_date)
+    series = load_monthly_series(user_ids, current_month, HISTORY_MONTHS + 1)
+    history_months = series.months[:-1]
+    history = series.values[..., :-1]
+    current = series.values[..., -1]
+
+    future_months, projections = project(history, history_months)
+    averages = moving_average(history)
+    budgets = dict(Budget.objects.filter(user_id__in=user_ids, month=current_month).values_list("user_id", "amount"))
+    goals = goal_forecasts(user_ids, current_month)
+
+    # Month-end spend: what is already spent plus the projection for the rest of the month.
+    elapsed = reference_date.day / monthrange(reference_date.year, reference_date.month)[1]
+    expense = TYPES.index("expense")
+    income = TYPES.index("income")
+    spent = current[expense]
+    month_end = spent + (1 - elapsed) * projections[expense, :, 0]
+    surplus = np.clip(projections[income, :, 0] - projections[expense, :, 0], 0, None)
+
+    shown = slice(-TREND_MONTHS, None)
+    labels = [month.strftime("%Y-%m") for month in history_months[shown]]
+    payloads = {}
+    for index, user_id in enumerate(user_ids):
+        budget = budgets.get(user_id)
+        payloads[user_id] = {
+            "reference_date": reference_date.isoformat(),
+            "history": {
+                "months": labels,
+                "income": rounded(history[income, index, shown]),
+                "expense": rounded(history[expense, index, shown]),
+                "expense_moving_average": rounded(averages[expense, index, shown]),
+            },
+            "projections": [
+                {
+                    "month": month.strftime("%Y-%m"),
+                    **{tx_type: round(float(projections[type_index, index, step]), 2) for type_index, tx_type in enumerate(TYPES)},
+                }
+                for step, month in enumerate(future_months)
+            ],
+            "month_end": {
+                "spent_to_date": round(float(spent[index]), 2),
+                "forecast": round(float(month_end[index]), 2),
+                "budget": float(budget) if budget is not None else None,
+                "over_budget": bool(budget is not None and month_end[index] > float(budget)),
+            },
+            "recommended_saving": round(float(surplus[index]), 2),
+            "goals": goals.get(user_id, []),
+        }
+    return payloads
+
+
+def rounded(values):
+    return [round(float(value), 2) for value in values]
+
+
+@instrument_analytics
+def refresh_forecasts(user_ids, reference_date):
+    """Compute and upsert ForecastSnapshot rows for ``user_ids``; returns the payloads."""
+    user_ids = list(user_ids)
+    versions = dict(DataVersion.objects.filter(user_id__in=user_ids).values_list("user_id", "version"))
+    payloads = build_forecasts(user_ids, reference_date)
+    ForecastSnapshot.objects.bulk_create(
+        [
+            ForecastSnapshot(user_id=user_id, reference_date=reference_date, data_version=versions.get(user_id, 0), payload=payload)
+            for user_id, payload in payloads.items()
+        ],
+        update_conflicts=True,
+        unique_fields=["user"],
+        update_fields=["reference_date", "data_version", "payload", "updated_at"],
+    )
+    return payloads
+
+
+def forecast_for_user(user, reference_date):
+    """The user's snapshot when it is for ``reference_date`` and their current data, else a fresh one."""
+    snapshot = ForecastSnapshot.objects.current(user, reference_date)
+    if snapshot:
+        return snapshot.payload
+    return refresh_forecasts([user.pk], reference_date)[user.pk]
+
@@ -0,0 +1,201 @@
+import csv
+import io
+import json
+import time
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+from ..models import Category, Transaction
+from .categories import default_categories
+
+# Accept both the API field names and the CSV export header, so exports can be re-imported.
+COLUMN_ALIASES = {"type": "transaction_type"}
+TRANSACTION_TYPES = set(Transaction.TransactionType.values)
+AMOUNT_FIELD = Transaction._meta.get_field("amount")
+# Larger ids cannot exist and would overflow the database's bigint parameter.
+MAX_CATEGORY_ID = 2**63 - 1
+
+
+class ImportResult:
+    def __init__(self):
+        self.rows = 0
+        self.created = 0
+        self.errors = []
+        self.file_error = None
+        self.started = time.perf_counter()
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def as_dict(self):
+        elapsed = self.elapsed
+        return {
+            "rows": self.rows,
+            "created": self.created,
+            "failed": len(self.errors),
+            "errors": self.errors,
+            "file_error": self.file_error,
+            "seconds": round(elapsed, 3),
+            "rows_per_second": round(self.rows / elapsed, 1) if elapsed else None,
+        }
+
+
+def parse_rows(fileobj, filename=""):
+    """Yield row dicts from a CSV or JSON upload. JSON may be a list or ``{"transactions": [...]}``."""
+    if filename.lower().endswith(".json"):
+        payload = json.load(io.TextIOWrapper(fileobj, encoding="utf-8-sig"))
+        if isinstance(payload, dict):
+            payload = payload.get("transactions", [])
+        if not isinstance(payload, list):
+            raise ValueError("JSON must be a list of transactions or {\"transactions\": [...]}.")
+        yield from payload
+    else:
+        yield from csv.DictReader(io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline=""))
+
+
+def normalise_row(row):
+    if not isinstance(row, dict):
+        return None
+    normalised = {}
+    for key, value in row.items():
+        key = str(key).strip().lower()
+        normalised[COLUMN_ALIASES.get(key, key)] = value.strip() if isinstance(value, str) else value
+    return normalised
+
+
+def parse_category_id(value):
+    """``value`` as a category id, or ``None`` when it should be matched as a name.
+
+    ``isdecimal()`` rather than ``isdigit()``: superscripts and circled digits pass the
+    latter but make ``int()`` raise.
+    """
+    text = str(value).strip()
+    if not text.isdecimal():
+        return None
+    category_id = int(text)
+    return category_id if category_id <= MAX_CATEGORY_ID else None
+
+
+def resolve_categories(user, rows):
+    """Load every category referenced by ``rows`` (by id or by name).
+
+    The user's own categories take one query; global defaults come from the in-process cache.
+    """
+    ids, names = set(), set()
+    for row in rows:
+        value = row.get("category") if row else None
+        if value in (None, ""):
+            continue
+        category_id = parse_category_id(value)
+        if category_id is not None:
+            ids.add(category_id)
+        else:
+            names.add(str(value).lower())
+
+    by_id, by_name = {}, {}
+    if not ids and not names:
+        return by_id, by_name
+    # Names match case-insensitively, like the cached defaults below.
+    own = Category.objects.filter(user=user).alias(name_lower=Lower("name")).filter(Q(id__in=ids) | Q(name_lower__in=names))
+    # Global defaults go first so the user's own categories win on name clashes.
+    for category in [*default_categories(), *own]:
+        by_id[category.id] = category
+        by_name[(category.name.lower(), category.category_type)] = category
+    return by_id, by_name
+
+
+def build_transaction(user, row, by_id, by_name):
+    """Return ``(Transaction, None)`` for a valid row or ``(None, errors)``."""
+    if row is None:
+        return None, ["Row must be an object."]
+
+    errors = []
+    tx_type = str(row.get("transaction_type") or "").lower()
+    if tx_type not in TRANSACTION_TYPES:
+        errors.append("transaction_type must be one of income, expense, saving.")
+
+    try:
+        amount = Decimal(str(row.get("amount"))).quantize(Decimal("0.01"))
+        # The model field's validators reject NaN, infinity and values too large for the column.
+        AMOUNT_FIELD.run_validators(amount)
+        if amount <= 0:
+            errors.append("Amount must be greater than zero.")
+    except (InvalidOperation, ValueError):
+        amount = None
+        errors.append("Amount must be a number.")
+    except ValidationError as exc:
+        amount = None
+        errors.extend(exc.messages)
+
+    try:
+        tx_date = date.fromisoformat(str(row.get("date")))
+    except ValueError:
+        tx_date = None
+        errors.append("Date must be in YYYY-MM-DD format.")
+
+    category_value = row.get("category")
+    category_id = parse_category_id(category_value)
+    if category_id is not None:
+        category = by_id.get(category_id)
+    else:
+        category = by_name.get((str(category_value or "").lower(), tx_type))
+    if category is None:
+        errors.append("Category does not exist or does not belong to this user.")
+    elif category.category_type != tx_type:
+        errors.append("Category type must match transaction type.")
+
+    note = str(row.get("note") or "")
+    if len(note) > 255:
+        errors.append("Note must be at most 255 characters.")
+
+    if errors:
+        return None, errors
+    return Transaction(user=user, amount=amount, transaction_type=tx_type, category=category, date=tx_date, note=note), None
+
+
+def read_batch(rows, batch_size, result):
+    """The next ``batch_size`` normalised rows.
+
+    An upload that cannot be parsed further (bad CSV quoting, undecodable bytes, invalid
+    JSON) ends the batch early and is recorded as ``result.file_error``.
+    """
+    batch = []
+    try:
+        for row in islice(rows, batch_size):
+            batch.append(normalise_row(row))
+    except (csv.Error, ValueError) as exc:
+        result.file_error = {"row": result.rows + len(batch) + 1, "detail": f"Could not parse upload: {exc}"}
+    return batch
+
+
+def import_transactions(user, rows, batch_size=1000):
+    """Validate and insert ``rows`` in batches; invalid rows are reported, not fatal.
+
+    A parse error partway through keeps the batches already written and stops there;
+    ``created`` and ``file_error`` tell the caller how far the import got.
+    """
+    result = ImportResult()
+    rows = iter(rows)
+    while result.file_error is None:
+        batch = read_batch(rows, batch_size, result)
+        if not batch:
+            break
+        by_id, by_name = resolve_categories(user, batch)
+        valid = []
+        for offset, row in enumerate(batch, start=result.rows + 1):
+            tx, errors = build_transaction(user, row, by_id, by_name)
+            if errors:
+                result.errors.append({"row": offset, "errors": errors})
+            else:
+                valid.append(tx)
+        if valid:
+            with transaction.atomic():
+                Transaction.objects.bulk_create(valid, batch_size=batch_size)
+        result.rows += len(batch)
+        result.created += len(valid)
+    return result
@@ -0,0 +1,85 @@
+import json
+from collections import defaultdict
+from decimal import Decimal
+from django.db.models import Sum
+from rest_framework.utils.encoders import JSONEncoder
+from ..models import Budget, DataVersion, MonthlyRollup, UserInsightSnapshot
+from .analytics import first_day_of_month
+from .dashboard import DashboardAggregate
+from .metrics import instrument_analytics
+from .spikes import load_spike_configs, previous_months, transaction_anomalies
+
+
+def as_json(payload):
+    """Round-trip through DRF's encoder so a stored payload renders exactly like a live response."""
+    return json.loads(json.dumps(payload, cls=JSONEncoder))
+
+
+def build_insights(user_ids, reference_date):
+    """Insight payloads for many users from a handful of grouped queries, keyed by user id.
+
+    Per-category sums for the current month and the longest spike window feed the
+    overview, budget and spike sections; all-time expense sums per category pick the
+    top category. Older expense is added as month-less rows so each user's
+    DashboardAggregate sees the same totals it would load itself, and ``insights()``
+    produces the identical payload.
+    """
+    user_ids = list(user_ids)
+    current_month = first_day_of_month(reference_date)
+    configs = load_spike_configs(user_ids)
+    window = previous_months(current_month, max((config["window_months"] for config in configs.values()), default=1))
+
+    rows = defaultdict(list)
+    recent_expense = defaultdict(Decimal)
+    recent = (
+        MonthlyRollup.objects.filter(user_id__in=user_ids, month__gte=window[0], month__lte=current_month)
+        .values_list("user_id", "month", "transaction_type", "category__name")
+        .annotate(total=Sum("total"))
+        .order_by()
+    )
+    for user_id, month, tx_type, category, total in recent:
+        rows[user_id].append((month, tx_type, category, total or Decimal("0")))
+        if tx_type == "expense":
+            recent_expense[(user_id, category)] += total or Decimal("0")
+
+    all_time = (
+        MonthlyRollup.objects.filter(user_id__in=user_ids, transaction_type="expense")
+        .values_list("user_id", "category__name")
+        .annotate(total=Sum("total"))
+        .order_by()
+    )
+    for user_id, category, total in all_time:
+        older = (total or Decimal("0")) - recent_expense[(user_id, category)]
+        if older:
+            rows[user_id].append((None, "expense", category, older))
+
+    budgets = dict(Budget.objects.filter(user_id__in=user_ids, month=current_month).values_list("user_id", "amount"))
+    anomalies = transaction_anomalies(user_ids, current_month, configs)
+
+    payloads = {}
+    for user_id in user_ids:
+        aggregate = DashboardAggregate(None, reference_date)
+        aggregate.rows = rows[user_id]
+        aggregate.budget_amount = budgets.get(user_id)
+        aggregate.spike_config = configs[user_id]
+        aggregate.anomalies = anomalies[user_id]
+        payloads[user_id] = as_json(aggregate.insights())
+    return payloads
+
+
+@instrument_analytics
+def refresh_insight_snapshots(user_ids, reference_date):
+    """Compute and upsert UserInsightSnapshot rows for ``user_ids``; returns how many were written."""
+    user_ids = list(user_ids)
+    versions = dict(DataVersion.objects.filter(user_id__in=user_ids).values_list("user_id", "version"))
+    payloads = build_insights(user_ids, reference_date)
+    UserInsightSnapshot.objects.bulk_create(
+        [
+            UserInsightSnapshot(user_id=user_id, reference_date=reference_date, data_version=versions.get(user_id, 0), payload=payload)
+            for user_id, payload in payloads.items()
+        ],
+        update_conflicts=True,
+        unique_fields=["user"],
+        update_fields=["reference_date", "data_version", "payload", "updated_at"],
+    )
+    return len(payloads)
@@ -0,0 +1,170 @@
+import bisect
+import heapq
+import threading
+import time
+from contextvars import ContextVar
+from functools import wraps
+from django.conf import settings
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+
+# name: (type, help, histogram buckets)
+METRICS = {
+    "finance_http_requests_total": ("counter", "HTTP requests by view, method and status.", None),
+    "finance_http_request_duration_seconds": ("histogram", "Total time spent handling a request.", DURATION_BUCKETS),
+    "finance_http_request_db_seconds": ("histogram", "Time spent in SQL per request.", DURATION_BUCKETS),
+    "finance_http_request_queries": ("histogram", "SQL queries executed per request.", QUERY_BUCKETS),
+    "finance_http_slow_requests_total": ("counter", "Requests slower than INSTRUMENTATION['SLOW_REQUEST_MS'].", None),
+    "finance_analytics_duration_seconds": ("histogram", "Time spent in analytics service functions.", DURATION_BUCKETS),
+}
+
+
+def enabled():
+    return settings.INSTRUMENTATION["ENABLED"]
+
+
+class MetricsRegistry:
+    """In-process counters and histograms rendered in the Prometheus text format.
+
+    Each worker process keeps its own registry, so scrape every worker (or run one
+    worker per port) when serving with several processes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+
+    def inc(self, name, labels, amount=1):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name, labels, value):
+        buckets = METRICS[name][2]
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            series = self._histograms.get(key)
+            if series is None:
+                series = self._histograms[key] = [[0] * len(buckets), 0.0, 0]
+            index = bisect.bisect_left(buckets, value)
+            if index < len(buckets):
+                series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def render(self):
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {key: (list(series[0]), series[1], series[2]) for key, series in self._histograms.items()}
+
+        lines = []
+        for name, (kind, help_text, buckets) in METRICS.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind == "counter":
+                for (metric, labels), value in sorted(counters.items()):
+                    if metric == name:
+                        lines.append(f"{name}{format_labels(labels)} {value}")
+                continue
+            for (metric, labels), (counts, total, count) in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                cumulative = 0
+                for bound, bucket_count in zip(buckets, counts):
+                    cumulative += bucket_count
+                    lines.append(f"{name}_bucket{format_labels(labels + (('le', str(bound)),))} {cumulative}")
+                lines.append(f"{name}_bucket{format_labels(labels + (('le', '+Inf'),))} {count}")
+                lines.append(f"{name}_sum{format_labels(labels)} {total}")
+                lines.append(f"{name}_count{format_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{escape_label(value)}"' for key, value in labels) + "}"
+
+
+registry = MetricsRegistry()
+
+
+class RequestMetrics:
+    """Per-request SQL and analytics timings, installed as a ``connection.execute_wrapper``."""
+
+    def __init__(self, worst_queries=3):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.functions = {}
+        self.worst_queries = worst_queries
+        self._worst = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.queries += 1
+            self.db_time += elapsed
+            if self.worst_queries:
+                entry = (elapsed, sql)
+                if len(self._worst) < self.worst_queries:
+                    heapq.heappush(self._worst, entry)
+                elif elapsed > self._worst[0][0]:
+                    heapq.heapreplace(self._worst, entry)
+
+    def add_function(self, name, elapsed):
+        total, calls = self.functions.get(name, (0.0, 0))
+        self.functions[name] = (total + elapsed, calls + 1)
+
+    def worst(self):
+        return sorted(self._worst, reverse=True)
+
+    def server_timing(self, total):
+        parts = [
+            f'total;dur={total * 1000:.1f}',
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} queries"',
+        ]
+        for name, (elapsed, calls) in self.functions.items():
+            parts.append(f'{name};dur={elapsed * 1000:.1f};desc="{calls} calls"')
+        return ", ".join(parts)
+
+
+current_request = ContextVar("finance_request_metrics", default=None)
+
+
+def instrument_analytics(func):
+    """Time ``func`` into the analytics histogram and the current request's Server-Timing header.
+
+    Place above ``@cached_analytics`` so cache hits are timed too. When instrumentation
+    is disabled the wrapper only checks the setting and calls through.
+    """
+    name = func.__qualname__
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if not enabled():
+            return func(*args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            registry.observe("finance_analytics_duration_seconds", {"function": name}, elapsed)
+            metrics = current_request.get()
+            if metrics is not None:
+                metrics.add_function(name, elapsed)
+
+    return wrapper
@@ -0,0 +1,264 @@
+import tempfile
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+from django.conf import settings
+from django.core.files import File
+from django.db import connection, transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+from ..db_router import use_replica
+from ..models import Budget, DataVersion, ReportJob, Transaction
+from .analytics import budget_payload, totals_from_bucket
+from .exports import SPOOL_MAX_SIZE, export_rows, iter_csv, write_excel
+from .filters import filter_transactions, transaction_filterset
+
+REPORT_FILTERS = ("transaction_type", "category", "date", "start_date", "end_date", "amount_min", "amount_max")
+REPORT_EXTENSIONS = {"csv": "csv", "excel": "xlsx", "pdf": "pdf"}
+REPORT_CONTENT_TYPES = {
+    "csv": "text/csv",
+    "excel": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "pdf": "application/pdf",
+}
+
+
+def normalise_filters(params):
+    """The report filters in ``params`` as strings; invalid values raise a DRF ValidationError."""
+    filters = {key: str(params[key]) for key in REPORT_FILTERS if params.get(key) not in (None, "")}
+    transaction_filterset(filters, Transaction.objects.none())
+    return filters
+
+
+def report_queryset(user, filters):
+    return filter_transactions(Transaction.objects.filter(user=user), filters)
+
+
+PAGE_TOP = 760
+PAGE_BOTTOM = 60
+LEFT = 40
+RIGHT = 572
+ROW_HEIGHT = 13
+TRANSACTION_COLUMNS = [("Date", 40, "left"), ("Type", 110, "left"), ("Category", 170, "left"), ("Amount", 350, "right"), ("Note", 365, "left")]
+CATEGORY_COLUMNS = [("Type", 40, "left"), ("Category", 120, "left"), ("Transactions", 400, "right"), ("Total", 520, "right")]
+MONTH_COLUMNS = [("Month", 40, "left"), ("Income", 220, "right"), ("Expenses", 330, "right"), ("Savings", 440, "right"), ("Net", 540, "right")]
+BUDGET_COLUMNS = [("Month", 40, "left"), ("Budget", 220, "right"), ("Spent", 330, "right"), ("Remaining", 440, "right"), ("Used %", 540, "right")]
+
+
+def report_aggregates(user, queryset):
+    """Everything the PDF summary sections need, from one grouped query plus one budget lookup."""
+    rows = list(
+        queryset.order_by()
+        .annotate(month=TruncMonth("date"))
+        .values("month", "transaction_type", "category__name")
+        .annotate(total=Sum("amount"), count=Count("id"))
+    )
+    totals = {"income": Decimal("0"), "expense": Decimal("0"), "saving": Decimal("0")}
+    categories = defaultdict(lambda: [0, Decimal("0")])
+    months = defaultdict(lambda: {"income": Decimal("0"), "expense": Decimal("0"), "saving": Decimal("0")})
+    for row in rows:
+        total = row["total"] or Decimal("0")
+        totals[row["transaction_type"]] += total
+        category = categories[(row["transaction_type"], row["category__name"])]
+        category[0] += row["count"]
+        category[1] += total
+        months[row["month"]][row["transaction_type"]] += total
+
+    budgets = []
+    if months:
+        for budget in Budget.objects.filter(user=user, month__in=list(months)).order_by("month"):
+            budgets.append((budget.month, budget_payload(budget.amount, months[budget.month]["expense"])))
+
+    return {
+        "summary": totals_from_bucket(totals),
+        "transactions": sum(row["count"] for row in rows),
+        "categories": sorted(categories.items(), key=lambda item: (item[0][0], -item[1][1])),
+        "months": sorted(months.items()),
+        "budgets": budgets,
+    }
+
+
+class PdfReport:
+    """Sequential page layout on top of a reportlab canvas; rows are drawn as they arrive."""
+
+    def __init__(self, fileobj, title):
+        self.canvas = canvas.Canvas(fileobj, pagesize=letter, pageCompression=1)
+        self.canvas.setTitle(title)
+        self.pages = 1
+        self.y = PAGE_TOP
+        self.columns = None
+
+    def ensure_space(self, height):
+        if self.y - height < PAGE_BOTTOM:
+            self.new_page()
+
+    def new_page(self):
+        self.footer()
+        self.canvas.showPage()
+        self.pages += 1
+        self.y = PAGE_TOP
+        if self.columns:
+            self.column_headers()
+
+    def footer(self):
+        self.canvas.setFont("Helvetica", 8)
+        self.canvas.drawRightString(RIGHT, 30, f"Page {self.pages}")
+
+    def text(self, value, font="Helvetica", size=10, height=16):
+        self.ensure_space(height)
+        self.canvas.setFont(font, size)
+        self.canvas.drawString(LEFT, self.y, value)
+        self.y -= height
+
+    def heading(self, value):
+        self.columns = None
+        self.ensure_space(60)
+        self.y -= 8
+        self.text(value, "Helvetica-Bold", 12, 20)
+
+    def start_table(self, columns):
+        self.columns = columns
+        self.column_headers()
+
+    def column_headers(self):
+        self.draw_row([title for title, _, _ in self.columns], "Helvetica-Bold")
+
+    def draw_row(self, values, font="Helvetica"):
+        self.ensure_space(ROW_HEIGHT)
+        self.canvas.setFont(font, 9)
+        for value, (_, x, align) in zip(values, self.columns):
+            if align == "right":
+                self.canvas.drawRightString(x, self.y, value)
+            else:
+                self.canvas.drawString(x, self.y, value)
+        self.y -= ROW_HEIGHT
+
+    def save(self):
+        self.footer()
+        self.canvas.save()
+
+
+def write_pdf(user, queryset, fileobj, chunk_size=2000):
+    """Render the full report for ``queryset`` and return the number of pages written."""
+    report = PdfReport(fileobj, "Smart Expense Tracker - Financial Report")
+    aggregates = report_aggregates(user, queryset)
+
+    report.text("Smart Expense Tracker - Financial Report", "Helvetica-Bold", 14, 18)
+    report.text(f"Generated: {timezone.now():%Y-%m-%d %H:%M} UTC", height=28)
+
+    report.heading("Summary")
+    for key, value in aggregates["summary"].items():
+        report.text(f"{key.replace('_', ' ').title()}: {value}")
+    report.text(f"Transactions: {aggregates['transactions']}")
+
+    report.heading("By Category")
+    report.start_table(CATEGORY_COLUMNS)
+    for (tx_type, category), (count, total) in aggregates["categories"]:
+        report.draw_row([tx_type.title(), category, str(count), f"{total:.2f}"])
+
+    report.heading("By Month")
+    report.start_table(MONTH_COLUMNS)
+    for month, totals in aggregates["months"]:
+        net = totals["income"] - totals["expense"]
+        report.draw_row([month.strftime("%Y-%m"), f"{totals['income']:.2f}", f"{totals['expense']:.2f}", f"{totals['saving']:.2f}", f"{net:.2f}"])
+
+    report.heading("Budgets")
+    if aggregates["budgets"]:
+        report.start_table(BUDGET_COLUMNS)
+        for month, status in aggregates["budgets"]:
+            report.draw_row([month.strftime("%Y-%m"), f"{status['budget']:.2f}", f"{status['spent']:.2f}", f"{status['remaining']:.2f}", f"{status['percent_used']}"])
+    else:
+        report.text("No budgets set for this period.")
+
+    report.heading("Transactions")
+    report.start_table(TRANSACTION_COLUMNS)
+    for amount, tx_type, category, tx_date, note in export_rows(queryset, chunk_size):
+        report.draw_row([tx_date.isoformat(), tx_type, category[:24], f"{amount:.2f}", note[:40]])
+
+    report.save()
+    return report.pages
+
+
+def pdf_file(user, queryset):
+    """Render the PDF report into a spooled temporary file positioned at the start."""
+    output = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    write_pdf(user, queryset, output)
+    output.seek(0)
+    return output
+
+
+def render_report(user, report_format, filters, fileobj):
+    """Write a ``report_format`` report of ``user``'s filtered transactions to the binary ``fileobj``."""
+    queryset = report_queryset(user, filters)
+    if report_format == ReportJob.Format.CSV:
+        for chunk in iter_csv(export_rows(queryset)):
+            fileobj.write(chunk.encode("utf-8"))
+    elif report_format == ReportJob.Format.EXCEL:
+        write_excel(export_rows(queryset), fileobj)
+    elif report_format == ReportJob.Format.PDF:
+        write_pdf(user, queryset, fileobj)
+    else:
+        raise ValueError(f"Unknown report format: {report_format}")
+
+
+def find_cached_report(user, report_format, filters):
+    """Return a finished job for the same format and filters rendered at the user's current data version."""
+    return (
+        ReportJob.objects.filter(
+            user=user,
+            format=report_format,
+            filters=filters,
+            status=ReportJob.Status.DONE,
+            data_version=DataVersion.current(user),
+        )
+        .exclude(file="")
+        .order_by("-finished_at")
+        .first()
+    )
+
+
+def fail_stale_report_jobs():
+    """Mark jobs running for longer than REPORT_JOB_RUNNING_TIMEOUT as failed; their worker is gone.
+
+    They are not re-queued, so a report that kills its worker cannot take the queue down
+    repeatedly. Returns the number of jobs failed.
+    """
+    now = timezone.now()
+    cutoff = now - timedelta(seconds=settings.REPORT_JOB_RUNNING_TIMEOUT)
+    return ReportJob.objects.filter(status=ReportJob.Status.RUNNING, started_at__lt=cutoff).update(
+        status=ReportJob.Status.FAILED, error="The report worker stopped before finishing this report.", finished_at=now
+    )
+
+
+def claim_report_jobs(limit):
+    """Mark up to ``limit`` pending jobs as running and return their ids, oldest first."""
+    fail_stale_report_jobs()
+    with transaction.atomic():
+        pending = ReportJob.objects.filter(status=ReportJob.Status.PENDING).order_by("created_at")
+        if connection.features.has_select_for_update_skip_locked:
+            pending = pending.select_for_update(skip_locked=True)
+        job_ids = list(pending.values_list("id", flat=True)[:limit])
+        ReportJob.objects.filter(id__in=job_ids).update(status=ReportJob.Status.RUNNING, started_at=timezone.now())
+    return job_ids
+
+
+def process_report_job(job_id):
+    """Render one claimed job to its file. Runs inside a report worker process."""
+    job = ReportJob.objects.select_related("user").get(pk=job_id)
+    try:
+        # Version and rows come from the same database, so a lagging replica cannot label stale rows as current.
+        with use_replica(job.user), tempfile.TemporaryFile() as output:
+            job.data_version = DataVersion.current(job.user)
+            render_report(job.user, job.format, job.filters, output)
+            output.seek(0)
+            job.file.save(f"report-{job.pk}.{REPORT_EXTENSIONS[job.format]}", File(output), save=False)
+        job.status = ReportJob.Status.DONE
+        job.error = ""
+    except Exception as exc:
+        job.status = ReportJob.Status.FAILED
+        job.error = str(exc)
+    job.finished_at = timezone.now()
+    job.save(update_fields=["data_version", "file", "status", "error", "finished_at"])
+    return job.status
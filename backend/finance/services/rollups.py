@@ -0,0 +1,111 @@
+from collections import defaultdict
+from decimal import Decimal
+from django.db import transaction
+from django.db.models import Count, DecimalField, F, Sum
+from django.db.models.functions import TruncMonth
+from ..models import Budget, CategoryAmountStats, DataVersion, Transaction, MonthlyRollup
+
+
+def _raw_rollup_rows(user=None):
+    qs = Transaction.objects.all()
+    if user is not None:
+        qs = qs.filter(user=user)
+    return (
+        qs.order_by()
+        .annotate(month=TruncMonth("date"))
+        .values("user_id", "month", "transaction_type", "category_id")
+        .annotate(total=Sum("amount"), rows=Count("id"))
+    )
+
+
+def _key(row):
+    return (row["user_id"], row["month"], row["transaction_type"], row["category_id"])
+
+
+def rebuild_rollups(user=None, batch_size=1000):
+    """Recompute MonthlyRollup, and Budget.spent and CategoryAmountStats with it, from the raw Transaction table.
+
+    Bumps the DataVersion of every user whose rollups were replaced so cached analytics
+    are recomputed. Returns the number of rollup rows written.
+    """
+    with transaction.atomic():
+        existing = MonthlyRollup.objects.all()
+        if user is not None:
+            existing = existing.filter(user=user)
+        user_ids = set(existing.order_by().values_list("user_id", flat=True).distinct())
+        existing.delete()
+
+        rollups = [
+            MonthlyRollup(
+                user_id=row["user_id"],
+                month=row["month"],
+                transaction_type=row["transaction_type"],
+                category_id=row["category_id"],
+                total=row["total"] or Decimal("0"),
+                count=row["rows"],
+            )
+            for row in _raw_rollup_rows(user)
+        ]
+        MonthlyRollup.objects.bulk_create(rollups, batch_size=batch_size)
+        user_ids.update(rollup.user_id for rollup in rollups)
+
+        rebuild_category_stats(user, batch_size)
+
+        budgets = Budget.objects.all()
+        if user is not None:
+            budgets = budgets.filter(user=user)
+        budgets.refresh_spent()
+        DataVersion.bump(user_ids)
+    return len(rollups)
+
+
+def rebuild_category_stats(user=None, batch_size=1000):
+    """Recompute CategoryAmountStats from the raw expense transactions."""
+    existing = CategoryAmountStats.objects.all()
+    transactions = Transaction.objects.filter(transaction_type=Transaction.TransactionType.EXPENSE)
+    if user is not None:
+        existing = existing.filter(user=user)
+        transactions = transactions.filter(user=user)
+    existing.delete()
+    rows = (
+        transactions.order_by()
+        .values("user_id", "category_id")
+        .annotate(
+            total=Sum("amount"),
+            rows=Count("id"),
+            squares=Sum(F("amount") * F("amount"), output_field=DecimalField(max_digits=30, decimal_places=4)),
+        )
+    )
+    CategoryAmountStats.objects.bulk_create(
+        [
+            CategoryAmountStats(user_id=row["user_id"], category_id=row["category_id"], count=row["rows"], total=row["total"], sum_squares=row["squares"])
+            for row in rows
+        ],
+        batch_size=batch_size,
+    )
+
+
+def verify_rollups(user=None):
+    """Compare MonthlyRollup with the raw Transaction table and return a list of mismatches."""
+    expected = {_key(row): (row["total"] or Decimal("0"), row["rows"]) for row in _raw_rollup_rows(user)}
+
+    rollups = MonthlyRollup.objects.all()
+    if user is not None:
+        rollups = rollups.filter(user=user)
+    actual = defaultdict(lambda: (Decimal("0"), 0))
+    for row in rollups.values("user_id", "month", "transaction_type", "category_id", "total", "count"):
+        actual[_key(row)] = (row["total"], row["count"])
+
+    mismatches = []
+    for key in sorted(set(expected) | set(actual), key=str):
+        if expected.get(key, (Decimal("0"), 0)) != actual[key]:
+            user_id, month, tx_type, category_id = key
+            mismatches.append({
+                "user_id": user_id,
+                "month": month.strftime("%Y-%m"),
+                "transaction_type": tx_type,
+                "category_id": category_id,
+                "expected": expected.get(key, (Decimal("0"), 0)),
+                "actual": actual[key],
+            })
+    return mismatches
@@ -0,0 +1,37 @@
+import re
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import Case, F, FloatField, Q, Value, When
+
+MAX_TERMS = 8
+
+
+def search_terms(text):
+    return re.findall(r"\w+", (text or "").lower())[:MAX_TERMS]
+
+
+def search_transactions(queryset, text):
+    """Rank ``queryset`` against ``text``; every term must prefix-match the note or category name.
+
+    PostgreSQL uses the trigger-maintained ``search_vector`` and its GIN index. Other
+    backends fall back to ``icontains`` with a simple weighted match score.
+    """
+    terms = search_terms(text)
+    if not terms:
+        return queryset.none()
+
+    if connection.vendor == "postgresql":
+        query = SearchQuery(" & ".join(f"{term}:*" for term in terms), search_type="raw", config="simple")
+        return (
+            queryset.filter(search_vector=query)
+            .annotate(rank=SearchRank(F("search_vector"), query))
+            .order_by("-rank", "-date", "-id")
+        )
+
+    condition = Q()
+    score = Value(0.0)
+    for term in terms:
+        condition &= Q(note__icontains=term) | Q(category__name__icontains=term)
+        score = score + Case(When(note__icontains=term, then=Value(1.0)), default=Value(0.0), output_field=FloatField())
+        score = score + Case(When(category__name__icontains=term, then=Value(0.4)), default=Value(0.0), output_field=FloatField())
+    return queryset.filter(condition).annotate(rank=score).order_by("-rank", "-date", "-id")
@@ -0,0 +1,160 @@
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from statistics import median
+from django.conf import settings
+from ..models import CategoryAmountStats, SpikeSettings, Transaction
+
+# Scales the median absolute deviation to a standard deviation for normally distributed spend.
+MAD_SCALE = Decimal("1.4826")
+# Deviation floor as a share of the baseline, so a flat history does not flag every small rise.
+MIN_RELATIVE_DEVIATION = Decimal("0.1")
+HUNDRED = Decimal("100")
+
+
+def previous_months(month, count):
+    """The first days of the ``count`` months before ``month``, oldest first."""
+    months = []
+    for _ in range(count):
+        month = (month - date.resolution).replace(day=1)
+        months.append(month)
+    return months[::-1]
+
+
+def resolve_config(overrides=None):
+    """Effective detection settings: the user's overrides on top of settings.SPIKE_DETECTION."""
+    defaults = settings.SPIKE_DETECTION
+    overrides = overrides or {}
+    method = overrides.get("method") or defaults["METHOD"]
+    threshold = overrides.get("threshold")
+    transaction_threshold = overrides.get("transaction_threshold")
+    return {
+        "method": method,
+        "window_months": min(overrides.get("window_months") or defaults["WINDOW_MONTHS"], defaults["MAX_WINDOW_MONTHS"]),
+        "threshold": Decimal(str(defaults["THRESHOLDS"][method] if threshold is None else threshold)),
+        "transaction_threshold": Decimal(str(defaults["TRANSACTION_THRESHOLD"] if transaction_threshold is None else transaction_threshold)),
+        "min_history_months": defaults["MIN_HISTORY_MONTHS"],
+    }
+
+
+def load_spike_configs(user_ids):
+    """Effective settings for each of ``user_ids`` from one query."""
+    user_ids = list(user_ids)
+    overrides = {
+        row["user_id"]: row
+        for row in SpikeSettings.objects.filter(user_id__in=user_ids).values("user_id", "method", "window_months", "threshold", "transaction_threshold")
+    }
+    return {user_id: resolve_config(overrides.get(user_id)) for user_id in user_ids}
+
+
+def ratio_spikes(current, previous, threshold):
+    """Categories whose total this month exceeds last month's by more than ``threshold`` times."""
+    messages = []
+    for category, total in sorted(current.items()):
+        prev = previous.get(category, Decimal("0"))
+        if prev > 0 and total > prev * threshold:
+            increase = ((total - prev) / prev * HUNDRED).quantize(Decimal("0.01"))
+            messages.append(f"Spending spike detected: {category} is up by {increase}%.")
+    return messages
+
+
+def baseline(values, method):
+    """``(center, spread, label)`` of a category's monthly totals over the window."""
+    if method == SpikeSettings.Method.MAD:
+        center = median(values)
+        return center, median(abs(value - center) for value in values) * MAD_SCALE, "median"
+    center = sum(values, Decimal("0")) / len(values)
+    variance = sum(((value - center) ** 2 for value in values), Decimal("0")) / len(values)
+    return center, variance.sqrt(), "average"
+
+
+def monthly_spikes(current, history, months, config):
+    """Spike messages for this month's ``{category: total}`` against the rolling window.
+
+    ``history`` maps each month in ``months`` (the window, oldest first) to its
+    ``{category: total}`` expense. Months without any expense are treated as before
+    the user's history started and left out of the baseline; with fewer than
+    ``min_history_months`` left, or with the ratio method, the comparison is against
+    last month only.
+    """
+    method = config["method"]
+    active = [month for month in months if history.get(month)]
+    if method == SpikeSettings.Method.RATIO or len(active) < config["min_history_months"]:
+        threshold = config["threshold"] if method == SpikeSettings.Method.RATIO else Decimal(str(settings.SPIKE_DETECTION["THRESHOLDS"]["ratio"]))
+        return ratio_spikes(current, history.get(months[-1]) or {}, threshold)
+
+    messages = []
+    for category, total in sorted(current.items()):
+        center, spread, label = baseline([history[month].get(category, Decimal("0")) for month in active], method)
+        if center <= 0 or total <= center:
+            continue
+        if (total - center) / max(spread, center * MIN_RELATIVE_DEVIATION) >= config["threshold"]:
+            increase = ((total - center) / center * HUNDRED).quantize(Decimal("0.01"))
+            messages.append(f"Spending spike detected: {category} is up by {increase}% on its {len(active)}-month {label}.")
+    return messages
+
+
+def transaction_anomalies(user_ids, month, configs):
+    """Single expense transactions in ``month`` far above their category's usual amount, per user.
+
+    The baseline is the category's CategoryAmountStats row with the transaction itself
+    taken out, so checking a transaction costs one lookup instead of a history scan.
+    Categories with too few earlier transactions are skipped.
+    """
+    user_ids = list(user_ids)
+    stats = {
+        (row.user_id, row.category_id): row
+        for row in CategoryAmountStats.objects.filter(user_id__in=user_ids, count__gt=settings.SPIKE_DETECTION["MIN_TRANSACTIONS"])
+    }
+    if not stats:
+        return defaultdict(list)
+
+    next_month = (month.replace(day=28) + 4 * date.resolution).replace(day=1)
+    rows = (
+        Transaction.objects.filter(
+            user_id__in=user_ids,
+            transaction_type=Transaction.TransactionType.EXPENSE,
+            date__gte=month,
+            date__lt=next_month,
+            category_id__in={category_id for _, category_id in stats},
+        )
+        .order_by("date", "id")
+        .values_list("id", "user_id", "category_id", "category__name", "date", "amount")
+    )
+    return score_transactions(rows, stats, configs)
+
+
+def score_transactions(rows, stats, configs):
+    """Flag ``(id, user_id, category_id, category, date, amount)`` rows against ``{(user_id, category_id): stats}``."""
+    anomalies = defaultdict(list)
+    for tx_id, user_id, category_id, category, tx_date, amount in rows:
+        stat = stats.get((user_id, category_id))
+        # The baseline leaves this transaction out, so it needs at least one other.
+        if stat is None or stat.count < 2:
+            continue
+        count = stat.count - 1
+        mean = (stat.total - amount) / count
+        if mean <= 0 or amount <= mean:
+            continue
+        variance = (Decimal(stat.sum_squares) - amount * amount) / count - mean * mean
+        std = variance.sqrt() if variance > 0 else Decimal("0")
+        score = (amount - mean) / max(std, mean * MIN_RELATIVE_DEVIATION)
+        if score >= configs[user_id]["transaction_threshold"]:
+            anomalies[user_id].append({
+                "transaction_id": tx_id,
+                "date": tx_date,
+                "category": category,
+                "amount": amount,
+                "category_mean": mean.quantize(Decimal("0.01")),
+                "category_std": std.quantize(Decimal("0.01")),
+                "score": score.quantize(Decimal("0.01")),
+            })
+    return anomalies
+
+
+def anomaly_messages(anomalies):
+    return [
+        f"Unusual transaction: {item['amount']} in {item['category']} on {item['date']:%Y-%m-%d}, "
+        f"{(item['amount'] / item['category_mean']).quantize(Decimal('0.1'))}x its usual amount."
+        for item in anomalies
+    ]
@@ -0,0 +1,52 @@
+from django.contrib.auth import get_user_model
+from rest_framework.test import APITestCase
+from finance.models import Category
+from finance.services.categories import default_categories, invalidate_default_categories
+
+
+class CategoryListQueryTests(APITestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email="owner@example.com", username="owner", password="secret")
+        self.client.force_authenticate(self.user)
+
+    def test_list_is_one_query(self):
+        Category.objects.create(user=self.user, name="Coffee", category_type=Category.CategoryType.EXPENSE)
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/categories/")
+        self.assertEqual(response.status_code, 200)
+        names = {category["name"] for category in response.data}
+        self.assertIn("Coffee", names)
+        self.assertTrue(Category.objects.filter(user__isnull=True, name__in=names).exists())
+
+
+class DefaultCategoryCacheTests(APITestCase):
+    """The in-process default category cache is dropped on writes instead of waiting for its TTL."""
+
+    def setUp(self):
+        # The cache is module state and outlives each test's rolled-back transaction.
+        invalidate_default_categories()
+        self.addCleanup(invalidate_default_categories)
+
+    def cached_names(self):
+        return {category.name for category in default_categories()}
+
+    def test_reads_are_cached(self):
+        default_categories()
+        with self.assertNumQueries(0):
+            default_categories()
+
+    def test_save_invalidates(self):
+        category = Category.objects.create(name="Pets", category_type=Category.CategoryType.EXPENSE, is_default=True)
+        self.assertIn("Pets", self.cached_names())
+
+        category.name = "Pet care"
+        category.save()
+        self.assertIn("Pet care", self.cached_names())
+        self.assertNotIn("Pets", self.cached_names())
+
+    def test_delete_invalidates(self):
+        category = Category.objects.create(name="Pets", category_type=Category.CategoryType.EXPENSE, is_default=True)
+        self.assertIn("Pets", self.cached_names())
+
+        category.delete()
+        self.assertNotIn("Pets", self.cached_names())
@@ -0,0 +1,43 @@
+from datetime import date
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.db.models import Case, Value, When
+from django.test import TestCase
+from finance.models import Category, CategoryAmountStats, Transaction
+from finance.services.rollups import rebuild_rollups
+
+
+class CategoryAmountStatsTests(TestCase):
+    """The running sums stay equal to a rebuild from the raw transactions."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email="stats@example.com", username="stats", password="secret")
+        self.category = Category.objects.create(user=self.user, name="Groceries", category_type=Category.CategoryType.EXPENSE)
+
+    def create(self, amount):
+        return Transaction.objects.create(
+            user=self.user, category=self.category, amount=Decimal(amount), transaction_type="expense", date=date(2024, 3, 1)
+        )
+
+    def assert_matches_rebuild(self):
+        stats = CategoryAmountStats.objects.get(user=self.user, category=self.category)
+        running = (stats.count, stats.total, stats.sum_squares)
+        rebuild_rollups(self.user)
+        stats = CategoryAmountStats.objects.get(user=self.user, category=self.category)
+        self.assertEqual(running, (stats.count, stats.total, stats.sum_squares))
+
+    def test_update_that_keeps_the_total(self):
+        first, second = self.create("10.00"), self.create("30.00")
+        Transaction.objects.filter(pk__in=[first.pk, second.pk]).update(
+            amount=Case(When(pk=first.pk, then=Value(Decimal("30.00"))), default=Value(Decimal("10.00")))
+        )
+        self.assert_matches_rebuild()
+        Transaction.objects.filter(pk__in=[first.pk, second.pk]).update(amount=Value(Decimal("20.00")))
+        self.assert_matches_rebuild()
+
+    def test_delete_removes_only_emptied_stats(self):
+        other = Category.objects.create(user=self.user, name="Fuel", category_type=Category.CategoryType.EXPENSE)
+        Transaction.objects.create(user=self.user, category=other, amount=Decimal("50.00"), transaction_type="expense", date=date(2024, 3, 2))
+        self.create("10.00").delete()
+        self.assertFalse(CategoryAmountStats.objects.filter(user=self.user, category=self.category).exists())
+        self.assertTrue(CategoryAmountStats.objects.filter(user=self.user, category=other).exists())
@@ -0,0 +1,59 @@
+from datetime import date
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from finance.models import DataVersion, SavingContribution, SavingGoal
+
+
+class SavingGoalListQueryTests(APITestCase):
+    """Listing goals with their progress costs the same number of queries for any number of goals."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email="saver@example.com", username="saver", password="secret")
+        self.client.force_authenticate(self.user)
+
+    def create_goals(self, count):
+        for index in range(count):
+            goal = SavingGoal.objects.create(user=self.user, name=f"Goal {index}", target_amount=Decimal("1000.00"))
+            for amount in ("100.00", "150.00"):
+                SavingContribution.objects.create(user=self.user, goal=goal, amount=Decimal(amount), date=date(2024, 1, 1))
+
+    def assert_list_queries(self):
+        self.create_goals(1)
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/saving-goals/")
+        self.assertEqual(response.status_code, 200)
+
+        self.create_goals(9)
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/saving-goals/")
+        self.assertEqual(len(response.data), 10)
+        for goal in response.data:
+            self.assertEqual(goal["current_amount"], "250.00")
+            self.assertEqual(goal["progress_percent"], "25.00")
+            self.assertEqual(goal["remaining_amount"], "750.00")
+
+    @override_settings(SAVING_GOAL_DENORMALISED_TOTALS=False)
+    def test_annotated_totals(self):
+        self.assert_list_queries()
+
+    @override_settings(SAVING_GOAL_DENORMALISED_TOTALS=True)
+    def test_denormalised_totals(self):
+        self.assert_list_queries()
+
+
+class SavingContributionWriteTests(APITestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email="writer@example.com", username="writer", password="secret")
+        self.goal = SavingGoal.objects.create(user=self.user, name="Holiday", target_amount=Decimal("500.00"))
+
+    def test_write_bumps_data_version_once(self):
+        version = DataVersion.current(self.user)
+        contribution = SavingContribution.objects.create(user=self.user, goal=self.goal, amount=Decimal("40.00"), date=date(2024, 1, 1))
+        self.assertEqual(DataVersion.current(self.user), version + 1)
+
+        contribution.delete()
+        self.assertEqual(DataVersion.current(self.user), version + 2)
+        self.goal.refresh_from_db()
+        self.assertEqual(self.goal.contributions_total, Decimal("0.00"))
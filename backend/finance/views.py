@@ -1,54 +1,38 @@
-import csv
-from datetime import date, datetime
-from decimal import Decimal
-from io import BytesIO
-from openpyxl import Workbook
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
+from datetime import date
+from django.conf import settings
 from django.db.models import Q
-from django.http import HttpResponse
-from rest_framework import viewsets, permissions
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import mixins, viewsets, permissions, status
+from rest_framework.decorators import action
+from rest_framework.parsers import JSONParser, MultiPartParser
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from .models import Category, Transaction, SavingGoal, SavingContribution, Budget
+from .db_router import replica_reads
+from .models import Category, Transaction, SavingGoal, SavingContribution, Budget, DataVersion, ReportJob, UserInsightSnapshot, BudgetAlert, SpikeSettings
+from .pagination import BudgetAlertPagination, BudgetPagination, SavingContributionPagination, TransactionPagination
 from .serializers import (
     CategorySerializer,
     TransactionSerializer,
     SavingGoalSerializer,
     SavingContributionSerializer,
     BudgetSerializer,
+    BudgetAlertSerializer,
+    ReportJobSerializer,
+    SpikeSettingsSerializer,
+    AnomalySerializer,
 )
-from .services.analytics import (
-    get_totals,
-    get_monthly_overview,
-    get_category_totals,
-    get_trend_data,
-    generate_insights,
-    goal_trends,
-)
-
-
-DEFAULT_CATEGORIES = [
-    ("Food", "expense"),
-    ("Travel", "expense"),
-    ("Bills", "expense"),
-    ("Health", "expense"),
-    ("Shopping", "expense"),
-    ("Salary", "income"),
-    ("Investment", "income"),
-    ("Emergency Fund", "saving"),
-    ("Retirement", "saving"),
-]
-
-
-def ensure_default_categories(user):
-    for name, category_type in DEFAULT_CATEGORIES:
-        Category.objects.get_or_create(
-            user=None,
-            name=name,
-            category_type=category_type,
-            defaults={"is_default": True},
-        )
+from .services.analytics import budget_payload, month_total
+from .services.cache import cache_stats
+from .services.dashboard import build_dashboard, dashboard_section
+from .services.exports import EXCEL_CONTENT_TYPE, excel_file, export_rows, iter_csv
+from .services.filters import TransactionFilterSet, filter_transactions
+from .services.forecasting import forecast_for_user
+from .services.importer import import_transactions, parse_rows
+from .services.metrics import registry
+from .services.search import search_transactions
+from .services.spikes import load_spike_configs, transaction_anomalies
+from .services.reports import REPORT_CONTENT_TYPES, REPORT_EXTENSIONS, find_cached_report, pdf_file, report_queryset
 
 
 class UserOwnedModelViewSet(viewsets.ModelViewSet):
@@ -61,7 +45,6 @@ class CategoryViewSet(UserOwnedModelViewSet):
     filterset_fields = ["category_type", "is_default"]
 
     def get_queryset(self):
-        ensure_default_categories(self.request.user)
         return Category.objects.filter(Q(user=self.request.user) | Q(is_default=True))
 
     def perform_create(self, serializer):
@@ -70,39 +53,68 @@ class CategoryViewSet(UserOwnedModelViewSet):
 
 class TransactionViewSet(UserOwnedModelViewSet):
     serializer_class = TransactionSerializer
-    filterset_fields = ["transaction_type", "category", "date"]
+    pagination_class = TransactionPagination
+    filterset_class = TransactionFilterSet
     search_fields = ["note", "category__name"]
     ordering_fields = ["amount", "date", "created_at"]
 
     def get_queryset(self):
-        queryset = Transaction.objects.filter(user=self.request.user)
-
-        start_date = self.request.query_params.get("start_date")
-        end_date = self.request.query_params.get("end_date")
-        amount_min = self.request.query_params.get("amount_min")
-        amount_max = self.request.query_params.get("amount_max")
-
-        if start_date:
-            queryset = queryset.filter(date__gte=start_date)
-        if end_date:
-            queryset = queryset.filter(date__lte=end_date)
-        if amount_min:
-            queryset = queryset.filter(amount__gte=Decimal(amount_min))
-        if amount_max:
-            queryset = queryset.filter(amount__lte=Decimal(amount_max))
-
+        queryset = Transaction.objects.filter(user=self.request.user).select_related("category")
+        if self.action == "list":
+            queryset = queryset.only(
+                "id", "amount", "transaction_type", "category_id", "category__name", "date", "note", "created_at", "updated_at"
+            )
         return queryset
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
+    @action(detail=False, methods=["get"])
+    def search(self, request):
+        """Ranked prefix search over note and category name, combinable with the list filters."""
+        text = request.query_params.get("q", "")
+        if not text.strip():
+            return Response({"detail": "Query parameter 'q' is required."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = max(1, min(int(request.query_params.get("limit", 50)), 200))
+        except ValueError:
+            return Response({"detail": "limit must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = filter_transactions(self.get_queryset(), request.query_params)
+        results = list(search_transactions(queryset, text)[:limit])
+        data = self.get_serializer(results, many=True).data
+        for row, tx in zip(data, results):
+            row["rank"] = round(float(tx.rank), 4)
+        return Response({"results": data})
+
+    @action(detail=False, methods=["post"], url_path="import", parser_classes=[MultiPartParser, JSONParser])
+    def bulk_import(self, request):
+        upload = request.FILES.get("file")
+        if upload is not None:
+            rows = parse_rows(upload, upload.name)
+        elif isinstance(request.data, list):
+            rows = request.data
+        else:
+            return Response({"detail": "Upload a CSV/JSON file as 'file' or post a JSON list."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            batch_size = max(1, min(int(request.query_params.get("batch_size", 1000)), 10000))
+        except ValueError:
+            return Response({"detail": "batch_size must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+        result = import_transactions(request.user, rows, batch_size).as_dict()
+        return Response(result, status=status.HTTP_201_CREATED if result["created"] else status.HTTP_400_BAD_REQUEST)
+
 
 class SavingGoalViewSet(UserOwnedModelViewSet):
     serializer_class = SavingGoalSerializer
     search_fields = ["name"]
 
     def get_queryset(self):
-        return SavingGoal.objects.filter(user=self.request.user)
+        queryset = SavingGoal.objects.filter(user=self.request.user)
+        if getattr(settings, "SAVING_GOAL_DENORMALISED_TOTALS", False):
+            return queryset
+        return queryset.with_progress()
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
@@ -110,6 +122,7 @@ class SavingGoalViewSet(UserOwnedModelViewSet):
 
 class SavingContributionViewSet(UserOwnedModelViewSet):
     serializer_class = SavingContributionSerializer
+    pagination_class = SavingContributionPagination
     filterset_fields = ["goal", "date"]
     search_fields = ["note"]
 
@@ -122,6 +135,7 @@ class SavingContributionViewSet(UserOwnedModelViewSet):
 
 class BudgetViewSet(UserOwnedModelViewSet):
     serializer_class = BudgetSerializer
+    pagination_class = BudgetPagination
 
     def get_queryset(self):
         return Budget.objects.filter(user=self.request.user)
@@ -134,116 +148,202 @@ class BudgetViewSet(UserOwnedModelViewSet):
         month = serializer.validated_data.get("month", serializer.instance.month).replace(day=1)
         serializer.save(month=month)
 
+    @action(detail=False, methods=["get"], url_path="status")
+    def current_status(self, request):
+        """Budget, running spent total and alert for ``?month=YYYY-MM`` (default: this month)."""
+        try:
+            month = date.fromisoformat(f"{request.query_params['month']}-01") if request.query_params.get("month") else date.today().replace(day=1)
+        except ValueError:
+            return Response({"detail": "month must be in YYYY-MM format."}, status=status.HTTP_400_BAD_REQUEST)
+        budget = self.get_queryset().filter(month=month).values("amount", "spent").first()
+        payload = budget_payload(budget["amount"], budget["spent"]) if budget else budget_payload(None, month_total(request.user, "expense", month))
+        return Response({"month": month.strftime("%Y-%m"), **payload})
+
+    @action(detail=False, methods=["get"])
+    def alerts(self, request):
+        """Alert history, newest first: one event per threshold crossing, recorded on the write that crossed it."""
+        queryset = BudgetAlert.objects.filter(user=request.user).select_related("budget")
+        paginator = BudgetAlertPagination()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        return paginator.get_paginated_response(BudgetAlertSerializer(page, many=True).data)
+
 
 class DashboardSummaryView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
+    @replica_reads
     def get(self, request):
-        today = date.today()
-        total_summary = get_totals(request.user)
-        monthly = get_monthly_overview(request.user, today)
-        return Response({
-            "summary": total_summary,
-            "monthly_overview": monthly,
-            "category_totals": {
-                "income": get_category_totals(request.user, "income"),
-                "expense": get_category_totals(request.user, "expense"),
-                "saving": get_category_totals(request.user, "saving"),
-            },
-        })
+        return Response(dashboard_section(request.user, date.today(), "summary"))
 
 
 class InsightView(APIView):
+    """Served from the precomputed snapshot when it matches today and the user's data, else computed live."""
+
     permission_classes = [permissions.IsAuthenticated]
 
+    @replica_reads
     def get(self, request):
-        return Response(generate_insights(request.user, date.today()))
+        today = date.today()
+        snapshot = UserInsightSnapshot.objects.current(request.user, today)
+        if snapshot:
+            return Response(snapshot.payload)
+        return Response(dashboard_section(request.user, today, "insights"))
 
 
 class ChartDataView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
+    @replica_reads
+    def get(self, request):
+        return Response(dashboard_section(request.user, date.today(), "charts"))
+
+
+class ForecastView(APIView):
+    """Projections, month-end spend and goal completion dates, served from the nightly snapshot when current."""
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    @replica_reads
+    def get(self, request):
+        return Response(forecast_for_user(request.user, date.today()))
+
+
+class SpikeSettingsView(APIView):
+    """The user's spike detection overrides (blank fields use the server defaults) and the settings in effect."""
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_object(self):
+        return SpikeSettings.objects.filter(user=self.request.user).first() or SpikeSettings(user=self.request.user)
+
+    def get(self, request):
+        return Response(SpikeSettingsSerializer(self.get_object()).data)
+
+    def put(self, request):
+        serializer = SpikeSettingsSerializer(self.get_object(), data=request.data, partial=request.method == "PATCH")
+        serializer.is_valid(raise_exception=True)
+        serializer.save(user=request.user)
+        return Response(serializer.data)
+
+    patch = put
+
+
+class AnomalyView(APIView):
+    """Single expense transactions far above their category's usual amount in ``?month=YYYY-MM`` (default: this month)."""
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    @replica_reads
+    def get(self, request):
+        try:
+            month = date.fromisoformat(f"{request.query_params['month']}-01") if request.query_params.get("month") else date.today().replace(day=1)
+        except ValueError:
+            return Response({"detail": "month must be in YYYY-MM format."}, status=status.HTTP_400_BAD_REQUEST)
+        anomalies = transaction_anomalies([request.user.pk], month, load_spike_configs([request.user.pk]))[request.user.pk]
+        return Response({"month": month.strftime("%Y-%m"), "results": AnomalySerializer(anomalies, many=True).data})
+
+
+class DashboardBundleView(APIView):
+    """Summary, insights and charts in one response, revalidated with the user's data version."""
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    @replica_reads
+    def get(self, request):
+        today = date.today()
+        version = DataVersion.current(request.user)
+        etag = quote_etag(f"{version}-{today:%Y%m%d}")
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+        if_none_match = parse_etags(request.headers.get("If-None-Match", ""))
+        if etag in if_none_match or "*" in if_none_match:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        return Response(build_dashboard(request.user, today, data_version=version), headers=headers)
+
+
+class AnalyticsCacheStatsView(APIView):
+    permission_classes = [permissions.IsAdminUser]
+
     def get(self, request):
-        return Response({
-            "expense_trend": get_trend_data(request.user, "expense"),
-            "saving_trend": get_trend_data(request.user, "saving"),
-            "income_vs_expense": {
-                "income": get_trend_data(request.user, "income"),
-                "expense": get_trend_data(request.user, "expense"),
-            },
-            "category_distribution": get_category_totals(request.user),
-            "saving_growth": goal_trends(request.user),
-        })
+        return Response(cache_stats())
+
+
+def metrics_view(request):
+    """Prometheus scrape endpoint; only served with instrumentation on and to allowed addresses."""
+    config = settings.INSTRUMENTATION
+    if not config["ENABLED"] or request.META.get("REMOTE_ADDR") not in config["METRICS_ALLOWED_IPS"]:
+        raise Http404
+    return HttpResponse(registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
 
 
 class ExportCsvView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
+    @replica_reads
     def get(self, request):
-        response = HttpResponse(content_type="text/csv")
+        queryset = filter_transactions(Transaction.objects.filter(user=request.user), request.query_params)
+        # The rows are read after get() returns, outside replica_reads, so bind the database now.
+        queryset = queryset.using(queryset.db)
+        response = StreamingHttpResponse(iter_csv(export_rows(queryset)), content_type="text/csv")
         response["Content-Disposition"] = 'attachment; filename="transactions.csv"'
-        writer = csv.writer(response)
-        writer.writerow(["Amount", "Type", "Category", "Date", "Note"])
-
-        for tx in Transaction.objects.filter(user=request.user).select_related("category"):
-            writer.writerow([tx.amount, tx.transaction_type, tx.category.name, tx.date, tx.note])
         return response
 
 
 class ExportExcelView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
+    @replica_reads
     def get(self, request):
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Transactions"
-        ws.append(["Amount", "Type", "Category", "Date", "Note"])
-        for tx in Transaction.objects.filter(user=request.user).select_related("category"):
-            ws.append([float(tx.amount), tx.transaction_type, tx.category.name, tx.date.isoformat(), tx.note])
-
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
-
-        response = HttpResponse(
-            output.getvalue(),
-            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        queryset = filter_transactions(Transaction.objects.filter(user=request.user), request.query_params)
+        return FileResponse(
+            excel_file(export_rows(queryset)),
+            as_attachment=True,
+            filename="transactions.xlsx",
+            content_type=EXCEL_CONTENT_TYPE,
         )
-        response["Content-Disposition"] = 'attachment; filename="transactions.xlsx"'
-        return response
 
 
 class ExportPdfView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
+    @replica_reads
     def get(self, request):
-        buffer = BytesIO()
-        pdf = canvas.Canvas(buffer, pagesize=letter)
-
-        pdf.setFont("Helvetica-Bold", 14)
-        pdf.drawString(40, 760, "Smart Expense Tracker - Financial Summary")
-        pdf.setFont("Helvetica", 10)
-        pdf.drawString(40, 742, f"Generated: {datetime.utcnow().isoformat()} UTC")
-
-        summary = get_totals(request.user)
-        y = 710
-        for key, value in summary.items():
-            pdf.drawString(40, y, f"{key.replace('_', ' ').title()}: {value}")
-            y -= 18
-
-        y -= 10
-        pdf.setFont("Helvetica-Bold", 12)
-        pdf.drawString(40, y, "Recent Transactions")
-        pdf.setFont("Helvetica", 9)
-        y -= 18
-        for tx in Transaction.objects.filter(user=request.user).select_related("category")[:15]:
-            line = f"{tx.date} | {tx.transaction_type} | {tx.category.name} | {tx.amount} | {tx.note[:40]}"
-            pdf.drawString(40, y, line)
-            y -= 14
-            if y < 60:
-                pdf.showPage()
-                y = 760
-
-        pdf.save()
-        buffer.seek(0)
-        return HttpResponse(buffer.getvalue(), content_type="application/pdf", headers={"Content-Disposition": 'attachment; filename="financial_report.pdf"'})
+        return FileResponse(
+            pdf_file(request.user, report_queryset(request.user, request.query_params)),
+            as_attachment=True,
+            filename="financial_report.pdf",
+            content_type="application/pdf",
+        )
+
+
+class ReportJobViewSet(mixins.CreateModelMixin, mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    """Queue CSV/Excel/PDF reports for the report worker and download them once rendered."""
+
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = ReportJobSerializer
+    filterset_fields = ["format", "status"]
+
+    def get_queryset(self):
+        return ReportJob.objects.filter(user=self.request.user)
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        cached = find_cached_report(request.user, serializer.validated_data["format"], serializer.validated_data.get("filters", {}))
+        if cached:
+            return Response(self.get_serializer(cached).data, status=status.HTTP_200_OK)
+        serializer.save(user=request.user)
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=True, methods=["get"])
+    def download(self, request, pk=None):
+        job = self.get_object()
+        if job.status != ReportJob.Status.DONE or not job.file:
+            return Response({"detail": f"Report is {job.status}."}, status=status.HTTP_409_CONFLICT)
+        return FileResponse(
+            job.file.open("rb"),
+            as_attachment=True,
+            filename=f"transactions.{REPORT_EXTENSIONS[job.format]}",
+            content_type=REPORT_CONTENT_TYPES[job.format],
+        )
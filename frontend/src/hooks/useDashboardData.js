@@ -1,19 +1,22 @@
-import { useCallback, useEffect, useState } from "react";
+import { useCallback, useEffect, useRef, useState } from "react";
 import api from "../api/client";
 
 export function useDashboardData() {
   const [data, setData] = useState(null);
   const [loading, setLoading] = useState(true);
+  const etag = useRef(null);
 
   const refresh = useCallback(async () => {
     setLoading(true);
-    const [summary, insights, charts] = await Promise.all([
-      api.get("/dashboard/summary/"),
-      api.get("/analytics/insights/"),
-      api.get("/analytics/charts/"),
-    ]);
+    const response = await api.get("/dashboard/bundle/", {
+      headers: etag.current ? { "If-None-Match": etag.current } : {},
+      validateStatus: (status) => (status >= 200 && status < 300) || status === 304,
+    });
 
-    setData({ summary: summary.data, insights: insights.data, charts: charts.data });
+    if (response.status !== 304) {
+      etag.current = response.headers.etag || null;
+      setData(response.data);
+    }
     setLoading(false);
   }, []);
 
@@ -10,7 +10,7 @@ export default function BudgetPage() {
 
   const load = async () => {
     const [budgetRes, insightRes] = await Promise.all([api.get("/budgets/"), api.get("/analytics/insights/")]);
-    setBudgets(budgetRes.data);
+    setBudgets(budgetRes.data.results);
     setInsights(insightRes.data);
   };
 
@@ -12,6 +12,7 @@ const initialForm = {
 
 export default function TransactionsPage() {
   const [transactions, setTransactions] = useState([]);
+  const [nextPage, setNextPage] = useState(null);
   const [categories, setCategories] = useState([]);
   const [form, setForm] = useState(initialForm);
   const [editingId, setEditingId] = useState(null);
@@ -35,7 +36,14 @@ export default function TransactionsPage() {
     const query = new URLSearchParams();
     Object.entries(filters).forEach(([key, value]) => value && query.append(key, value));
     const { data } = await api.get(`/transactions/?${query.toString()}`);
-    setTransactions(data);
+    setTransactions(data.results);
+    setNextPage(data.next);
+  };
+
+  const loadMore = async () => {
+    const { data } = await api.get(nextPage);
+    setTransactions((current) => [...current, ...data.results]);
+    setNextPage(data.next);
   };
 
   useEffect(() => {
@@ -164,6 +172,7 @@ export default function TransactionsPage() {
             ))}
           </tbody>
         </table>
+        {nextPage && <button type="button" onClick={loadMore}>Load more</button>}
       </div>
     </section>
   );